@@ -1,7 +1,12 @@
 import sys
 
 from .utility import has_uproject_file, read_config
-from .launch_operations import execute_command, construct_command
+from .launch_latency import get_latency_key
+from .launch_operations import construct_argv
+from . import tracing
+from .launch_templates import render_command
+from .process_supervisor import ProcessSupervisor
+from .session_launcher import create_session
 from .UnrealLauncherApp_ui2 import LauncherApp
 
 
@@ -14,9 +19,19 @@ class UnrealLauncherApp:
         self.selected_project_file = ""
         self.selected_map = ""
         self.command = ""
-        self.config = read_config()
+        self.command_argv = None
+        self.session = None
+        self.supervisor = ProcessSupervisor()
+        self._config = None
         self.initialize_ui()
 
+    @property
+    def config(self):
+        # Parsed on first use, so reading the config file is not on the path to the first frame
+        if self._config is None:
+            self._config = read_config()
+        return self._config
+
     def initialize_ui(self):
         ui = LauncherApp(self, sys.argv)
         ui.start()
@@ -42,7 +57,7 @@ class UnrealLauncherApp:
         self.update_command()
 
     def set_config(self, config):
-        self.config = config
+        self._config = config
         self.update_command()
 
     def reset_selection(self):
@@ -53,11 +68,51 @@ class UnrealLauncherApp:
         self.selected_project_file = ""
         self.selected_map = ""
 
+    @tracing.traced()
     def update_command(self):
-        self.command = construct_command(self.selected_map, self.selected_launch,
-                                         self.selected_project_file, self.project_directory,
-                                         self.selected_version)
+        self.command_argv = construct_argv(self.selected_map, self.selected_launch,
+                                           self.selected_project_file, self.project_directory,
+                                           self.selected_version)
+        # The shell form is only a preview for the window and the clipboard, launches use the argv
+        self.command = render_command(self.command_argv) if self.command_argv else ""
 
+    @tracing.traced()
     def launch_project(self):
-        if (self.command):
-            execute_command(self.command)
+        if not self.command_argv:
+            return False
+        try:
+            instance = self.supervisor.launch(self.selected_launch, self.command_argv,
+                                              latency_key=self.get_selected_latency_key(),
+                                              mode=self.selected_launch)
+        except Exception as e:
+            print(f"Failed to execute the command: {e}")
+            return False
+        print(f"Launched with command: {self.command} (PID {instance.pid})")
+        return True
+
+    def get_selected_latency_key(self):
+        """Returns the key the launch latencies of the current selection are recorded under."""
+        return get_latency_key(self.project_directory, self.selected_map, self.selected_launch, self.selected_version)
+
+    def spawn_session_process(self, label, command, mode):
+        """Starts a session process under the supervisor, so it shows up with the other instances."""
+        return self.supervisor.launch(f"Session {label}", command, mode=mode).process
+
+    @tracing.traced()
+    def launch_session(self, server_mode, client_count):
+        """Starts a server in server_mode plus client_count clients on the selected map and engine."""
+        self.stop_session()
+        session_config = self.config["session"]
+        self.session = create_session(server_mode, session_config["client_mode"], client_count,
+                                      session_config["stagger_seconds"], self.selected_map,
+                                      self.selected_project_file, self.project_directory, self.selected_version,
+                                      self.spawn_session_process)
+        if self.session is None or not self.session.start():
+            self.session = None
+            return False
+        return True
+
+    def stop_session(self):
+        if self.session is not None:
+            self.session.stop()
+            self.session = None
@@ -3,192 +3,31 @@ import os
 
 from PyQt5 import QtCore
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLabel, QPushButton, QComboBox,
-                             QHBoxLayout, QLineEdit, QFileDialog, QListWidget, QSizePolicy, QMessageBox)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import (QFont, QIcon, QFontDatabase)
-
-from .utility import (find_umap_files, find_unreal_project, detect_unreal_versions)
-
-script_dir = os.path.dirname(os.path.realpath(__file__))
-
-icon_filename = "MPLIcon.png"
-chevron_right_filename = "icon_chevron_right.png"
-chevron_down_filename = "icon_chevron_down.png"
-chevron_right_white_filename = "icon_chevron_right_white.png"
-chevron_down_white_filename = "icon_chevron_down_white.png"
-
-font_filename = "Inter-VariableFont.ttf"
-
-
-def get_custom_font():
-    custom_font = QFont()
-    font_path = os.path.join(script_dir, "..", "Fonts", font_filename).replace("\\", "/")
-    font_id = QFontDatabase.addApplicationFont(font_path)
-    if font_id != -1:
-        font_family = QFontDatabase.applicationFontFamilies(font_id)[0]
-        custom_font.setFamily(font_family)
-        return custom_font
-    else:
-        font_family = "Roboto"
-        custom_font.setFamily(font_family)
-        return custom_font
-
-
-def get_custom_font_family():
-    return get_custom_font().family()
-
-
-def get_map_list_style():
-    maps_list_style = """
-        QListWidget {{
-            border: none;
-            background-color: white;
-        }}
-        QListWidget::item {{
-            background-color: transparent;
-            border: none;
-            padding: 5px;
-            outline: none;
-            font-family: {};
-            font-size: 14px;
-        }}
-        QListWidget::item:selected {{
-            background-color: #3651ea;
-            color: white;
-            border: none;
-            outline: none;        
-        }}
-        QListWidget::item:hover {{
-            background-color: gray;
-            color: black;
-            outline: none;
-        }}
-        QScrollBar:vertical {{
-            background: #f0f0f0;
-            border: none;
-            width: 12px;
-            margin: 0px 0px 0px 0px;
-        }}
-        QScrollBar::handle:vertical {{
-            background: #a3a3a3;
-            min-height: 30ps;
-        }}
-        QScrollBar::add-line:vertical {{
-            background: none;
-            height: 0px;
-        }}
-        QScrollBar::sub-line:vertical {{
-            background: none;
-            height: 0px;
-        }}
-    """.format(get_custom_font_family())
-    return maps_list_style
-
-
-def get_primary_button_style():
-    primary_button_style = """
-        QPushButton {{
-            color: white;
-            background-color: #3651ea;
-            border: none;
-            font-family: {};
-            font-size: 14px;
-            font-weight: bold;
-        }}
-
-        QPushButton:hover {{
-            background-color: blue;        
-        }}
-
-        QPushButton:disabled {{
-            background-color: #b8b9bf;
-            color: gray;
-        }}
-    """.format(get_custom_font_family())
-    return primary_button_style
-
-
-def get_secondary_button_style():
-    secondary_button_style = """
-            QPushButton {{
-                color: #3651ea;
-                border: none;
-                font-family: {};
-                font-size: 12px;
-                text-align: right;
-                font-weight: bold;
-                background: white;
-            }}
-
-            QPushButton:hover {{
-                background: #b8b9bf;
-            }}
-    """.format(get_custom_font_family())
-    return secondary_button_style
-
-
-def get_tertiary_button_style():
-    tertiary_button_style = """
-        QPushButton {{
-            color: #3651ea;
-            border: none;
-            font-family: {};
-            font-size: 12px;
-            text-align: right;
-            font-weight: bold;
-        }}
-
-        QPushButton:hover {{
-            color: blue;
-        }}
-
-        QPushButton:disabled {{
-            color: #b8b9bf;
-        }}
-    """.format(get_custom_font_family())
-    return tertiary_button_style
-
-
-def get_combo_style(arrow_url, arrow_url_active):
-    combo_style = """
-                QComboBox {{
-                    background: white;
-                    color: black;
-                    padding: 0px 10px 0px 10px;
-                    border: none;
-                    font-family: {};
-                    font-size: 14px;
-                }}
-                
-                QComboBox:on {{
-                    background-color: #7c8ce9;
-                    color: white;
-                }}
-                
-                QComboBox:hover {{
-                    background-color: gray;
-                }}
-
-                QComboBox::drop-down {{
-                    border: none;
-                }}
-
-                QComboBox::down-arrow {{
-                    image: url({});
-                    width: 14px;
-                    height: 14px;
-                    padding: 0px 10px 0px 0px;
-                }}
-                
-                QComboBox::down-arrow::on {{
-                    image: url({});
-                }}
-                
-                QComboBox::item:hover {{
-                    background-color: gray;
-                }}
-            """.format(get_custom_font_family(), arrow_url, arrow_url_active)
-    return combo_style
+                             QHBoxLayout, QLineEdit, QFileDialog, QListView, QSizePolicy, QMessageBox,
+                             QProgressBar, QSpinBox, QMenu)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+
+from .config_service import get_config_service
+from . import startup_profile, tracing
+from .utility import (find_unreal_project, get_session_state_path, has_uproject_file, load_state_from_json,
+                      save_state_to_json)
+from .map_list_model import MapItemDelegate, MapListModel
+from .map_search import MapSearchIndex
+from .launch_latency import LatencyHistory, format_percentiles
+from .ui_workers import MapScanWorker, MapSearchIndexWorker, EngineScanWorker, WorkspaceIndexWorker
+from .workspace import Workspace
+from .ui_instances import InstancesPanel
+from .ui_logs import LogPanel
+from .ui_resources import (get_custom_font_family, get_map_list_style, get_primary_button_style,
+                           get_secondary_button_style, get_tertiary_button_style, get_combo_style,
+                           get_helper_label_style, get_readonly_text_style, get_search_edit_style, get_app_icon,
+                           get_chevron_icon_dark, get_chevron_icon_light, get_icon, get_pixmap)
+
+CONFIG_REFRESH_INTERVAL_MS = 1000
+SESSION_POLL_INTERVAL_MS = 1000
+MAX_SESSION_CLIENTS = 16
+SESSION_STATE_VERSION = 1
 
 
 def get_spacer(horizontal, vertical):
@@ -198,60 +37,25 @@ def get_spacer(horizontal, vertical):
     return spacer
 
 
-def get_helper_label_style():
-    label_style = """
-        QLabel {{
-            color: black;
-            font-family: {};
-            font-size: 14px;
-            font-align: center;
-            border: none;
-            background-color: transparent;
-            margin: 0px;
-        }}
-    """.format(get_custom_font_family())
-    return label_style
-
-
-def get_readonly_text_style():
-    label_style = """
-        QLineEdit {{
-            color: gray;
-            font-family: {};
-            font-size: 12px;
-            text-align: left;
-            border: none;
-            background-color: white;
-            margin: 0px;
-        }}
-    """.format(get_custom_font_family())
-    return label_style
-
-
-def get_app_icon():
-    return os.path.join(script_dir, "..", "Icons", icon_filename).replace("\\", "/")
-
-
-def get_chevron_icon_dark():
-    chevron_right_path = os.path.join(script_dir, "..", "Icons", chevron_right_filename).replace("\\", "/")
-    chevron_down_path = os.path.join(script_dir, "..", "Icons", chevron_down_filename).replace("\\", "/")
-    return chevron_right_path, chevron_down_path
-
-
-def get_chevron_icon_light():
-    chevron_right_white_path = os.path.join(script_dir, "..", "Icons", chevron_right_white_filename).replace("\\", "/")
-    chevron_down_white_path = os.path.join(script_dir, "..", "Icons", chevron_down_white_filename).replace("\\", "/")
-    return chevron_right_white_path, chevron_down_white_path
-
-
 class Launcher(QWidget):
     def __init__(self, app):
         super().__init__()
 
         self.app = app
 
+        self.unreal_versions = {}
         self.unreal_versions_map = {}
         self.launch_modes_map = {}
+        self.map_scan_worker = None
+        self.map_search_worker = None
+        self.map_watcher = None
+        self.engine_scan_worker = None
+        self.map_search = MapSearchIndex()
+        self.selected_map_name = None
+        self.workspace = Workspace()
+        self.workspace_worker = None
+        self.restored_engine_version = None
+        self.latency_history = LatencyHistory()
 
         self.setup_window()
 
@@ -301,35 +105,74 @@ class Launcher(QWidget):
         maps_title_layout.addWidget(self.reload_maps_btn)
         self.wrapper_layout.addLayout(maps_title_layout)
 
+        self.scan_status_label = QLabel()
+        self.scan_status_label.setStyleSheet(get_helper_label_style())
+        self.scan_status_label.setVisible(False)
+        self.wrapper_layout.addWidget(self.scan_status_label)
+
+        self.scan_progress_bar = QProgressBar()
+        self.scan_progress_bar.setRange(0, 0)
+        self.scan_progress_bar.setTextVisible(False)
+        self.scan_progress_bar.setFixedHeight(4)
+        self.scan_progress_bar.setVisible(False)
+        self.wrapper_layout.addWidget(self.scan_progress_bar)
+
+        self.wrapper_layout.addWidget(get_spacer(0, 2))
+
+        self.map_search_edit = QLineEdit()
+        self.map_search_edit.setPlaceholderText("Search maps by name or path")
+        self.map_search_edit.setStyleSheet(get_search_edit_style())
+        self.map_search_edit.setFixedHeight(35)
+        self.map_search_edit.setClearButtonEnabled(True)
+        self.map_search_edit.setToolTip(
+            "Filters the Maps as you type, typos are tolerated\n"
+            "Use '/' to search folders, for example Arena/L_Ar\n"
+            "Press Enter to select the best match")
+        self.map_search_edit.textChanged.connect(self.apply_map_filter)
+        self.map_search_edit.returnPressed.connect(self.select_best_match)
+        self.wrapper_layout.addWidget(self.map_search_edit)
+
         self.wrapper_layout.addWidget(get_spacer(0, 2))
 
-        self.maps_list = QListWidget()
+        self.maps_model = MapListModel(self)
+        self.maps_list = QListView()
+        self.maps_list.setModel(self.maps_model)
+        self.maps_list.setItemDelegate(MapItemDelegate(get_custom_font_family(), self.maps_list))
+        self.maps_list.setUniformItemSizes(True)
         self.maps_list.setStyleSheet(get_map_list_style())
-        self.maps_list.itemSelectionChanged.connect(self.handle_selection_change)
+        self.maps_list.selectionModel().selectionChanged.connect(self.handle_selection_change)
         self.wrapper_layout.addWidget(self.maps_list)
 
         self.wrapper_layout.addWidget(get_spacer(0, 2))
 
-        self.launch_modes = self.app.config.get("launch_commands", {})
         self.launch_mode_combo = QComboBox()
-        for launch_mode in self.launch_modes:
-            key = f"Launch Mode: {launch_mode}"
-            self.launch_modes_map[key] = launch_mode
-        self.launch_mode_combo.addItems(self.launch_modes_map)
         self.launch_mode_combo.setStyleSheet(get_combo_style(get_chevron_icon_dark()[1], get_chevron_icon_light()[1]))
         self.launch_mode_combo.setFixedHeight(50)
         self.launch_mode_combo.currentIndexChanged.connect(self.launch_mode_changed)
 
         self.unreal_combo = QComboBox()
-        self.unreal_versions = detect_unreal_versions()
-        for version in self.unreal_versions:
-            key = f"Unreal Engine: {version}"
-            self.unreal_versions_map[key] = version
-        self.unreal_combo.addItems(self.unreal_versions_map)
         self.unreal_combo.setStyleSheet(get_combo_style(get_chevron_icon_dark()[1], get_chevron_icon_light()[1]))
         self.unreal_combo.setFixedHeight(50)
         self.unreal_combo.currentIndexChanged.connect(self.engine_version_changed)
 
+        engines_title_layout = QHBoxLayout()
+        self.batch_btn = QPushButton("Batch launch")
+        self.batch_btn.setStyleSheet(get_tertiary_button_style())
+        self.batch_btn.clicked.connect(self.open_batch_dialog)
+        self.batch_btn.setToolTip(
+            "Launches several Maps in several Launch Modes and Engine Versions\n"
+            "and reports which runs loaded without errors")
+        engines_title_layout.addWidget(self.batch_btn)
+        engines_title_layout.addStretch()
+        self.rescan_engines_btn = QPushButton("Rescan engines")
+        self.rescan_engines_btn.setStyleSheet(get_tertiary_button_style())
+        self.rescan_engines_btn.clicked.connect(lambda: self.rescan_engines(force_rescan=True))
+        self.rescan_engines_btn.setToolTip(
+            "Walks all configured Unreal Engine folders again\n"
+            "Use it after installing or removing an engine version")
+        engines_title_layout.addWidget(self.rescan_engines_btn)
+        self.wrapper_layout.addLayout(engines_title_layout)
+
         combo_layout = QHBoxLayout()
         combo_layout.addWidget(self.launch_mode_combo)
         combo_layout.addWidget(get_spacer(2, 0))
@@ -367,12 +210,258 @@ class Launcher(QWidget):
         self.launch_project_btn.clicked.connect(self.launch_project)
         self.wrapper_layout.addWidget(self.launch_project_btn)
 
+        self.latency_label = QLabel()
+        self.latency_label.setStyleSheet(get_helper_label_style())
+        self.latency_label.setToolTip(
+            "Time from starting the selected Map, Launch Mode and Engine Version until it logged\n"
+            "the ready pattern of the config, over its recorded launches")
+        self.latency_label.setVisible(False)
+        self.wrapper_layout.addWidget(self.latency_label)
+
+        self.wrapper_layout.addWidget(get_spacer(0, 2))
+
+        session_layout = QHBoxLayout()
+        self.session_server_combo = QComboBox()
+        self.session_server_combo.setStyleSheet(get_combo_style(get_chevron_icon_dark()[1], get_chevron_icon_light()[1]))
+        self.session_server_combo.setFixedHeight(40)
+        self.session_server_combo.setToolTip("Launch mode of the session server")
+        session_layout.addWidget(self.session_server_combo)
+
+        self.session_clients_spin = QSpinBox()
+        self.session_clients_spin.setRange(0, MAX_SESSION_CLIENTS)
+        self.session_clients_spin.setPrefix("Clients: ")
+        self.session_clients_spin.setFixedHeight(40)
+        self.session_clients_spin.setToolTip("Number of clients started after the server")
+        session_layout.addWidget(self.session_clients_spin)
+
+        self.launch_session_btn = QPushButton("Launch session")
+        self.launch_session_btn.setStyleSheet(get_primary_button_style())
+        self.launch_session_btn.setFixedHeight(40)
+        self.launch_session_btn.setDisabled(True)
+        self.launch_session_btn.setToolTip(
+            "Starts the server and then the clients one by one, all on the selected Map and Engine Version")
+        self.launch_session_btn.clicked.connect(self.launch_session)
+        session_layout.addWidget(self.launch_session_btn)
+
+        self.stop_session_btn = QPushButton("Stop session")
+        self.stop_session_btn.setStyleSheet(get_tertiary_button_style())
+        self.stop_session_btn.setDisabled(True)
+        self.stop_session_btn.setToolTip("Stops the server and every client of the running session")
+        self.stop_session_btn.clicked.connect(self.stop_session)
+        session_layout.addWidget(self.stop_session_btn)
+        self.wrapper_layout.addLayout(session_layout)
+
+        self.instances_panel = InstancesPanel(self.app.supervisor)
+        # Launches record their latency once ready or exited, while the panel samples them
+        self.instances_panel.sample_timer.timeout.connect(self.update_latency_label)
+        self.wrapper_layout.addWidget(self.instances_panel)
+
+        self.log_panel = LogPanel(self.app.supervisor)
+        self.wrapper_layout.addWidget(self.log_panel)
+        self.instances_panel.clear_btn.clicked.connect(self.log_panel.sync_tabs)
+
         self.setLayout(layout)
 
+        self.first_paint_done = False
+        self.config_refresh_timer = QTimer(self)
+        self.config_refresh_timer.setInterval(CONFIG_REFRESH_INTERVAL_MS)
+        self.config_refresh_timer.timeout.connect(get_config_service().refresh)
+
+        self.session_timer = QTimer(self)
+        self.session_timer.setInterval(SESSION_POLL_INTERVAL_MS)
+        self.session_timer.timeout.connect(self.update_session_state)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            startup_profile.mark("first paint")
+            QTimer.singleShot(0, self.initialize_after_first_paint)
+
+    def initialize_after_first_paint(self):
+        # Everything below is only needed once a project is opened, so it runs after the window is visible
+        self.populate_launch_modes()
+        self.session_clients_spin.setValue(self.app.config["session"]["client_count"])
+        startup_profile.mark("config loaded")
+        get_config_service().add_listener(self.config_changed)
+        self.config_refresh_timer.start()
+        self.restore_session()
+        self.rescan_engines()
+        self.index_workspace()
+
+    def populate_launch_modes(self):
+        current_mode = self.launch_modes_map.get(self.launch_mode_combo.currentText())
+        self.launch_modes = self.app.config.get("launch_commands", {})
+        self.launch_modes_map = {}
+        for launch_mode in self.launch_modes:
+            key = f"Launch Mode: {launch_mode}"
+            self.launch_modes_map[key] = launch_mode
+
+        self.launch_mode_combo.blockSignals(True)
+        self.launch_mode_combo.clear()
+        self.launch_mode_combo.addItems(self.launch_modes_map)
+        if current_mode in self.launch_modes:
+            self.launch_mode_combo.setCurrentText(f"Launch Mode: {current_mode}")
+        self.launch_mode_combo.blockSignals(False)
+
+        current_server_mode = self.session_server_combo.currentData() or self.app.config["session"]["server_mode"]
+        self.session_server_combo.clear()
+        for launch_mode in self.launch_modes:
+            self.session_server_combo.addItem(f"Server: {launch_mode}", launch_mode)
+        if current_server_mode in self.launch_modes:
+            self.session_server_combo.setCurrentText(f"Server: {current_server_mode}")
+
+    def populate_unreal_versions(self, unreal_versions):
+        current_version = self.unreal_versions_map.get(self.unreal_combo.currentText()) or self.restored_engine_version
+        self.restored_engine_version = None
+        self.unreal_versions = unreal_versions
+        self.unreal_versions_map = {}
+        for version in self.unreal_versions:
+            key = f"Unreal Engine: {version}"
+            self.unreal_versions_map[key] = version
+
+        self.unreal_combo.blockSignals(True)
+        self.unreal_combo.clear()
+        self.unreal_combo.addItems(self.unreal_versions_map)
+        if current_version in self.unreal_versions:
+            self.unreal_combo.setCurrentText(f"Unreal Engine: {current_version}")
+        self.unreal_combo.blockSignals(False)
+
+    def config_changed(self, config):
+        engine_paths_changed = config.get("unreal_engine_paths") != self.app.config.get("unreal_engine_paths")
+        workspace_roots_changed = config["workspace_roots"] != self.app.config["workspace_roots"]
+        self.app.set_config(config)
+        self.populate_launch_modes()
+        if engine_paths_changed:
+            self.rescan_engines()
+        if workspace_roots_changed:
+            self.index_workspace()
+        if self.app.project_directory:
+            self.launch_mode_changed()
+        self.update_ui()
+
+    def rescan_engines(self, force_rescan=False):
+        if self.engine_scan_worker is not None:
+            return
+        self.rescan_engines_btn.setDisabled(True)
+        self.engine_scan_worker = EngineScanWorker(force_rescan, self)
+        self.engine_scan_worker.engines_found.connect(self.engines_found)
+        self.engine_scan_worker.finished.connect(self.engine_scan_worker.deleteLater)
+        self.engine_scan_worker.start()
+
+    def engines_found(self, unreal_versions):
+        self.engine_scan_worker = None
+        self.rescan_engines_btn.setDisabled(False)
+        self.populate_unreal_versions(unreal_versions)
+        if self.app.project_directory:
+            self.engine_version_changed()
+        startup_profile.mark("engines detected")
+        startup_profile.report()
+
+    @tracing.traced()
+    def restore_session(self):
+        """
+        Reopens the project of the last session with its map, launch mode and engine selected.
+
+        Its maps are shown from the snapshot saved on exit right away, while their search
+        index is built in the background. The map watcher revalidates them against the disk
+        and applies only what changed, so the project is launchable as soon as the engines
+        are detected.
+        """
+        state_path = get_session_state_path()
+        if not os.path.isfile(state_path):
+            return
+        state = load_state_from_json(state_path)
+        if not isinstance(state, dict) or state.get("version") != SESSION_STATE_VERSION:
+            return
+        project_directory = state.get("project_directory")
+        if not isinstance(project_directory, str) or not has_uproject_file(project_directory):
+            return
+
+        launch_mode = state.get("launch_mode")
+        if launch_mode in self.launch_modes:
+            # open_project applies the launch mode
+            self.launch_mode_combo.blockSignals(True)
+            self.launch_mode_combo.setCurrentText(f"Launch Mode: {launch_mode}")
+            self.launch_mode_combo.blockSignals(False)
+        if isinstance(state.get("engine_version"), str):
+            self.restored_engine_version = state["engine_version"]
+
+        maps_with_paths = state.get("maps")
+        has_snapshot = isinstance(maps_with_paths, dict) and all(
+            isinstance(unreal_path, str) for unreal_path in maps_with_paths.values())
+        # The snapshot is only stored in the workspace once its search index is built
+        self.open_project(project_directory, maps_with_paths if has_snapshot else None)
+        if has_snapshot:
+            self.map_search_worker = MapSearchIndexWorker(dict(maps_with_paths), self)
+            self.map_search_worker.index_built.connect(self.map_search_index_built)
+            self.map_search_worker.finished.connect(self.map_search_worker.deleteLater)
+            self.map_search_worker.start()
+
+        if isinstance(state.get("map"), str):
+            self.select_map(state["map"])
+        startup_profile.mark("session restored")
+
+    def map_search_index_built(self, map_search):
+        worker = self.sender()
+        if worker is not self.map_search_worker:
+            return
+        self.map_search_worker = None
+        # The map watcher may have changed the maps while the snapshot was being indexed
+        for friendly_name in worker.maps_with_paths.keys() - self.app.maps_with_paths.keys():
+            map_search.remove(friendly_name)
+        map_search.update(self.app.maps_with_paths.items() - worker.maps_with_paths.items())
+        self.map_search = map_search
+        if self.map_search_edit.text():
+            self.apply_map_filter()
+
+    @tracing.traced()
+    def save_session(self):
+        """Saves the opened project, the selections and a snapshot of its maps for restore_session."""
+        if not self.app.project_directory:
+            return
+        state = {
+            "version": SESSION_STATE_VERSION,
+            "project_directory": self.app.project_directory,
+            "map": self.selected_map_name,
+            "launch_mode": self.app.selected_launch,
+            "engine_version": self.unreal_versions_map.get(self.unreal_combo.currentText()),
+            # The maps of an unfinished scan are incomplete, the next session scans the project instead
+            "maps": self.app.maps_with_paths if self.map_scan_worker is None else None,
+        }
+        save_state_to_json(state, get_session_state_path())
+
+    def index_workspace(self):
+        """Finds and indexes the projects below the configured workspace roots in the background."""
+        if self.workspace_worker is not None:
+            self.workspace_worker.requestInterruption()
+            self.workspace_worker = None
+        workspace_roots = self.app.config["workspace_roots"]
+        if not workspace_roots:
+            return
+        self.workspace_worker = WorkspaceIndexWorker(self.workspace, workspace_roots, self)
+        self.workspace_worker.projects_found.connect(self.workspace_projects_found)
+        self.workspace_worker.finished.connect(self.workspace_index_finished)
+        self.workspace_worker.start()
+
+    def workspace_index_finished(self):
+        worker = self.sender()
+        if worker is self.workspace_worker:
+            self.workspace_worker = None
+        worker.deleteLater()
+
+    def workspace_projects_found(self, project_directories):
+        if self.sender() is not self.workspace_worker:
+            return
+        if not self.app.project_directory:
+            self.left_label.setText("Select Project")
+            self.project_name_btn.setToolTip(f"{len(project_directories)} projects found in the workspace folders | "
+                                             f"Select one or open any other project folder")
+
     def setup_window(self):
         self.setStyleSheet("background: #eaebef;")
         self.setWindowFlags(Qt.WindowCloseButtonHint)
-        self.setWindowIcon(QIcon(get_app_icon()))
+        self.setWindowIcon(get_icon(get_app_icon()))
         self.setGeometry(100, 100, 550, 700)
 
     def create_title_widget(self):
@@ -399,7 +488,7 @@ class Launcher(QWidget):
         button_layout.addStretch()
 
         icon_label = QLabel()
-        icon_label.setPixmap(QIcon(get_chevron_icon_dark()[0]).pixmap(16, 16))
+        icon_label.setPixmap(get_pixmap(get_chevron_icon_dark()[0], 16, 16))
         icon_label.setStyleSheet("background: transparent;")
         button_layout.addWidget(icon_label, alignment=Qt.AlignRight)
 
@@ -407,7 +496,7 @@ class Launcher(QWidget):
         project_button.setFixedHeight(50)
         project_button.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
         project_button.setToolTip("Open Project folder (must be Unreal Engine project folder)")
-        project_button.clicked.connect(self.open_file_dialogue)
+        project_button.clicked.connect(self.show_project_menu)
         project_button.installEventFilter(self)
 
         return project_button, left_label
@@ -418,7 +507,9 @@ class Launcher(QWidget):
     def eventFilter(self, obj, event):
         if obj == self.project_name_btn:
             if event.type() == QtCore.QEvent.Enter:
-                if self.app.project_directory:
+                if self.workspace.get_projects():
+                    self.left_label.setText("Switch Project")
+                elif self.app.project_directory:
                     self.left_label.setText("Open Different Project Folder")
                 else:
                     self.left_label.setText("Open Project Folder")
@@ -426,40 +517,102 @@ class Launcher(QWidget):
                 if self.app.project_directory:
                     folder_name = os.path.basename(self.app.project_directory)
                     self.left_label.setText(f"{folder_name} Folder")
+                elif self.workspace.get_projects():
+                    self.left_label.setText("Select Project")
                 else:
                     self.left_label.setText("Open Project Folder")
 
         return super().eventFilter(obj, event)
 
+    def show_project_menu(self):
+        projects = self.workspace.get_projects()
+        if not projects:
+            self.open_file_dialogue()
+            return
+
+        menu = QMenu(self)
+        menu.setToolTipsVisible(True)
+        current_project = self.workspace.get_project(self.app.project_directory) if self.app.project_directory else None
+        for project in sorted(projects, key=lambda project: project.name.lower()):
+            action = menu.addAction(project.name if project.is_indexed else f"{project.name} (indexing...)")
+            action.setToolTip(project.project_directory)
+            action.setCheckable(True)
+            action.setChecked(project is current_project)
+            action.triggered.connect(
+                lambda checked, project_directory=project.project_directory: self.open_project(project_directory))
+        menu.addSeparator()
+        menu.addAction("Open Project Folder...").triggered.connect(self.open_file_dialogue)
+        menu.exec_(self.project_name_btn.mapToGlobal(self.project_name_btn.rect().bottomLeft()))
+
     def open_file_dialogue(self):
         options = QFileDialog.Options()
         options |= QFileDialog.DontUseNativeDialog
         folder = QFileDialog.getExistingDirectory(self, "Select Folder")
         if folder:
-            if find_umap_files(folder):
-                self.app.reset_selection()
-                # Save the folder path
-                self.folder_path = folder
-                # Show the wrapper
-                self.wrapper.setVisible(True)
-                self.setGeometry(100, 100, 550, 700)
-
-                self.app.set_project_directory(folder)
-                self.app.set_selected_project_file(find_unreal_project(folder))
-
-                folder_name = os.path.basename(folder)
-                self.left_label.setText(f"{folder_name} Folder")
-                self.project_name_btn.setToolTip(
-                    f"Currently opened project is {folder_name} | You can select any other by selecting different folder")
-
-                self.launch_mode_changed()
-                self.engine_version_changed()
-                self.load_maps()
+            if has_uproject_file(folder):
+                self.open_project(folder)
             else:
                 QMessageBox.critical(self, "Error", "Invalid folder path selected.")
         else:
             QMessageBox.information(self, "Info", "Folder selection canceled.")
 
+    @tracing.traced()
+    def open_project(self, folder, snapshot_maps=None):
+        self.store_project_maps()
+        self.app.reset_selection()
+        # Save the folder path
+        self.folder_path = folder
+        # Show the wrapper
+        self.wrapper.setVisible(True)
+        self.setGeometry(100, 100, 550, 700)
+
+        self.app.set_project_directory(folder)
+        self.maps_model.set_project_directory(folder)
+        self.app.set_selected_project_file(find_unreal_project(folder))
+
+        folder_name = os.path.basename(folder)
+        self.left_label.setText(f"{folder_name} Folder")
+        self.project_name_btn.setToolTip(
+            f"Currently opened project is {folder_name} | You can select any other by selecting different folder")
+
+        self.launch_mode_changed()
+        self.engine_version_changed()
+        self.show_project_maps(snapshot_maps)
+
+    def store_project_maps(self):
+        # Keeps the maps of the project being closed warm, unless its scan or search index is still being built
+        if self.app.project_directory and self.map_scan_worker is None and self.map_search_worker is None:
+            self.workspace.store(self.app.project_directory, self.app.maps_with_paths, self.map_search)
+
+    def show_project_maps(self, snapshot_maps=None):
+        """
+        Shows the maps of the opened project from the workspace when they are indexed, scanning it otherwise.
+
+        :param snapshot_maps: Maps restored from the previous session, shown instead. Searching finds
+            nothing until their search index is built.
+        """
+        if snapshot_maps is not None:
+            maps_with_paths, map_search = snapshot_maps, MapSearchIndex()
+        else:
+            project = self.workspace.get_project(self.app.project_directory)
+            if project is None or not project.is_indexed:
+                self.load_maps()
+                return
+            maps_with_paths, map_search = project.maps_with_paths, project.map_search
+
+        self.stop_map_scan()
+        self.stop_map_watcher()
+        self.app.maps_with_paths = maps_with_paths
+        self.map_search = map_search
+        self.selected_map_name = None
+        self.app.set_selected_map("")
+        self.maps_model.clear()
+        self.maps_model.add_maps(list(self.app.maps_with_paths.items()), self.get_map_matches())
+        self.update_ui()
+        self.show_scan_result()
+        # The watcher revalidates the indexed maps against the disk
+        self.start_map_watcher()
+
     def copy_command(self):
         if self.app.command:
             clipboard = QApplication.clipboard()
@@ -470,31 +623,190 @@ class Launcher(QWidget):
             QMessageBox.information(self, "Info", "Command is not yet valid")
 
     def load_maps(self):
-        self.app.maps_with_paths = find_umap_files(self.app.project_directory)
-        self.maps_list.clear()
-        for friendly_name in self.app.maps_with_paths:
-            self.maps_list.addItem(friendly_name)
+        self.stop_map_scan()
+        self.stop_map_watcher()
+        self.app.maps_with_paths = {}
+        self.maps_model.clear()
+        self.selected_map_name = None
+        # A new index, the previous one may be kept warm by the workspace
+        self.map_search = MapSearchIndex()
         self.app.set_selected_map("")
         self.update_ui()
 
+        self.map_scan_worker = MapScanWorker(self.app.project_directory, self)
+        self.map_scan_worker.maps_found.connect(self.add_maps)
+        self.map_scan_worker.scan_finished.connect(self.map_scan_finished)
+        self.map_scan_worker.finished.connect(self.map_scan_worker.deleteLater)
+        self.map_scan_worker.start()
+
+        self.scan_status_label.setText("Scanning maps...")
+        self.scan_status_label.setVisible(True)
+        self.scan_progress_bar.setVisible(True)
+
+    def stop_map_scan(self):
+        if self.map_scan_worker is not None:
+            self.map_scan_worker.requestInterruption()
+            self.map_scan_worker = None
+        if self.map_search_worker is not None:
+            self.map_search_worker.requestInterruption()
+            self.map_search_worker = None
+
+    def add_maps(self, maps):
+        if self.sender() is not self.map_scan_worker:
+            return
+        replaced_names = {friendly_name for friendly_name, _ in maps if friendly_name in self.app.maps_with_paths}
+        self.app.maps_with_paths.update(maps)
+        with tracing.span("add maps", count=len(maps)):
+            self.map_search.update(maps)
+            self.maps_model.add_maps(maps, self.get_map_matches())
+        self.scan_status_label.setText(f"Scanning maps... {len(self.app.maps_with_paths)} found")
+
+        # A later duplicate replaces the path of a map the user may have already selected
+        if self.selected_map_name in replaced_names:
+            self.handle_selection_change()
+
+    def map_scan_finished(self):
+        if self.sender() is not self.map_scan_worker:
+            return
+        # Sorted by the worker, so ranking the maps does not sort them on the GUI thread
+        self.map_search.set_rank_orders(self.map_scan_worker.rank_orders)
+        self.map_scan_worker = None
+        if self.map_search_edit.text():
+            # The matches were listed in scan order while scanning
+            self.apply_map_filter()
+        self.show_scan_result()
+        self.start_map_watcher()
+
+    def show_scan_result(self):
+        self.scan_progress_bar.setVisible(False)
+        if self.app.maps_with_paths:
+            self.scan_status_label.setVisible(False)
+        else:
+            self.scan_status_label.setText("No maps found in this project")
+            self.scan_status_label.setVisible(True)
+
+    def start_map_watcher(self):
+        # Imported on demand, the watcher is not needed until a project has been scanned
+        from .map_watcher import MapWatcher
+        self.map_watcher = MapWatcher(self.app.project_directory, self.app.maps_with_paths, self)
+        self.map_watcher.maps_changed.connect(self.apply_map_changes)
+        self.map_watcher.start()
+
+    def stop_map_watcher(self):
+        if self.map_watcher is not None:
+            self.map_watcher.stop()
+            self.map_watcher.deleteLater()
+            self.map_watcher = None
+
+    def apply_map_changes(self, changed_maps, added_names, removed_names, rank_orders):
+        """Applies the maps the watcher found added, moved and removed, without touching the unchanged ones."""
+        if self.sender() is not self.map_watcher:
+            return
+        selected_name = self.selected_map_name
+        self.map_search.remove_all(removed_names)
+        for friendly_name in removed_names:
+            self.app.maps_with_paths.pop(friendly_name, None)
+        # Indexes the added maps and the ones whose path changed
+        self.map_search.update(changed_maps.items())
+        self.map_search.set_rank_orders(rank_orders)
+        self.app.maps_with_paths.update(changed_maps)
+
+        self.maps_model.remove_maps(removed_names)
+        self.maps_model.add_maps([(friendly_name, changed_maps[friendly_name]) for friendly_name in added_names],
+                                 self.get_map_matches())
+        self.restore_map_selection()
+        if selected_name is None:
+            return
+        if selected_name not in self.app.maps_with_paths:
+            self.selected_map_name = None
+            self.app.set_selected_map("")
+            self.update_ui()
+        elif self.app.maps_with_paths[selected_name] != self.app.selected_map:
+            self.app.set_selected_map(self.app.maps_with_paths[selected_name])
+            self.update_ui()
+
+    def apply_map_filter(self):
+        # The model only hands the first batch of matches to the view, the rest is fetched while scrolling
+        with tracing.span("apply map filter"):
+            self.maps_model.set_filter(self.get_map_matches())
+        self.restore_map_selection()
+
+    def get_map_matches(self):
+        """Returns the maps matching the search text for the maps model, None if there is no search text."""
+        if self.map_scan_worker is not None:
+            # The index changes with every batch of a scan, ranking waits for the scan to finish
+            return self.map_search.find(self.map_search_edit.text())
+        return self.map_search.search_lazily(self.map_search_edit.text())
+
+    def select_map(self, friendly_name):
+        row = self.maps_model.get_row(friendly_name)
+        if row is None:
+            return False
+        index = self.maps_model.index(row)
+        self.maps_list.setCurrentIndex(index)
+        self.maps_list.scrollTo(index)
+        return True
+
+    def restore_map_selection(self):
+        # Resetting the model clears the selection, the selected map is selected again if it is still shown
+        if self.selected_map_name is not None and not self.maps_list.selectionModel().hasSelection():
+            self.maps_list.selectionModel().blockSignals(True)
+            self.select_map(self.selected_map_name)
+            self.maps_list.selectionModel().blockSignals(False)
+
+    def select_best_match(self):
+        best_matches = self.map_search.search(self.map_search_edit.text(), limit=1)
+        if best_matches:
+            self.select_map(best_matches[0])
+
+    def closeEvent(self, event):
+        running_count = len(self.app.supervisor.get_running_instances())
+        if running_count:
+            # Their output is piped to the launcher, they could not keep running without it
+            answer = QMessageBox.question(
+                self, "Running instances",
+                f"{running_count} launched instance(s) still running. Closing the launcher stops them. Close anyway?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if answer != QMessageBox.Yes:
+                event.ignore()
+                return
+        self.save_session()
+        get_config_service().remove_listener(self.config_changed)
+        self.config_refresh_timer.stop()
+        self.instances_panel.stop()
+        self.log_panel.stop()
+        # Pending session clients would start after the instances are stopped
+        self.app.stop_session()
+        self.app.supervisor.stop_all()
+        self.stop_map_scan()
+        self.stop_map_watcher()
+        if self.engine_scan_worker is not None:
+            self.engine_scan_worker.wait()
+        for worker in (self.findChildren(MapScanWorker) + self.findChildren(MapSearchIndexWorker)
+                       + self.findChildren(WorkspaceIndexWorker)):
+            worker.requestInterruption()
+            worker.wait()
+        super().closeEvent(event)
+
     def launch_mode_changed(self):
         key = self.launch_mode_combo.currentText()
-        selected_mode = self.launch_modes_map[key]
+        selected_mode = self.launch_modes_map.get(key, "")
         self.app.set_selected_launch(selected_mode)
         self.update_ui()
 
     def engine_version_changed(self):
         selected_engine = self.unreal_combo.currentText()
-        selected_version = self.unreal_versions_map[selected_engine]
-        selected_version = self.unreal_versions.get(selected_version)[0]
+        selected_version = self.unreal_versions_map.get(selected_engine)
+        selected_version = self.unreal_versions[selected_version][0] if selected_version else ""
         self.app.set_selected_version(selected_version)
         self.update_ui()
 
     def handle_selection_change(self):
-        selected_items = self.maps_list.selectedItems()
-        if selected_items:
-            selected_item = selected_items[0]
-            selected_map_path = self.app.maps_with_paths[selected_item.text()]
+        selected_indexes = self.maps_list.selectionModel().selectedIndexes()
+        if selected_indexes:
+            self.selected_map_name = selected_indexes[0].data()
+        if self.selected_map_name in self.app.maps_with_paths:
+            selected_map_path = self.app.maps_with_paths[self.selected_map_name]
             self.app.set_selected_map(selected_map_path)
             self.update_ui()
 
@@ -504,8 +816,21 @@ class Launcher(QWidget):
         else:
             self.path_edit.setText("")
         self.enable_launch_button()
+        self.update_latency_label()
+
+    def update_latency_label(self):
+        summary = self.latency_history.get_summary(self.app.get_selected_latency_key()) if self.app.command else None
+        if summary is None or summary["ready"] is None:
+            self.latency_label.setVisible(False)
+            return
+        launches = "1 launch" if summary["launches"] == 1 else f"{summary['launches']} launches"
+        if summary["ready_launches"] < summary["launches"]:
+            launches = f"{summary['ready_launches']} of {launches}"
+        self.latency_label.setText(f"Ready after {format_percentiles(summary['ready'])} ({launches})")
+        self.latency_label.setVisible(True)
 
     def enable_launch_button(self):
+        self.launch_session_btn.setDisabled(not self.app.command)
         if self.app.command:
             self.launch_project_btn.setDisabled(False)
             self.launch_project_btn.setToolTip(
@@ -516,15 +841,61 @@ class Launcher(QWidget):
                 "To enable Launch Project you need to select Map, Launch Mode and Engine Version")
 
     def launch_project(self):
-        if self.app.command:
-            self.app.launch_project()
+        if not self.app.command:
+            return
+        if self.app.launch_project():
+            self.instances_panel.start_sampling()
+            self.log_panel.start_following()
+        else:
+            QMessageBox.critical(self, "Error", "Failed to launch the project, check the generated command.")
+
+    def open_batch_dialog(self):
+        if not self.app.maps_with_paths:
+            QMessageBox.information(self, "Info", "No maps found in this project yet.")
+            return
+        # Imported on demand, batches are an occasional tool
+        from .ui_batch import BatchDialog
+        BatchDialog(self).exec_()
+
+    def launch_session(self):
+        server_mode = self.session_server_combo.currentData()
+        if not server_mode:
+            return
+        if self.app.launch_session(server_mode, self.session_clients_spin.value()):
+            self.session_timer.start()
+            self.instances_panel.start_sampling()
+            self.log_panel.start_following()
+        else:
+            QMessageBox.critical(self, "Error", "Failed to launch the session, check the selected Map and Engine Version.")
+        self.update_session_state()
+
+    def stop_session(self):
+        self.app.stop_session()
+        self.update_session_state()
+
+    def update_session_state(self):
+        if self.app.session is not None and not self.app.session.is_running():
+            self.app.session = None
+        if self.app.session is None:
+            self.session_timer.stop()
+        else:
+            # Clients started after every other instance exited still need to be sampled and followed
+            if not self.instances_panel.sample_timer.isActive():
+                self.instances_panel.start_sampling()
+            if not self.log_panel.drain_timer.isActive():
+                self.log_panel.start_following()
+        self.stop_session_btn.setDisabled(self.app.session is None)
 
 
 class LauncherApp(QApplication):
     def __init__(self, parent, argv):
-        super().__init__(argv)
+        with tracing.span("create QApplication"):
+            super().__init__(argv)
+        startup_profile.mark("qt application")
         self.parent = parent
-        self.launcher = Launcher(self.parent)
+        with tracing.span("construct window"):
+            self.launcher = Launcher(self.parent)
+        startup_profile.mark("window constructed")
 
     def start(self):
         self.launcher.setWindowTitle("Mountea Project Launcher")
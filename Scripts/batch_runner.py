@@ -0,0 +1,223 @@
+import os
+import re
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .launch_operations import construct_argv
+from .process_supervisor import ProcessSupervisor
+from .utility import read_config
+
+
+RUN_PENDING = "Pending"
+RUN_RUNNING = "Running"
+RUN_PASSED = "Passed"
+RUN_FAILED = "Failed"
+RUN_TIMED_OUT = "Timed out"
+RUN_CANCELLED = "Cancelled"
+RUN_FINISHED_STATES = (RUN_PASSED, RUN_FAILED, RUN_TIMED_OUT, RUN_CANCELLED)
+# Seconds the output of an exited instance may take to reach its log before the exit code decides alone
+LOG_DRAIN_SECONDS = 2.0
+
+
+def get_total_memory():
+    """
+    Returns the physical memory of the machine in bytes, or None if it cannot be determined.
+    """
+    if psutil is not None:
+        return psutil.virtual_memory().total
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_default_concurrency(memory_per_instance_mb):
+    """
+    Sizes the number of parallel runs to the machine: one per CPU core, as long as
+    every instance still gets memory_per_instance_mb of physical memory.
+
+    :param memory_per_instance_mb: Memory budget of one engine instance, 0 to ignore memory.
+    :return: The maximum number of concurrent runs, at least 1.
+    """
+    concurrency = os.cpu_count() or 1
+    total_memory = get_total_memory()
+    if total_memory and memory_per_instance_mb:
+        concurrency = min(concurrency, total_memory // (memory_per_instance_mb * 1024 * 1024))
+    return max(1, concurrency)
+
+
+class BatchRun:
+    """One map, launch mode and engine version of a batch, together with its result."""
+
+    def __init__(self, map_path, mode, version, command):
+        self.map_path = map_path
+        self.mode = mode
+        self.version = version
+        self.command = command
+        self.status = RUN_PENDING
+        self.detail = ""
+        self.instance = None
+        self.log_sequence = 0
+        self.start_time = None
+        self.end_time = None
+        self.exit_time = None
+
+    @property
+    def duration(self):
+        if self.start_time is None:
+            return None
+        return (self.end_time or time.monotonic()) - self.start_time
+
+    def finish(self, status, detail=""):
+        """Records the result of the run and stops its instance, which is killed if it ignores that."""
+        self.status = status
+        self.detail = detail
+        self.end_time = time.monotonic()
+        if self.instance is not None:
+            self.instance.terminate()
+
+
+def build_batch_runs(map_paths, modes, engines, uproject_file, project_directory, base_port=None):
+    """
+    Builds the runs of a batch: every map in every launch mode with every engine version.
+
+    :param map_paths: The Unreal paths of the maps.
+    :param modes: The launch modes, keys of 'launch_commands' in the config.
+    :param engines: A dictionary mapping engine versions to editor executables.
+    :param base_port: Port of the first run, defaults to 'port' in the config. Every run gets its own port
+                      so servers running side by side do not collide.
+    :return: A list of BatchRun objects. Runs whose command cannot be constructed are already failed.
+    """
+    if base_port is None:
+        base_port = read_config()["port"]
+    runs = []
+    for version, executable in engines.items():
+        for mode in modes:
+            for map_path in map_paths:
+                port = base_port + len(runs) % (65536 - base_port)
+                command = construct_argv(map_path, mode, uproject_file, project_directory, executable, port)
+                run = BatchRun(map_path, mode, version, command)
+                if not command:
+                    run.status = RUN_FAILED
+                    run.detail = "Command could not be constructed"
+                runs.append(run)
+    return runs
+
+
+class BatchRunner:
+    """
+    Runs a batch of launches with at most max_concurrency instances at a time.
+
+    The runner does not own a thread; poll() starts pending runs and checks the
+    running ones, and is called periodically by the launcher window or the command
+    line. A run passes when its output matches pass_pattern (the instance is then
+    stopped) or when it exits with code 0. It fails when its output matches
+    fail_pattern or it exits with another code; the whole output of an exited run is
+    checked before its exit code. A run is killed once it has run for
+    timeout_seconds. A finished run keeps its slot until its instance has exited,
+    so an instance ignoring the request to stop never runs next to max_concurrency
+    others; it is killed after the grace period of the supervisor.
+    """
+
+    def __init__(self, runs, max_concurrency, timeout_seconds, pass_pattern="", fail_pattern="", supervisor=None):
+        self.runs = runs
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_seconds = timeout_seconds
+        self.pass_pattern = re.compile(pass_pattern) if pass_pattern else None
+        self.fail_pattern = re.compile(fail_pattern) if fail_pattern else None
+        self.supervisor = supervisor or ProcessSupervisor()
+
+    @property
+    def is_finished(self):
+        return all(run.status in RUN_FINISHED_STATES for run in self.runs)
+
+    def get_running_runs(self):
+        return [run for run in self.runs if run.status == RUN_RUNNING]
+
+    def get_live_instances(self):
+        """Returns the instances of the batch that have not exited yet, finished runs included."""
+        return [run.instance for run in self.runs if run.instance is not None and run.instance.poll()]
+
+    def poll(self):
+        """
+        Checks the running runs and starts pending ones while there are free slots.
+
+        :return: True while any run is pending or running, or any instance of the batch has not exited yet.
+        """
+        for run in self.get_running_runs():
+            self.check_run(run)
+
+        free_slots = self.max_concurrency - len(self.get_live_instances())
+        for run in self.runs:
+            if free_slots <= 0:
+                break
+            if run.status == RUN_PENDING:
+                self.start_run(run)
+                if run.instance is not None:
+                    free_slots -= 1
+        return not self.is_finished or bool(self.get_live_instances())
+
+    def start_run(self, run):
+        run.start_time = time.monotonic()
+        try:
+            run.instance = self.supervisor.launch(f"Batch {run.mode} {run.map_path}", run.command, mode=run.mode)
+        except Exception as e:
+            run.finish(RUN_FAILED, f"Failed to start: {e}")
+            return
+        run.status = RUN_RUNNING
+
+    def check_run(self, run):
+        # The exit is checked first: the last lines of an exited instance may still be on the reader thread
+        has_exited = not run.instance.poll()
+        if has_exited and not run.instance.log.closed:
+            if run.exit_time is None:
+                run.exit_time = time.monotonic()
+            # A process started by the instance may hold the pipe open, so the log is only waited for a while
+            if time.monotonic() - run.exit_time < LOG_DRAIN_SECONDS:
+                return
+        lines, run.log_sequence = run.instance.log.read_since(run.log_sequence)
+        for line in lines:
+            if self.fail_pattern and self.fail_pattern.search(line):
+                run.finish(RUN_FAILED, line.strip())
+                return
+            if self.pass_pattern and self.pass_pattern.search(line):
+                run.finish(RUN_PASSED)
+                return
+
+        if has_exited:
+            if run.instance.exit_code == 0:
+                run.finish(RUN_PASSED)
+            else:
+                run.finish(RUN_FAILED, f"Exit code {run.instance.exit_code}")
+        elif run.duration >= self.timeout_seconds:
+            run.finish(RUN_TIMED_OUT, f"Killed after {self.timeout_seconds:.0f} s")
+
+    def cancel(self):
+        """Kills the running runs and cancels the pending ones."""
+        for run in self.runs:
+            if run.status in (RUN_PENDING, RUN_RUNNING):
+                run.finish(RUN_CANCELLED)
+
+
+def format_duration(seconds):
+    return "-" if seconds is None else f"{seconds:.1f} s"
+
+
+def format_batch_report(runs):
+    """
+    Formats the results of a batch as a plain text table.
+
+    :return: The lines of the table, followed by a summary line.
+    """
+    rows = [("Map", "Mode", "Engine", "Result", "Duration", "Detail")]
+    for run in runs:
+        rows.append((run.map_path, run.mode, run.version, run.status, format_duration(run.duration), run.detail))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]) - 1)]
+    lines = ["  ".join(value.ljust(width) for value, width in zip(row, widths)) + "  " + row[-1] for row in rows]
+    passed = sum(run.status == RUN_PASSED for run in runs)
+    lines.append(f"{passed} of {len(runs)} runs passed")
+    return [line.rstrip() for line in lines]
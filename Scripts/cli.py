@@ -0,0 +1,351 @@
+import argparse
+import os
+import sys
+import time
+
+from .batch_runner import RUN_PASSED, BatchRunner, build_batch_runs, format_batch_report, get_default_concurrency
+from .cpu_placement import CorePlacer, format_core_list
+from .launch_latency import LatencyHistory, format_latency_report, get_latency_key
+from .launch_operations import construct_argv, execute_command
+from .launch_templates import render_command
+from .map_scanner import get_map_file_path
+from .process_supervisor import ProcessSupervisor
+from .session_launcher import create_session
+from .umap_metadata import read_map_metadata
+from .utility import detect_unreal_versions, find_umap_files, find_unreal_project, read_config
+
+
+CLI_COMMANDS = ('launch', 'session', 'batch', 'latency', 'list-maps', 'list-engines')
+SESSION_POLL_INTERVAL = 0.5
+BATCH_POLL_INTERVAL = 0.5
+MEASURE_POLL_INTERVAL = 0.1
+
+
+def version_sort_key(version):
+    """Sorts 'Major.Minor' version strings numerically."""
+    return tuple(int(part) if part.isdigit() else 0 for part in version.split('.'))
+
+
+def resolve_map(project_directory, map_name):
+    """
+    Resolves a map given on the command line to its Unreal path.
+
+    Unreal paths ('/Game/Maps/L_Arena') are used as they are, without scanning the project.
+    Friendly names are looked up with or without the '.umap' extension.
+
+    :return: The Unreal path of the map, or None if no map matches.
+    """
+    if map_name.startswith('/'):
+        return map_name
+    maps_with_paths = find_umap_files(project_directory)
+    return maps_with_paths.get(map_name) or maps_with_paths.get(f'{map_name}.umap')
+
+
+def resolve_engine(engine):
+    """
+    Resolves an engine given on the command line to an editor executable.
+
+    :param engine: A version such as '5.3', a path to an editor executable, or None for the newest version.
+    :return: The editor executable, or None if no installed engine matches.
+    """
+    if engine and os.path.isfile(engine):
+        return engine
+    unreal_versions = detect_unreal_versions()
+    if not unreal_versions:
+        return None
+    if engine is None:
+        engine = max(unreal_versions, key=version_sort_key)
+    executables = unreal_versions.get(engine)
+    return executables[0] if executables else None
+
+
+def resolve_launch_target(args):
+    """
+    Resolves the project, map and engine shared by the launch and session subcommands.
+
+    :return: A tuple (project_directory, uproject_file, map_path, executable), or None after printing an error.
+    """
+    project_directory = os.path.abspath(args.project)
+    uproject_file = find_unreal_project(project_directory)
+    if not uproject_file:
+        print(f"No .uproject file found in {project_directory}.", file=sys.stderr)
+        return None
+
+    map_path = resolve_map(project_directory, args.map)
+    if not map_path:
+        print(f"Map {args.map} not found in {project_directory}.", file=sys.stderr)
+        return None
+
+    executable = resolve_engine(args.engine)
+    if not executable:
+        if args.engine:
+            print(f"Unreal Engine {args.engine} not found in the configured engine paths.", file=sys.stderr)
+        else:
+            print("No Unreal Engine found in the configured engine paths.", file=sys.stderr)
+        return None
+    return project_directory, uproject_file, map_path, executable
+
+
+def check_launch_mode(mode):
+    launch_modes = read_config().get("launch_commands", {})
+    if mode not in launch_modes:
+        print(f"Unknown launch mode {mode}, expected one of: {', '.join(launch_modes)}.", file=sys.stderr)
+        return False
+    return True
+
+
+def launch(args):
+    if not check_launch_mode(args.mode):
+        return 1
+    launch_target = resolve_launch_target(args)
+    if launch_target is None:
+        return 1
+    project_directory, uproject_file, map_path, executable = launch_target
+
+    argv = construct_argv(map_path, args.mode, uproject_file, project_directory, executable)
+    if not argv:
+        return 1
+    if args.dry_run:
+        print(render_command(argv))
+        return 0
+    if args.measure:
+        return measure_launch(argv, get_latency_key(project_directory, map_path, args.mode, executable), args.mode)
+    return 0 if execute_command(argv, args.mode) else 1
+
+
+def measure_launch(argv, latency_key, mode):
+    """
+    Launches a command, prints its output until it exits and records its startup latency.
+
+    The launcher keeps reading the output to the end, an instance writing into a closed pipe would be killed.
+
+    :return: The exit code of the launched process.
+    """
+    instance = ProcessSupervisor().launch("launch", argv, latency_key=latency_key, mode=mode)
+    log_sequence = 0
+    ready_reported = False
+    try:
+        while True:
+            finished = instance.log.closed and not instance.poll()
+            lines, log_sequence = instance.log.read_since(log_sequence)
+            for line in lines:
+                print(line)
+            latency = instance.latency
+            if not ready_reported and latency.time_to_ready is not None:
+                ready_reported = True
+                print(f"Ready after {latency.time_to_ready:.2f} s, first output after "
+                      f"{latency.time_to_first_output:.2f} s", file=sys.stderr)
+            if finished:
+                break
+            time.sleep(MEASURE_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        instance.process.terminate()
+        instance.process.wait()
+        instance.poll()
+    if not ready_reported and instance.latency.ready_pattern is not None:
+        print("The launch never logged the ready pattern, it is recorded as not ready.", file=sys.stderr)
+    return instance.exit_code
+
+
+def session(args):
+    config = read_config()
+    session_config = config["session"]
+    server_mode = args.server_mode or session_config["server_mode"]
+    client_count = session_config["client_count"] if args.clients is None else args.clients
+    stagger_seconds = session_config["stagger_seconds"] if args.stagger is None else args.stagger
+    if not check_launch_mode(server_mode) or not check_launch_mode(session_config["client_mode"]):
+        return 1
+    launch_target = resolve_launch_target(args)
+    if launch_target is None:
+        return 1
+    project_directory, uproject_file, map_path, executable = launch_target
+
+    placer = CorePlacer()
+
+    def spawn(label, command, mode):
+        process, cpu_cores = placer.spawn(command, config, mode=mode)
+        if cpu_cores is not None:
+            print(f"Pinned session {label} to cores {format_core_list(cpu_cores)}")
+        return process
+
+    launch_session = create_session(server_mode, session_config["client_mode"], client_count, stagger_seconds,
+                                    map_path, uproject_file, project_directory, executable, spawn)
+    if launch_session is None or not launch_session.start():
+        return 1
+    print("Session running, press Ctrl+C to stop the server and all clients.")
+    try:
+        while launch_session.is_running():
+            time.sleep(SESSION_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        pass
+    launch_session.stop()
+    return 0
+
+
+def batch(args):
+    batch_config = read_config()["batch"]
+    if not all(check_launch_mode(mode) for mode in args.mode):
+        return 1
+    project_directory = os.path.abspath(args.project)
+    uproject_file = find_unreal_project(project_directory)
+    if not uproject_file:
+        print(f"No .uproject file found in {project_directory}.", file=sys.stderr)
+        return 1
+
+    if args.map:
+        map_paths = []
+        for map_name in args.map:
+            map_path = resolve_map(project_directory, map_name)
+            if not map_path:
+                print(f"Map {map_name} not found in {project_directory}.", file=sys.stderr)
+                return 1
+            map_paths.append(map_path)
+    else:
+        map_paths = list(find_umap_files(project_directory).values())
+
+    engines = {}
+    unreal_versions = detect_unreal_versions() if not args.engine else {}
+    # The newest version by default, named by its version rather than its executable in the report
+    for engine in args.engine or [max(unreal_versions, key=version_sort_key, default=None)]:
+        executable = resolve_engine(engine)
+        if not executable:
+            if engine:
+                print(f"Unreal Engine {engine} not found in the configured engine paths.", file=sys.stderr)
+            else:
+                print("No Unreal Engine found in the configured engine paths.", file=sys.stderr)
+            return 1
+        engines[engine] = executable
+
+    max_concurrency = args.concurrency or batch_config["max_concurrency"] or \
+        get_default_concurrency(batch_config["memory_per_instance_mb"])
+    timeout_seconds = args.timeout or batch_config["timeout_seconds"]
+    runs = build_batch_runs(map_paths, args.mode, engines, uproject_file, project_directory)
+    runner = BatchRunner(runs, max_concurrency, timeout_seconds, batch_config["pass_pattern"],
+                         batch_config["fail_pattern"])
+    print(f"Running {len(runs)} launches, {runner.max_concurrency} at a time, press Ctrl+C to cancel.")
+    try:
+        while runner.poll():
+            time.sleep(BATCH_POLL_INTERVAL)
+    except KeyboardInterrupt:
+        runner.cancel()
+        # Waits for the instances to exit, killing the ones that ignore the cancel
+        while runner.poll():
+            time.sleep(BATCH_POLL_INTERVAL)
+
+    for line in format_batch_report(runs):
+        print(line)
+    return 0 if all(run.status == RUN_PASSED for run in runs) else 1
+
+
+def latency(args):
+    history = LatencyHistory()
+    project_directory = os.path.normpath(os.path.abspath(args.project)) if args.project else None
+    map_path = resolve_map(project_directory, args.map) if args.map and project_directory else args.map
+    executable = resolve_engine(args.engine) if args.engine else None
+    keys = [key for key in sorted(history.get_keys())
+            if (project_directory is None or key[0] == project_directory)
+            and (map_path is None or key[1] == map_path)
+            and (args.mode is None or key[2] == args.mode)
+            and (executable is None or key[3] == executable)]
+    if not keys:
+        print("No launch latencies recorded yet. Launches from the window or with 'launch --measure' record them.")
+        return 0
+    engine_names = {engine: version for version, engines in detect_unreal_versions().items() for engine in engines}
+    for line in format_latency_report(history, keys, engine_names):
+        print(line)
+    return 0
+
+
+def list_maps(args):
+    project_directory = os.path.abspath(args.project)
+    maps_with_paths = find_umap_files(project_directory, use_index=not args.no_index)
+    for friendly_name, unreal_path in maps_with_paths.items():
+        if not args.details:
+            print(f"{friendly_name}\t{unreal_path}")
+            continue
+        metadata = read_map_metadata(get_map_file_path(project_directory, unreal_path))
+        if metadata is None:
+            print(f"{friendly_name}\t{unreal_path}")
+            continue
+        engine_version = metadata.get_engine_version_name(full=True) or ""
+        world_partition = "WP" if metadata.is_world_partition else ""
+        modified_time = time.strftime('%Y-%m-%d %H:%M', time.localtime(metadata.modified_time))
+        print(f"{friendly_name}\t{unreal_path}\t{metadata.file_size}\t{modified_time}\t{engine_version}\t{world_partition}")
+    return 0
+
+
+def list_engines(args):
+    unreal_versions = detect_unreal_versions(force_rescan=args.rescan)
+    for version in sorted(unreal_versions, key=version_sort_key):
+        for executable in unreal_versions[version]:
+            print(f"{version}\t{executable}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='main.py', description="Mountea Project Launcher command line interface. "
+                                                                 "Run without arguments to open the launcher window.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    launch_parser = subparsers.add_parser('launch', help="Launch a project without opening the launcher window.")
+    launch_parser.add_argument('--project', required=True, help="Unreal Engine project folder.")
+    launch_parser.add_argument('--map', required=True, help="Map name (L_Arena or L_Arena.umap) or Unreal path (/Game/Maps/L_Arena).")
+    launch_parser.add_argument('--mode', required=True, help="Launch mode from 'launch_commands' in the config.")
+    launch_parser.add_argument('--engine', help="Engine version (5.3) or editor executable. Defaults to the newest installed version.")
+    launch_parser.add_argument('--dry-run', action='store_true', help="Print the command instead of running it.")
+    launch_parser.add_argument('--measure', action='store_true',
+                               help="Follow the output of the launch until it exits and record its startup latency, "
+                                    "see the 'latency' command.")
+    launch_parser.set_defaults(handler=launch)
+
+    session_parser = subparsers.add_parser('session', help="Launch a server and several clients as one session.")
+    session_parser.add_argument('--project', required=True, help="Unreal Engine project folder.")
+    session_parser.add_argument('--map', required=True, help="Map name or Unreal path, shared by the server and all clients.")
+    session_parser.add_argument('--engine', help="Engine version (5.3) or editor executable. Defaults to the newest installed version.")
+    session_parser.add_argument('--server-mode', help="Launch mode of the server. Defaults to 'session.server_mode' in the config.")
+    session_parser.add_argument('--clients', type=int, help="Number of clients. Defaults to 'session.client_count' in the config.")
+    session_parser.add_argument('--stagger', type=float, help="Seconds between starting processes. Defaults to 'session.stagger_seconds'.")
+    session_parser.set_defaults(handler=session)
+
+    batch_parser = subparsers.add_parser('batch', help="Launch every map in every mode and engine and report which runs pass.")
+    batch_parser.add_argument('--project', required=True, help="Unreal Engine project folder.")
+    batch_parser.add_argument('--map', action='append', help="Map name or Unreal path, repeatable. Defaults to every map of the project.")
+    batch_parser.add_argument('--mode', action='append', required=True, help="Launch mode from 'launch_commands', repeatable.")
+    batch_parser.add_argument('--engine', action='append', help="Engine version or editor executable, repeatable. Defaults to the newest installed version.")
+    batch_parser.add_argument('--concurrency', type=int, help="Maximum number of runs at a time. Defaults to 'batch.max_concurrency', "
+                                                              "or to the CPU cores and memory of the machine.")
+    batch_parser.add_argument('--timeout', type=float, help="Seconds before a run is killed. Defaults to 'batch.timeout_seconds'.")
+    batch_parser.set_defaults(handler=batch)
+
+    latency_parser = subparsers.add_parser('latency', help="Show the p50, p90 and p99 time from launch to the first log "
+                                                           "output and to 'latency.ready_pattern'.")
+    latency_parser.add_argument('--project', help="Only launches of this project folder.")
+    latency_parser.add_argument('--map', help="Only launches of this map name or Unreal path.")
+    latency_parser.add_argument('--mode', help="Only launches in this launch mode.")
+    latency_parser.add_argument('--engine', help="Only launches with this engine version or editor executable.")
+    latency_parser.set_defaults(handler=latency)
+
+    maps_parser = subparsers.add_parser('list-maps', help="List the maps of a project.")
+    maps_parser.add_argument('--project', required=True, help="Unreal Engine project folder.")
+    maps_parser.add_argument('--no-index', action='store_true', help="Walk the project without the persistent map index.")
+    maps_parser.add_argument('--details', action='store_true',
+                             help="Also print the size, modification time, saved engine version and World Partition "
+                                  "flag of every map, read from the map file headers.")
+    maps_parser.set_defaults(handler=list_maps)
+
+    engines_parser = subparsers.add_parser('list-engines', help="List the detected Unreal Engine versions.")
+    engines_parser.add_argument('--rescan', action='store_true', help="Ignore the engine cache and walk every engine folder.")
+    engines_parser.set_defaults(handler=list_engines)
+
+    return parser
+
+
+def run_cli(argv):
+    """
+    Runs a command line subcommand. Never imports PyQt5.
+
+    :param argv: The arguments, without the program name.
+    :return: The process exit code.
+    """
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
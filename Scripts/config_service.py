@@ -0,0 +1,405 @@
+import json
+import os
+import re
+
+from . import tracing
+from .launch_templates import get_launch_template
+
+
+CONFIG_PATH = 'DefaultConfig.json'
+CPU_PLACEMENT_POLICIES = ('none', 'round_robin', 'packed')
+PROCESS_PRIORITIES = ('idle', 'below_normal', 'normal', 'above_normal', 'high')
+
+DEFAULT_CONFIG = {
+    "unreal_engine_paths": [],
+    "workspace_roots": [],
+    "launch_commands": {},
+    "port": 7777,
+    "map_scan_workers": 1,
+    "log_buffer_lines": 10000,
+    "session": {
+        "server_mode": "DedicatedServer",
+        "client_mode": "Client",
+        "client_count": 2,
+        "stagger_seconds": 2.0,
+    },
+    "batch": {
+        "max_concurrency": 0,
+        "memory_per_instance_mb": 4096,
+        "timeout_seconds": 300.0,
+        "pass_pattern": "LogLoad: Took .* to LoadMap",
+        "fail_pattern": "Assertion failed|Fatal error",
+    },
+    "latency": {
+        "ready_pattern": "LogLoad: Took .* to LoadMap",
+        "history_size": 100,
+    },
+    "cpu_placement": {
+        "policy": "none",
+        "reserve_cores": 2,
+        "cores_per_instance": 0,
+    },
+    "tracing": {
+        "enabled": False,
+        "profile": False,
+        "output_directory": "",
+    },
+}
+
+
+@tracing.traced()
+def find_project_root():
+    """
+    Finds the root folder of the project containing the 'Config' directory.
+
+    :return: The absolute path to the project's root folder.
+    """
+    current_dir = os.path.abspath(__file__)  # Get the absolute path of the current script
+    while True:
+        # Check if the current directory is indeed a directory
+        if os.path.isdir(current_dir):
+            # Check if the 'Config' directory exists in the current directory
+            if 'Config' in os.listdir(current_dir) and os.path.isdir(os.path.join(current_dir, 'Config')):
+                return current_dir  # Found the root folder
+        # Move up one level in the directory tree
+        parent_dir = os.path.dirname(current_dir)
+        # Stop if reached the system root directory
+        if parent_dir == current_dir:
+            raise FileNotFoundError("Config directory not found. Are you sure this script is inside the project directory?")
+        current_dir = parent_dir
+
+
+def validate_config(config_data):
+    """
+    Validates raw configuration data, dropping invalid entries and filling in defaults.
+
+    Unknown keys are passed through unchanged.
+
+    :param config_data: The parsed JSON configuration.
+    :return: A validated configuration dictionary.
+    """
+    if not isinstance(config_data, dict):
+        print("Config root must be a JSON object, using default configuration.")
+        config_data = {}
+    config = dict(config_data)
+
+    engine_paths = config_data.get("unreal_engine_paths", DEFAULT_CONFIG["unreal_engine_paths"])
+    if not isinstance(engine_paths, list):
+        print("Config 'unreal_engine_paths' must be a list, ignoring it.")
+        engine_paths = []
+    config["unreal_engine_paths"] = [path for path in engine_paths if isinstance(path, str)]
+
+    workspace_roots = config_data.get("workspace_roots", DEFAULT_CONFIG["workspace_roots"])
+    if not isinstance(workspace_roots, list):
+        print("Config 'workspace_roots' must be a list, ignoring it.")
+        workspace_roots = []
+    config["workspace_roots"] = [path for path in workspace_roots if isinstance(path, str) and path]
+
+    launch_commands = config_data.get("launch_commands", DEFAULT_CONFIG["launch_commands"])
+    if not isinstance(launch_commands, dict):
+        print("Config 'launch_commands' must be an object, ignoring it.")
+        launch_commands = {}
+    config["launch_commands"] = {}
+    config["process_policies"] = {}
+    for mode, command in launch_commands.items():
+        process_policy = None
+        if isinstance(command, dict):
+            process_policy = validate_process_policy(mode, command)
+            command = command.get("command")
+        if not isinstance(command, str):
+            print(f"Config launch command for {mode} must be a string or an object with a 'command' string, ignoring it.")
+            continue
+        try:
+            # Parsed here once, every launch formats the cached template
+            get_launch_template(command)
+        except ValueError as e:
+            print(f"Config launch command for {mode} is invalid, ignoring it: {e}")
+            continue
+        config["launch_commands"][mode] = command
+        if process_policy:
+            config["process_policies"][mode] = process_policy
+
+    port = config_data.get("port", DEFAULT_CONFIG["port"])
+    if not isinstance(port, int) or isinstance(port, bool) or not 1 <= port <= 65535:
+        print(f"Invalid port value {port!r}, using port {DEFAULT_CONFIG['port']}.")
+        port = DEFAULT_CONFIG["port"]
+    config["port"] = port
+
+    workers = config_data.get("map_scan_workers", DEFAULT_CONFIG["map_scan_workers"])
+    if not isinstance(workers, int) or isinstance(workers, bool):
+        print(f"Invalid map_scan_workers value {workers!r}, scanning maps on a single thread.")
+        workers = 1
+    config["map_scan_workers"] = max(1, workers)
+
+    log_buffer_lines = config_data.get("log_buffer_lines", DEFAULT_CONFIG["log_buffer_lines"])
+    if not isinstance(log_buffer_lines, int) or isinstance(log_buffer_lines, bool) or log_buffer_lines < 1:
+        print(f"Invalid log_buffer_lines value {log_buffer_lines!r}, keeping {DEFAULT_CONFIG['log_buffer_lines']} lines per instance.")
+        log_buffer_lines = DEFAULT_CONFIG["log_buffer_lines"]
+    config["log_buffer_lines"] = log_buffer_lines
+
+    config["session"] = validate_session(config_data.get("session", {}))
+    config["batch"] = validate_batch(config_data.get("batch", {}))
+    config["latency"] = validate_latency(config_data.get("latency", {}))
+    config["cpu_placement"] = validate_cpu_placement(config_data.get("cpu_placement", {}))
+    config["tracing"] = validate_tracing(config_data.get("tracing", {}))
+
+    return config
+
+
+def validate_process_policy(mode, policy_data):
+    """
+    Validates the process policy of a launch mode given as an object, dropping every invalid value.
+
+    The priority is applied as a nice increment on Linux and macOS and as a priority class on Windows.
+    The limits are only enforced on Linux.
+
+    :param mode: The launch mode, for error messages.
+    :param policy_data: The launch mode object, holding the 'command' and the policy values.
+    :return: A dictionary of the valid 'priority', 'max_address_space_mb' and 'max_open_files' values.
+    """
+    process_policy = {}
+    priority = policy_data.get("priority")
+    if priority in PROCESS_PRIORITIES:
+        process_policy["priority"] = priority
+    elif priority is not None:
+        print(f"Invalid priority {priority!r} for {mode}, expected one of {', '.join(PROCESS_PRIORITIES)}.")
+    for key in ("max_address_space_mb", "max_open_files"):
+        value = policy_data.get(key)
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            process_policy[key] = value
+        elif value is not None:
+            print(f"Invalid {key} value {value!r} for {mode}, starting it without that limit.")
+    return process_policy
+
+
+def validate_session(session_data):
+    """
+    Validates the 'session' section, falling back to the default of every invalid value.
+
+    :param session_data: The parsed 'session' section.
+    :return: A complete session settings dictionary.
+    """
+    session = dict(DEFAULT_CONFIG["session"])
+    if not isinstance(session_data, dict):
+        print("Config 'session' must be an object, using default session settings.")
+        return session
+    for key in ("server_mode", "client_mode"):
+        if isinstance(session_data.get(key), str):
+            session[key] = session_data[key]
+    client_count = session_data.get("client_count")
+    if isinstance(client_count, int) and not isinstance(client_count, bool) and client_count >= 0:
+        session["client_count"] = client_count
+    stagger_seconds = session_data.get("stagger_seconds")
+    if isinstance(stagger_seconds, (int, float)) and not isinstance(stagger_seconds, bool) and stagger_seconds >= 0:
+        session["stagger_seconds"] = float(stagger_seconds)
+    return session
+
+
+def validate_batch(batch_data):
+    """
+    Validates the 'batch' section, falling back to the default of every invalid value.
+
+    A max_concurrency of 0 sizes the batch scheduler to the CPU cores and memory of the machine.
+    Empty patterns disable the log check.
+
+    :param batch_data: The parsed 'batch' section.
+    :return: A complete batch settings dictionary.
+    """
+    batch = dict(DEFAULT_CONFIG["batch"])
+    if not isinstance(batch_data, dict):
+        print("Config 'batch' must be an object, using default batch settings.")
+        return batch
+    for key in ("max_concurrency", "memory_per_instance_mb"):
+        value = batch_data.get(key)
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            batch[key] = value
+    timeout_seconds = batch_data.get("timeout_seconds")
+    if isinstance(timeout_seconds, (int, float)) and not isinstance(timeout_seconds, bool) and timeout_seconds > 0:
+        batch["timeout_seconds"] = float(timeout_seconds)
+    for key in ("pass_pattern", "fail_pattern"):
+        pattern = batch_data.get(key)
+        if not isinstance(pattern, str):
+            continue
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            print(f"Invalid batch {key} {pattern!r}: {e}")
+            continue
+        batch[key] = pattern
+    return batch
+
+
+def validate_latency(latency_data):
+    """
+    Validates the 'latency' section, falling back to the default of every invalid value.
+
+    An empty ready_pattern only measures the time to the first log output.
+
+    :param latency_data: The parsed 'latency' section.
+    :return: A complete latency settings dictionary.
+    """
+    latency = dict(DEFAULT_CONFIG["latency"])
+    if not isinstance(latency_data, dict):
+        print("Config 'latency' must be an object, using default latency settings.")
+        return latency
+    ready_pattern = latency_data.get("ready_pattern")
+    if isinstance(ready_pattern, str):
+        try:
+            re.compile(ready_pattern)
+            latency["ready_pattern"] = ready_pattern
+        except re.error as e:
+            print(f"Invalid latency ready_pattern {ready_pattern!r}: {e}")
+    history_size = latency_data.get("history_size")
+    if isinstance(history_size, int) and not isinstance(history_size, bool) and history_size > 0:
+        latency["history_size"] = history_size
+    return latency
+
+
+def validate_cpu_placement(placement_data):
+    """
+    Validates the 'cpu_placement' section, falling back to the default of every invalid value.
+
+    A cores_per_instance of 0 splits the cores that are not reserved evenly between the server
+    and the clients of a session.
+
+    :param placement_data: The parsed 'cpu_placement' section.
+    :return: A complete CPU placement settings dictionary.
+    """
+    placement = dict(DEFAULT_CONFIG["cpu_placement"])
+    if not isinstance(placement_data, dict):
+        print("Config 'cpu_placement' must be an object, using default CPU placement settings.")
+        return placement
+    policy = placement_data.get("policy")
+    if policy in CPU_PLACEMENT_POLICIES:
+        placement["policy"] = policy
+    elif policy is not None:
+        print(f"Invalid cpu_placement policy {policy!r}, expected one of {', '.join(CPU_PLACEMENT_POLICIES)}.")
+    for key in ("reserve_cores", "cores_per_instance"):
+        value = placement_data.get(key)
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            placement[key] = value
+    return placement
+
+
+def validate_tracing(tracing_data):
+    """
+    Validates the 'tracing' section, falling back to the default of every invalid value.
+
+    An empty output_directory writes traces to the 'Traces' folder of the launcher cache directory.
+
+    :param tracing_data: The parsed 'tracing' section.
+    :return: A complete tracing settings dictionary.
+    """
+    tracing_config = dict(DEFAULT_CONFIG["tracing"])
+    if not isinstance(tracing_data, dict):
+        print("Config 'tracing' must be an object, using default tracing settings.")
+        return tracing_config
+    for key in ("enabled", "profile"):
+        if isinstance(tracing_data.get(key), bool):
+            tracing_config[key] = tracing_data[key]
+    if isinstance(tracing_data.get("output_directory"), str):
+        tracing_config["output_directory"] = tracing_data["output_directory"]
+    return tracing_config
+
+
+class ConfigService:
+    """
+    Serves the launcher configuration from memory.
+
+    The config file is parsed and validated once. get() never touches the disk;
+    refresh() compares the file mtime and, when it changed, reloads the file and
+    notifies every registered listener with the new configuration.
+    """
+
+    def __init__(self, config_path=None):
+        self._config_path = config_path
+        self._config = None
+        self._mtime_ns = None
+        self._listeners = []
+
+    @property
+    def config_path(self):
+        if self._config_path is None:
+            self._config_path = os.path.join(find_project_root(), "Config", CONFIG_PATH)
+        return self._config_path
+
+    def get(self):
+        """
+        Returns the cached configuration, loading it on first use.
+
+        :return: A validated configuration dictionary.
+        """
+        if self._config is None:
+            self.reload()
+        return self._config
+
+    def add_listener(self, listener):
+        """Registers a callable that receives the new configuration whenever it is reloaded."""
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _get_mtime_ns(self):
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+
+    @tracing.traced()
+    def reload(self):
+        """Reads and validates the config file, keeping the previous configuration if it cannot be parsed."""
+        self._mtime_ns = self._get_mtime_ns()
+        try:
+            with open(self.config_path, 'r') as config_file, tracing.span("parse config JSON"):
+                config_data = json.load(config_file)
+        except Exception as e:
+            print(f"Failed to read config file: {e}")
+            if self._config is None:
+                self._config = validate_config({})
+            return
+        self._config = validate_config(config_data)
+        tracing.configure(self._config["tracing"])
+
+    def refresh(self):
+        """
+        Reloads the configuration if the config file changed on disk and notifies listeners.
+
+        :return: True if the configuration was reloaded, False otherwise.
+        """
+        if self._config is not None and self._get_mtime_ns() == self._mtime_ns:
+            return False
+        self.reload()
+        for listener in list(self._listeners):
+            listener(self._config)
+        return True
+
+
+_config_service = None
+
+
+def get_config_service():
+    """
+    Returns the shared configuration service of the launcher.
+
+    :return: The ConfigService instance.
+    """
+    global _config_service
+    if _config_service is None:
+        _config_service = ConfigService()
+    return _config_service
+
+
+def set_config_path(config_path):
+    """
+    Replaces the shared configuration service with one reading another config file.
+
+    Used by tools that run the launcher code against their own configuration, such as the benchmarks.
+
+    :param config_path: Path to a config file in the DefaultConfig.json format.
+    :return: The new ConfigService instance.
+    """
+    global _config_service
+    _config_service = ConfigService(config_path)
+    return _config_service
@@ -0,0 +1,103 @@
+import os
+import threading
+
+from .launch_operations import spawn_command
+
+
+def is_placement_supported():
+    """Returns True if processes can be pinned to CPU cores here (Linux only)."""
+    return hasattr(os, 'sched_setaffinity') and hasattr(os, 'sched_getaffinity')
+
+
+def get_placement_cores(reserve_cores):
+    """
+    Returns the cores instances may be pinned to: the cores the launcher may run on, without the reserved ones.
+
+    :param reserve_cores: Number of the lowest cores left to the editor and the launcher.
+    :return: A sorted list of core numbers, empty if every core is reserved.
+    """
+    return sorted(os.sched_getaffinity(0))[reserve_cores:]
+
+
+def format_core_list(cores):
+    """Formats core numbers as ranges, such as '0-3,8'. Returns '-' for None or no cores."""
+    if not cores:
+        return "-"
+    ranges = []
+    cores = sorted(cores)
+    start = previous = cores[0]
+    for core in cores[1:] + [None]:
+        if core is not None and core == previous + 1:
+            previous = core
+            continue
+        ranges.append(str(start) if start == previous else f"{start}-{previous}")
+        start = previous = core
+    return ",".join(ranges)
+
+
+class CorePlacer:
+    """
+    Pins the engine instances it starts to CPU cores following the 'cpu_placement' config.
+
+    Every instance gets cores_per_instance cores, preferring cores no running instance
+    is pinned to, so instances share a core only once all cores are taken. 'packed'
+    takes the lowest free cores, so cores of exited instances are reused first;
+    'round_robin' continues after the cores of the previous launch. The launching
+    thread takes the affinity of the instance while it starts it, under the lock, so
+    the engine and every thread it starts inherit it without code running in the child.
+    """
+
+    def __init__(self):
+        self._assignments = []
+        self._next_index = 0
+        self._lock = threading.Lock()
+
+    def get_instance_cores(self, placement, instance_count):
+        """
+        Picks the cores of the next instance. Call with the lock held.
+
+        :param placement: A validated 'cpu_placement' section.
+        :param instance_count: Number of instances sharing the cores when cores_per_instance is 0.
+        :return: A tuple of core numbers, or None to not pin the instance.
+        """
+        if placement["policy"] == 'none' or not is_placement_supported():
+            return None
+        cores = get_placement_cores(placement["reserve_cores"])
+        if not cores:
+            print("Every core is reserved by cpu_placement.reserve_cores, not pinning the instance.")
+            return None
+        core_count = placement["cores_per_instance"] or max(1, len(cores) // max(1, instance_count))
+        core_count = min(core_count, len(cores))
+
+        self._assignments = [(process, assigned) for process, assigned in self._assignments
+                             if process.poll() is None]
+        usage = dict.fromkeys(cores, 0)
+        for _, assigned in self._assignments:
+            for core in assigned:
+                if core in usage:
+                    usage[core] += 1
+
+        start_index = self._next_index % len(cores) if placement["policy"] == 'round_robin' else 0
+        ordered_cores = cores[start_index:] + cores[:start_index]
+        # Stable sort: the least used cores first, in policy order among equally used ones
+        chosen = sorted(ordered_cores, key=usage.get)[:core_count]
+        self._next_index = cores.index(max(chosen, key=ordered_cores.index)) + 1
+        return tuple(sorted(chosen))
+
+    def spawn(self, command, config, capture_output=False, mode=None):
+        """
+        Starts a command pinned to the cores picked for it.
+
+        :param config: The launcher config, with its 'cpu_placement' and 'session' sections.
+        :param mode: The launch mode of the command, whose process policy is applied.
+        :return: A tuple (process, cores), cores is None if the process is not pinned.
+        """
+        # A session is the largest group of instances started together, an automatic share is sized to it
+        instance_count = config["session"]["client_count"] + 1
+        with self._lock:
+            cores = self.get_instance_cores(config["cpu_placement"], instance_count)
+            process = spawn_command(command, capture_output=capture_output, cpu_cores=cores,
+                                    process_policy=config["process_policies"].get(mode))
+            if cores is not None:
+                self._assignments.append((process, cores))
+        return process, cores
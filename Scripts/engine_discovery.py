@@ -0,0 +1,173 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+ENGINE_CACHE_VERSION = 1
+
+# Editor executables relative to '<install>/Engine', in the order they are reported
+EDITOR_LAYOUTS = (
+    ('Binaries', 'Win64', 'UE4Editor.exe'),
+    ('Binaries', 'Win64', 'UnrealEditor.exe'),
+    ('Binaries', 'Linux', 'UE4Editor'),
+    ('Binaries', 'Linux', 'UnrealEditor'),
+)
+
+
+def read_build_version(build_file_path):
+    """
+    Reads the engine version from a Build.version file.
+
+    :param build_file_path: Path to the 'Engine/Build/Build.version' file.
+    :return: The version as 'Major.Minor', or None if the file is missing or invalid.
+    """
+    try:
+        with open(build_file_path, 'r') as build_file:
+            build_data = json.load(build_file)
+        return f"{build_data['MajorVersion']}.{build_data['MinorVersion']}"
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def probe_engine_root(root_path):
+    """
+    Walks an engine root and lists every editor install found directly below it.
+
+    :param root_path: A folder containing engine installs, e.g. 'C:/Program Files/Epic Games'.
+    :return: A list of install dictionaries with executable, build_file, build_mtime_ns and version keys.
+    """
+    try:
+        with os.scandir(root_path) as entries:
+            install_dirs = [entry.path for entry in entries if entry.is_dir()]
+    except OSError:
+        return []
+
+    installs = []
+    for layout in EDITOR_LAYOUTS:
+        for install_dir in install_dirs:
+            engine_dir = os.path.join(install_dir, 'Engine')
+            executable = os.path.join(engine_dir, *layout)
+            if not os.path.isfile(executable):
+                continue
+            build_file = os.path.join(engine_dir, 'Build', 'Build.version')
+            version = read_build_version(build_file)
+            if version is None:
+                continue
+            installs.append({
+                "executable": executable,
+                "build_file": build_file,
+                "build_mtime_ns": os.stat(build_file).st_mtime_ns,
+                "version": version,
+            })
+    return installs
+
+
+def _get_mtime_ns(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def revalidate_engine_root(root_path, cached_root):
+    """
+    Returns the installs of an engine root, reusing the cached ones while nothing changed.
+
+    A root whose own mtime changed (an install was added or removed) is probed again.
+    Otherwise only the Build.version of every cached install is checked, and re-read
+    when its mtime changed.
+
+    :param root_path: A folder containing engine installs.
+    :param cached_root: The cached entry of that root, or None.
+    :return: A tuple (root_entry, changed).
+    """
+    root_mtime_ns = _get_mtime_ns(root_path)
+    if root_mtime_ns is None:
+        root_entry = {"mtime_ns": None, "installs": []}
+        return root_entry, cached_root != root_entry
+    if cached_root is None or cached_root.get("mtime_ns") != root_mtime_ns:
+        return {"mtime_ns": root_mtime_ns, "installs": probe_engine_root(root_path)}, True
+
+    changed = False
+    installs = []
+    for install in cached_root["installs"]:
+        build_mtime_ns = _get_mtime_ns(install["build_file"])
+        if build_mtime_ns is None:
+            changed = True
+            continue
+        if build_mtime_ns != install["build_mtime_ns"]:
+            version = read_build_version(install["build_file"])
+            changed = True
+            if version is None:
+                continue
+            install = dict(install, build_mtime_ns=build_mtime_ns, version=version)
+        installs.append(install)
+    return {"mtime_ns": root_mtime_ns, "installs": installs}, changed
+
+
+class EngineDiscoveryCache:
+    """
+    Persistent cache of the engine installs found below every configured engine root.
+
+    Entries are keyed by root path and revalidated through the root and
+    Build.version mtimes, so a warm start reads one small JSON file and stats a
+    handful of files instead of walking engine trees.
+    """
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.roots = self.load()
+
+    def load(self):
+        try:
+            with open(self.cache_path, 'r') as cache_file:
+                cache_data = json.load(cache_file)
+            roots = cache_data.get("roots")
+            if cache_data.get("version") == ENGINE_CACHE_VERSION and isinstance(roots, dict) and all(
+                    isinstance(root, dict) and isinstance(root.get("installs"), list) for root in roots.values()):
+                return roots
+            print(f"Engine cache {self.cache_path} is outdated, rescanning engines.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Engine cache {self.cache_path} is unreadable, rescanning engines: {e}")
+        return {}
+
+    def save(self):
+        temp_path = f"{self.cache_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(temp_path, 'w') as cache_file:
+                json.dump({"version": ENGINE_CACHE_VERSION, "roots": self.roots}, cache_file, indent=4)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            print(f"Failed to save engine cache to {self.cache_path}: {e}")
+
+    def discover(self, root_paths, force_rescan=False):
+        """
+        Detects the engine installs below the given roots, probing all roots concurrently.
+
+        :param root_paths: Folders containing engine installs.
+        :param force_rescan: Ignore the cache and walk every root again.
+        :return: A dictionary mapping versions ('5.3') to lists of editor executables.
+        """
+        cached_roots = {} if force_rescan else self.roots
+        root_paths = list(dict.fromkeys(root_paths))
+        with ThreadPoolExecutor(max_workers=max(1, len(root_paths)), thread_name_prefix='EngineScan') as executor:
+            results = list(executor.map(
+                lambda root_path: revalidate_engine_root(root_path, cached_roots.get(root_path)), root_paths))
+
+        roots = {}
+        changed = force_rescan or set(root_paths) != set(self.roots)
+        for root_path, (root_entry, root_changed) in zip(root_paths, results):
+            roots[root_path] = root_entry
+            changed = changed or root_changed
+        self.roots = roots
+        if changed:
+            self.save()
+
+        versions_info = {}
+        for root_path in root_paths:
+            for install in roots[root_path]["installs"]:
+                versions_info.setdefault(install["version"], []).append(install["executable"])
+        return versions_info
@@ -0,0 +1,244 @@
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+from .utility import get_cache_directory, load_state_from_json, save_state_to_json
+
+
+LATENCY_HISTORY_VERSION = 1
+PERCENTILES = (50, 90, 99)
+
+_history_lock = threading.Lock()
+
+
+def get_latency_history_path():
+    """Returns the path of the file launch latencies are recorded in."""
+    return os.path.join(get_cache_directory(), 'LaunchLatency.json')
+
+
+@contextmanager
+def hold_file_lock(lock_path):
+    """
+    Holds an exclusive lock on a file while the block runs, waiting for other processes holding it.
+
+    :raises OSError: If the lock file cannot be created or locked.
+    """
+    os.makedirs(os.path.dirname(lock_path) or '.', exist_ok=True)
+    with open(lock_path, 'a+b') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            # Locks the first byte, retrying for up to 10 seconds
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def get_latency_key(project_directory, map_path, mode, engine):
+    """
+    Returns the key launch latencies are grouped by.
+
+    :param engine: The editor executable the project is launched with.
+    :return: A tuple (project_directory, map_path, mode, engine).
+    """
+    return os.path.normpath(os.path.abspath(project_directory)), map_path, mode, engine
+
+
+def get_percentile(values, percent):
+    """Returns the nearest-rank percentile of a list of numbers, None for an empty list."""
+    if not values:
+        return None
+    sorted_values = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class LaunchLatency:
+    """
+    Startup timestamps of one launched instance: process start, first log output and readiness.
+
+    observe() is called by the log reader thread with every line and close() once the
+    output ends. The ready pattern is only searched until it first matches, so
+    following a long log costs nothing once the instance is up.
+
+    The launch is complete, and on_complete called, once the ready pattern matched,
+    at the first output without a ready pattern, or when the output ends, so
+    launches that never become ready are recorded too.
+
+    :param ready_pattern: Regular expression of the log line telling the instance is ready, None or '' to disable.
+    :param on_complete: Called with this object on the reader thread once the launch is complete.
+    """
+
+    def __init__(self, ready_pattern=None, on_complete=None):
+        self.spawn_time = time.monotonic()
+        self.first_output_time = None
+        self.ready_time = None
+        self.ready_pattern = re.compile(ready_pattern) if ready_pattern else None
+        self.on_complete = on_complete
+        self.is_complete = False
+
+    def observe(self, line):
+        if self.first_output_time is None:
+            self.first_output_time = time.monotonic()
+            if self.ready_pattern is None:
+                self.complete()
+        if self.ready_time is None and self.ready_pattern is not None and self.ready_pattern.search(line):
+            self.ready_time = time.monotonic()
+            self.complete()
+
+    def close(self):
+        """Completes a launch that exited, or closed its output, before it became ready."""
+        self.complete()
+
+    def complete(self):
+        if self.is_complete:
+            return
+        self.is_complete = True
+        if self.on_complete is not None:
+            self.on_complete(self)
+
+    @property
+    def time_to_first_output(self):
+        return None if self.first_output_time is None else self.first_output_time - self.spawn_time
+
+    @property
+    def time_to_ready(self):
+        return None if self.ready_time is None else self.ready_time - self.spawn_time
+
+
+class LatencyHistory:
+    """
+    Launch latencies recorded per project, map, launch mode and engine, kept in a JSON file.
+
+    Every record locks the file, through a lock file next to it, and rereads it
+    before appending, so several launcher processes can record into it; only the
+    history_size newest launches of every key are kept. Reads reuse the loaded file
+    until its modification time changes, which coarse file system clocks may miss,
+    so records always reread it. A launch that never became ready has no ready time.
+    """
+
+    def __init__(self, history_path=None, history_size=100):
+        self.history_path = history_path or get_latency_history_path()
+        self.history_size = history_size
+        self.launches = {}
+        self._loaded_mtime = None
+
+    def load(self, force=False):
+        """
+        Loads the history file if it changed since it was last loaded.
+
+        :param force: Reread the file even if its modification time did not change.
+        """
+        try:
+            mtime = os.stat(self.history_path).st_mtime_ns
+        except OSError:
+            self.launches = {}
+            self._loaded_mtime = None
+            return
+        if mtime == self._loaded_mtime and not force:
+            return
+        self._loaded_mtime = mtime
+        self.launches = {}
+        history_data = load_state_from_json(self.history_path)
+        if not isinstance(history_data, dict) or history_data.get("version") != LATENCY_HISTORY_VERSION:
+            return
+        for entry in history_data.get("launches", []):
+            try:
+                key = (entry["project"], entry["map"], entry["mode"], entry["engine"])
+                self.launches[key] = [(float(sample[0]), sample[1], sample[2]) for sample in entry["samples"]]
+            except (KeyError, TypeError, ValueError, IndexError):
+                continue
+
+    def save(self):
+        save_state_to_json({
+            "version": LATENCY_HISTORY_VERSION,
+            "launches": [{"project": key[0], "map": key[1], "mode": key[2], "engine": key[3],
+                          "samples": [list(sample) for sample in samples]}
+                         for key, samples in self.launches.items()],
+        }, self.history_path)
+
+    def record(self, key, latency):
+        """
+        Appends the timings of a launch.
+
+        :param key: A key from get_latency_key().
+        :param latency: The LaunchLatency of the launch.
+        """
+        try:
+            with _history_lock, hold_file_lock(f"{self.history_path}.lock"):
+                # Another process may have written within the same modification time tick
+                self.load(force=True)
+                samples = self.launches.setdefault(key, [])
+                samples.append((time.time(), latency.time_to_first_output, latency.time_to_ready))
+                del samples[:-self.history_size]
+                self.save()
+        except OSError as e:
+            print(f"Failed to record the launch latency in {self.history_path}: {e}")
+
+    def get_keys(self):
+        self.load()
+        return list(self.launches)
+
+    def get_summary(self, key):
+        """
+        Summarizes the recorded launches of a key.
+
+        :return: A dictionary with the number of 'launches', of 'ready_launches' among them and, for
+            'first_output' and 'ready', a dictionary mapping every percentile of PERCENTILES to seconds.
+            None if nothing was recorded.
+        """
+        self.load()
+        samples = self.launches.get(key)
+        if not samples:
+            return None
+        summary = {"launches": len(samples), "ready_launches": sum(sample[2] is not None for sample in samples)}
+        for name, column in (("first_output", 1), ("ready", 2)):
+            values = [sample[column] for sample in samples if sample[column] is not None]
+            summary[name] = {percent: get_percentile(values, percent) for percent in PERCENTILES} if values else None
+        return summary
+
+
+def format_percentiles(percentiles):
+    """Formats percentiles as 'p50 12.3 s · p90 14.0 s · p99 15.1 s'."""
+    if percentiles is None:
+        return "-"
+    return " · ".join(f"p{percent} {percentiles[percent]:.1f} s" for percent in PERCENTILES)
+
+
+def format_latency_report(history, keys, engine_names=None):
+    """
+    Formats the recorded latencies of the given keys as a plain text table.
+
+    :param history: A LatencyHistory.
+    :param keys: The keys to report, one row each.
+    :param engine_names: Optional dictionary mapping editor executables to version names.
+    :return: The lines of the table.
+    """
+    engine_names = engine_names or {}
+    rows = [("Project", "Map", "Mode", "Engine", "Launches", "First output", "Ready")]
+    for key in keys:
+        summary = history.get_summary(key)
+        if summary is None:
+            continue
+        project_directory, map_path, mode, engine = key
+        rows.append((os.path.basename(project_directory), map_path, mode, engine_names.get(engine, engine),
+                     str(summary["launches"]), format_percentiles(summary["first_output"]),
+                     format_percentiles(summary["ready"])))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
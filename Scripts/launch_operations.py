@@ -1,40 +1,74 @@
 import subprocess
 import json
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+from . import tracing
+from .launch_templates import PLACEHOLDER_TYPES, get_launch_template, render_command
 from .utility import read_config, CONFIG_FILE
 
 
-def construct_command(selected_map, selected_mode, uproject_file, project_directory, unreal_versions_info):
+# Nice increments of the launch mode priorities on Linux and macOS, Windows uses the matching priority class
+PRIORITY_NICE_INCREMENTS = {"idle": 19, "below_normal": 10, "normal": 0, "above_normal": -5, "high": -10}
+
+
+@tracing.traced()
+def construct_argv(selected_map, selected_mode, uproject_file, project_directory, unreal_versions_info, port=None):
+    """
+    Builds the arguments of a launch from the parsed launch command of the selected mode.
+
+    :param port: Value of the {port} placeholder, defaults to 'port' in the config.
+    :return: The argv list, or None if the selection is incomplete or the mode has no valid launch command.
+    """
     if not selected_map or not selected_mode or not uproject_file or not project_directory or not unreal_versions_info:
         print("Missing required parameters to construct the command.")
-        return ""
+        return None
 
-    # Retrieve the full path to the selected Unreal Engine version's editor executable
-    editor_executable = unreal_versions_info
-
-    # Check if we have a launch command format for the selected mode
-    launch_command_format = read_config().get("launch_commands", {}).get(selected_mode)
+    config = read_config()
+    launch_command_format = config.get("launch_commands", {}).get(selected_mode)
     if not launch_command_format:
         print(f"Error: Launch command format for {selected_mode} not found in the config.")
-        return ""
+        return None
+
+    uproject_path = str(Path(project_directory) / uproject_file)
+    argv = format_launch_command(launch_command_format, unreal_versions_info, uproject_path, selected_map,
+                                 config["port"] if port is None else port)
+    return list(argv) if argv is not None else None
 
-    # Format the command with the necessary paths
-    uproject_path = Path(project_directory) / uproject_file
-    map_path = f'"{selected_map}"' if selected_map else ""
 
-    # Note: The `map_path` variable must be enclosed in double quotes if it is not empty,
-    # to ensure that the command works correctly with paths that contain spaces.
+@lru_cache(maxsize=256)
+@tracing.traced()
+def format_launch_command(launch_command_format, executable, uproject_path, map_path, port):
+    """
+    Formats a launch command for one selection. Cached, since the same selection is formatted
+    for every preview refresh and launch.
 
-    command = launch_command_format.format(
-        executable=editor_executable,
-        uproject_path=uproject_path,
-        map_path=map_path
-    )
-        
-    return command
+    :return: The argv as a tuple, or None if the launch command is invalid.
+    """
+    try:
+        template = get_launch_template(launch_command_format)
+    except ValueError as e:
+        print(f"Error: Invalid launch command {launch_command_format!r}: {e}")
+        return None
+    values = {"executable": executable, "uproject_path": uproject_path, "map_path": map_path, "port": port}
+    for name in template.placeholders:
+        if not isinstance(values[name], PLACEHOLDER_TYPES[name]):
+            print(f"Error: Invalid value {values[name]!r} for the {{{name}}} placeholder.")
+            return None
+    return tuple(template.format(values))
+
+
+@tracing.traced()
+def construct_command(selected_map, selected_mode, uproject_file, project_directory, unreal_versions_info, port=None):
+    """
+    Builds the command line preview of a launch, as shown in the launcher and copied to the clipboard.
+
+    :return: The command line, or an empty string if the selection is incomplete.
+    """
+    argv = construct_argv(selected_map, selected_mode, uproject_file, project_directory, unreal_versions_info, port)
+    return render_command(argv) if argv else ""
 
 
 def update_launch_option(app_instance, mode):
@@ -44,11 +78,108 @@ def update_launch_option(app_instance, mode):
     app_instance.enable_launch()
     
 
-def execute_command(command):
+@tracing.traced()
+def execute_command(argv, mode=None):
     try:
-        # The actual execution of the command can be separated into its own function for clarity
-        subprocess.Popen(command, shell=True)
-        print(f"Launched with command: {command}")
+        spawn_command(argv, process_policy=get_process_policy(mode))
+        print(f"Launched with command: {render_command(argv)}")
+        return True
     except Exception as e:
         print(f"Failed to execute the command: {e}")
+        return False
+
+
+def get_process_policy(mode):
+    """Returns the process policy of a launch mode from the config, None if the mode has none."""
+    return read_config().get("process_policies", {}).get(mode)
 
+
+def get_nice_increment(process_policy=None):
+    """Returns the nice increment of a process policy on Linux and macOS, 0 elsewhere or without a priority."""
+    if os.name != 'posix' or not process_policy:
+        return 0
+    return PRIORITY_NICE_INCREMENTS.get(process_policy.get("priority"), 0)
+
+
+def apply_process_policy(pid, process_policy=None):
+    """
+    Applies the priority and resource limits of a process policy to a process just started (Linux and macOS only).
+
+    The process must lead its own process group: the priority is set for the whole group, so
+    it also reaches the threads the engine may already have started. Resource limits are set
+    with prlimit, which only Linux has. Until then the engine runs with the settings of the
+    launcher, for the few instructions between starting it and this call.
+
+    :param pid: The process id, which is also the id of its process group.
+    :param process_policy: A validated process policy of the launch mode, or None.
+    """
+    if os.name != 'posix' or not process_policy:
+        return
+    nice_increment = get_nice_increment(process_policy)
+    if nice_increment:
+        nice_value = min(19, max(-20, os.getpriority(os.PRIO_PROCESS, 0) + nice_increment))
+        try:
+            os.setpriority(os.PRIO_PGRP, pid, nice_value)
+        except PermissionError:
+            print("Not allowed to raise the process priority, the engine runs at the priority of the launcher.")
+        except ProcessLookupError:
+            return
+    if "max_address_space_mb" not in process_policy and "max_open_files" not in process_policy:
+        return
+    import resource
+    if not hasattr(resource, 'prlimit'):
+        print("Resource limits of process policies are only applied on Linux.")
+        return
+    for limit, value in ((resource.RLIMIT_AS, process_policy.get("max_address_space_mb", 0) * 1024 * 1024),
+                         (resource.RLIMIT_NOFILE, process_policy.get("max_open_files", 0))):
+        if not value:
+            continue
+        hard_limit = resource.getrlimit(limit)[1]
+        if hard_limit != resource.RLIM_INFINITY:
+            value = min(value, hard_limit)
+        try:
+            resource.prlimit(pid, limit, (value, hard_limit))
+        except ProcessLookupError:
+            return
+
+
+def get_creationflags(process_policy=None):
+    """Returns the Popen creation flags setting the priority class of a process policy on Windows, 0 elsewhere."""
+    if os.name != 'nt' or not process_policy or "priority" not in process_policy:
+        return 0
+    return getattr(subprocess, f"{process_policy['priority'].upper()}_PRIORITY_CLASS")
+
+
+@tracing.traced()
+def spawn_command(argv, capture_output=False, cpu_cores=None, process_policy=None):
+    """
+    Starts a launch directly from its arguments, without a shell, so the returned process is the engine itself.
+
+    :param argv: The arguments built by construct_argv.
+    :param capture_output: Pipe stdout and stderr (merged) to the launcher instead of inheriting the console.
+    :param cpu_cores: Cores to pin the process to before the engine starts (Linux only), None to not pin it.
+        Callers starting pinned processes from several threads must serialize the calls, see CorePlacer.
+    :param process_policy: Priority and resource limits of the launch mode from get_process_policy(), or None.
+    :return: The subprocess.Popen of the started process.
+    """
+    # No code runs in the child (preexec_fn is unsafe with threads), the policy is applied once it started
+    popen_options = {"creationflags": get_creationflags(process_policy)}
+    if get_nice_increment(process_policy):
+        # Its own process group gets the priority as a whole, see apply_process_policy
+        popen_options["start_new_session"] = True
+    previous_cores = None
+    if cpu_cores is not None:
+        # A child starts with the affinity of the thread starting it, which gets its own back right after
+        previous_cores = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, cpu_cores)
+    try:
+        if capture_output:
+            process = subprocess.Popen(list(argv), stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                       stderr=subprocess.STDOUT, **popen_options)
+        else:
+            process = subprocess.Popen(list(argv), **popen_options)
+    finally:
+        if previous_cores is not None:
+            os.sched_setaffinity(0, previous_cores)
+    apply_process_policy(process.pid, process_policy)
+    return process
@@ -0,0 +1,88 @@
+import os
+import shlex
+import string
+import subprocess
+from functools import lru_cache
+
+
+# Placeholders a launch template may use, with the type of their value
+PLACEHOLDER_TYPES = {
+    "executable": str,
+    "uproject_path": str,
+    "map_path": str,
+    "port": int,
+}
+
+
+class LaunchTemplate:
+    """
+    A launch command from the config, split once into argv tokens.
+
+    Template text such as '"{executable}" "{uproject_path}" {map_path}?listen -log'
+    is split with shell quoting rules, so quotes only group words and never end up
+    in the arguments. Each token is kept as literal text and placeholder parts.
+    format() fills the placeholders in and returns the argv list to spawn. A token
+    made only of placeholders that format to nothing (no map selected) is dropped.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.tokens = []
+        try:
+            words = shlex.split(template)
+        except ValueError as e:
+            raise ValueError(f"cannot split {template!r}: {e}")
+        if not words:
+            raise ValueError("the command is empty")
+
+        formatter = string.Formatter()
+        for word in words:
+            parts = []
+            for literal_text, field_name, format_spec, conversion in formatter.parse(word):
+                if field_name is not None and field_name not in PLACEHOLDER_TYPES:
+                    raise ValueError(f"unknown placeholder {{{field_name}}}, expected one of: "
+                                     f"{', '.join(PLACEHOLDER_TYPES)}")
+                if format_spec or conversion:
+                    raise ValueError(f"placeholder {{{field_name}}} cannot have a format specification")
+                parts.append((literal_text, field_name))
+            self.tokens.append(parts)
+
+    @property
+    def placeholders(self):
+        return {field_name for parts in self.tokens for _, field_name in parts if field_name is not None}
+
+    def format(self, values):
+        """
+        Fills the placeholders in.
+
+        :param values: A dictionary with a value of the declared type for every placeholder used.
+        :return: The argv list.
+        """
+        argv = []
+        for parts in self.tokens:
+            token = "".join(literal_text + ("" if field_name is None else str(values[field_name]))
+                            for literal_text, field_name in parts)
+            if token or any(literal_text for literal_text, _ in parts):
+                argv.append(token)
+        return argv
+
+
+@lru_cache(maxsize=None)
+def get_launch_template(template):
+    """
+    Returns the parsed form of a launch command, parsing every distinct command only once.
+
+    :raises ValueError: If the command cannot be parsed.
+    """
+    return LaunchTemplate(template)
+
+
+def render_command(argv):
+    """
+    Renders an argv list as one command line, for previews and the clipboard.
+
+    :return: The command quoted for cmd.exe on Windows and for a POSIX shell elsewhere.
+    """
+    if os.name == 'nt':
+        return subprocess.list2cmdline(argv)
+    return shlex.join(argv)
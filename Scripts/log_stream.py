@@ -0,0 +1,89 @@
+import threading
+from collections import deque
+from itertools import islice
+
+
+DEFAULT_LOG_BUFFER_LINES = 10000
+
+LOG_SEVERITY_INFO = 0
+LOG_SEVERITY_WARNING = 1
+LOG_SEVERITY_ERROR = 2
+
+
+def get_log_severity(line):
+    """
+    Classifies an Unreal log line such as 'LogNet: Warning: ...' by its verbosity.
+
+    :param line: A single log line.
+    :return: LOG_SEVERITY_ERROR, LOG_SEVERITY_WARNING or LOG_SEVERITY_INFO.
+    """
+    if ': Error: ' in line or ': Fatal error' in line:
+        return LOG_SEVERITY_ERROR
+    if ': Warning: ' in line:
+        return LOG_SEVERITY_WARNING
+    return LOG_SEVERITY_INFO
+
+
+class LogBuffer:
+    """
+    Fixed-size ring buffer of log lines.
+
+    Every appended line gets a sequence number. Readers remember the last
+    sequence they saw and call read_since() to get only the new lines; lines
+    pushed out of the buffer before a reader caught up are skipped. Appending
+    and reading are O(1) per line, whatever the size of the buffer.
+    """
+
+    def __init__(self, max_lines=DEFAULT_LOG_BUFFER_LINES):
+        self.lines = deque(maxlen=max_lines)
+        self.sequence = 0
+        self.closed = False
+        self._lock = threading.Lock()
+
+    def append(self, line):
+        with self._lock:
+            self.lines.append(line)
+            self.sequence += 1
+
+    def close(self):
+        """Marks the end of the output, once the process closed its pipe."""
+        self.closed = True
+
+    def read_since(self, sequence):
+        """
+        Returns the lines appended after the given sequence number.
+
+        :param sequence: The sequence number returned by the previous call, 0 to read everything.
+        :return: A tuple (lines, sequence) with the new lines, oldest first, and the sequence to pass next time.
+        """
+        with self._lock:
+            new_line_count = min(self.sequence - sequence, len(self.lines))
+            lines = list(islice(reversed(self.lines), new_line_count))
+            lines.reverse()
+            return lines, self.sequence
+
+
+def start_log_reader(pipe, log_buffer, line_observer=None, on_close=None):
+    """
+    Reads a process pipe line by line on a daemon thread until the process closes it.
+
+    :param pipe: The binary stdout pipe of a subprocess.Popen.
+    :param log_buffer: The LogBuffer receiving the decoded lines.
+    :param line_observer: Called on the reader thread with every line as soon as it is read.
+    :param on_close: Called on the reader thread once the pipe is closed, before the log buffer is.
+    :return: The reader thread.
+    """
+    def read_lines():
+        with pipe:
+            for raw_line in iter(pipe.readline, b''):
+                line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+                if line_observer is not None:
+                    line_observer(line)
+                log_buffer.append(line)
+        if on_close is not None:
+            on_close()
+        log_buffer.close()
+
+    reader = threading.Thread(target=read_lines, daemon=True)
+    reader.start()
+    return reader
@@ -0,0 +1,232 @@
+import json
+import os
+import threading
+import time
+
+from .map_scanner import get_content_roots, list_directory, walk_umap_files
+
+
+MAP_INDEX_VERSION = 1
+
+# Directories modified this close to the scan are relisted next time, because a
+# change landing within the same filesystem timestamp tick would not bump the mtime.
+MTIME_GRANULARITY_NS = 2_000_000_000
+
+
+class MapIndex:
+    """
+    Persistent, incremental index of the maps inside one project.
+
+    For every visited directory the index stores its mtime together with the
+    .umap files and subdirectories it contained. A rescan only relists
+    directories whose mtime changed, so a warm scan costs one stat per directory.
+    """
+
+    def __init__(self, index_path):
+        self.index_path = index_path
+        self.directories = {}
+        self._visited = set()
+        self._dirty = False
+        self._scan_started_ns = 0
+        self._root_directories = None
+        self.load()
+
+    def load(self):
+        """Loads the index file, starting from an empty index when it is missing, outdated or corrupt."""
+        self.directories = {}
+        self._root_directories = None
+        self._dirty = False
+        try:
+            with open(self.index_path, 'r') as index_file:
+                index_data = json.load(index_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Map index {self.index_path} is unreadable, rebuilding it: {e}")
+            self._dirty = True
+            return
+
+        if not self._is_valid(index_data):
+            print(f"Map index {self.index_path} is outdated or corrupt, rebuilding it.")
+            self._dirty = True
+            return
+
+        self.directories = index_data["directories"]
+
+    @staticmethod
+    def _is_valid(index_data):
+        if not isinstance(index_data, dict) or index_data.get("version") != MAP_INDEX_VERSION:
+            return False
+        directories = index_data.get("directories")
+        if not isinstance(directories, dict):
+            return False
+        for entry in directories.values():
+            if not (isinstance(entry, list) and len(entry) == 3
+                    and (entry[0] is None or isinstance(entry[0], int))
+                    and isinstance(entry[1], list) and isinstance(entry[2], list)):
+                return False
+        return True
+
+    def save(self):
+        """Atomically writes the index file if anything changed since it was loaded."""
+        if not self._dirty:
+            return
+        # Unique per writer, a project may be indexed by the launcher and a workspace scan at the same time
+        temp_path = f"{self.index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(temp_path, 'w') as index_file:
+                json.dump({"version": MAP_INDEX_VERSION, "directories": self.directories}, index_file)
+            os.replace(temp_path, self.index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Failed to save map index to {self.index_path}: {e}")
+
+    def list_directory(self, directory):
+        """
+        Lists a directory, reusing the indexed listing while its mtime is unchanged.
+        Safe to call from several scanning threads at once.
+
+        :param directory: The directory to list.
+        :return: A tuple (umap_names, subdirectory_names).
+        """
+        mtime_ns = os.stat(directory).st_mtime_ns
+        self._visited.add(directory)
+        entry = self.directories.get(directory)
+        if entry is not None and entry[0] == mtime_ns:
+            return entry[1], entry[2]
+
+        umap_names, subdirectory_names = list_directory(directory)
+        if mtime_ns >= self._scan_started_ns - MTIME_GRANULARITY_NS:
+            mtime_ns = None
+        self.directories[directory] = [mtime_ns, umap_names, subdirectory_names]
+        self._dirty = True
+        return umap_names, subdirectory_names
+
+    def scan(self, project_directory, max_workers=1):
+        """
+        Scans a project through the index, drops directories that no longer exist and saves the index.
+
+        :param project_directory: Path to the project directory.
+        :param max_workers: Number of scanning threads, see walk_umap_files.
+        :return: A dictionary mapping friendly map names to their Unreal Engine paths.
+        """
+        return dict(self.iter_scan(project_directory, max_workers))
+
+    def iter_scan(self, project_directory, max_workers=1):
+        """
+        Same as scan, but yields (friendly_name, unreal_path) tuples as the walk discovers them.
+
+        The index is only pruned and saved once the generator is exhausted.
+        """
+        self._visited = set()
+        self._scan_started_ns = time.time_ns()
+        yield from walk_umap_files(get_content_roots(project_directory), self.list_directory, max_workers)
+
+        stale_directories = self.directories.keys() - self._visited
+        for directory in stale_directories:
+            del self.directories[directory]
+        if stale_directories:
+            self._dirty = True
+
+        self.save()
+
+    def iter_cached(self, content_roots):
+        """
+        Walks the content roots using only the listings already held in memory.
+
+        :param content_roots: A list of (content_directory, mount_point) tuples.
+        :return: A generator of (friendly_name, unreal_path) tuples.
+        """
+        return walk_umap_files(content_roots, self._cached_listing)
+
+    def _cached_listing(self, directory):
+        entry = self.directories.get(directory)
+        if entry is None:
+            raise FileNotFoundError(directory)
+        return entry[1], entry[2]
+
+    def refresh_directories(self, directories):
+        """
+        Relists indexed directories reported as changed, indexing new subtrees and forgetting removed ones.
+
+        :param directories: Directories whose entries changed. Directories that are not indexed are ignored.
+        :return: A tuple (added_directories, removed_directories).
+        """
+        added_directories = []
+        removed_directories = []
+        for directory in directories:
+            entry = self.directories.get(directory)
+            if entry is None:
+                continue
+            previous_subdirectories = entry[2]
+            try:
+                _, subdirectory_names = self.list_directory(directory)
+            except OSError:
+                removed_directories.extend(self._forget_tree(directory))
+                continue
+
+            current_subdirectories = set(subdirectory_names)
+            for name in previous_subdirectories:
+                if name not in current_subdirectories:
+                    removed_directories.extend(self._forget_tree(os.path.join(directory, name)))
+            previous_subdirectories = set(previous_subdirectories)
+            for name in subdirectory_names:
+                if name not in previous_subdirectories:
+                    added_directories.extend(self._index_tree(os.path.join(directory, name)))
+        return added_directories, removed_directories
+
+    def sync_roots(self, content_roots):
+        """
+        Indexes content roots that appeared and forgets the ones that disappeared.
+
+        :param content_roots: The current list of (content_directory, mount_point) tuples.
+        :return: A tuple (added_directories, removed_directories).
+        """
+        added_directories = []
+        removed_directories = []
+        root_directories = {content_dir for content_dir, _ in content_roots}
+        for content_dir in root_directories:
+            if content_dir not in self.directories:
+                added_directories.extend(self._index_tree(content_dir))
+
+        if self._root_directories is None:
+            for directory in list(self.directories):
+                if directory in self.directories and not self._is_under_roots(directory, root_directories):
+                    removed_directories.extend(self._forget_tree(directory))
+        else:
+            for content_dir in self._root_directories - root_directories:
+                removed_directories.extend(self._forget_tree(content_dir))
+        self._root_directories = root_directories
+        return added_directories, removed_directories
+
+    @staticmethod
+    def _is_under_roots(directory, root_directories):
+        while directory not in root_directories:
+            parent_directory = os.path.dirname(directory)
+            if parent_directory == directory:
+                return False
+            directory = parent_directory
+        return True
+
+    def _index_tree(self, directory):
+        indexed_directories = []
+        stack = [directory]
+        while stack:
+            current_directory = stack.pop()
+            try:
+                _, subdirectory_names = self.list_directory(current_directory)
+            except OSError:
+                continue
+            indexed_directories.append(current_directory)
+            stack.extend(os.path.join(current_directory, name) for name in subdirectory_names)
+        return indexed_directories
+
+    def _forget_tree(self, directory):
+        prefix = os.path.join(directory, '')
+        forgotten_directories = [path for path in self.directories if path == directory or path.startswith(prefix)]
+        for path in forgotten_directories:
+            del self.directories[path]
+        if forgotten_directories:
+            self._dirty = True
+        return forgotten_directories
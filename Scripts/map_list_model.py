@@ -0,0 +1,256 @@
+from itertools import islice
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont, QFontMetrics
+from PyQt5.QtWidgets import QStyle, QStyledItemDelegate
+
+from .map_scanner import get_map_file_path
+from .map_search import SearchResults
+from .umap_metadata import MapMetadataCache
+
+
+FETCH_BATCH_SIZE = 500
+# Returns the MapMetadata of a row, read from the .umap file when first requested
+MAP_METADATA_ROLE = Qt.UserRole + 1
+
+
+class MapListModel(QAbstractListModel):
+    """
+    Friendly map names shown by the maps list.
+
+    Maps are kept in scan order in a plain list. When a search filter is active
+    only the matching names are rows, best matches first, or in scan order for a
+    plain set of matches, which is cheaper to keep up to date while scanning. Rows
+    are handed to the view lazily through fetchMore, FETCH_BATCH_SIZE at a time as
+    the user scrolls, and ranked matches are only read from the search results as
+    they are fetched, so loading or filtering costs the UI one batch of rows
+    whatever the size of the project.
+
+    The metadata of a map is only read from its file when a view asks for it,
+    which views do for the rows they paint or show a tooltip for.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.paths = {}
+        self.rows = self.names
+        self.matches = None
+        # The ranked matches not read into rows yet, None once every match is read or without ranking
+        self.ranked_names = None
+        self.fetched_count = 0
+        self.project_directory = None
+        self.metadata_cache = MapMetadataCache()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.fetched_count
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.fetched_count:
+            return None
+        friendly_name = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return friendly_name
+        if role == MAP_METADATA_ROLE:
+            return self.get_metadata(friendly_name)
+        if role == Qt.ToolTipRole:
+            metadata = self.get_metadata(friendly_name)
+            if metadata is None:
+                return self.paths.get(friendly_name)
+            return f"{self.paths.get(friendly_name)}\n{metadata.get_description()}"
+        return None
+
+    def set_project_directory(self, project_directory):
+        """Sets the project the Unreal paths of the maps are resolved against to read their files."""
+        self.project_directory = project_directory
+
+    def get_metadata(self, friendly_name):
+        """
+        Returns the metadata of a map, cached until its file changes.
+
+        :return: A MapMetadata, or None if the map file cannot be accessed.
+        """
+        unreal_path = self.paths.get(friendly_name)
+        if unreal_path is None or not self.project_directory:
+            return None
+        return self.metadata_cache.get(get_map_file_path(self.project_directory, unreal_path))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and (self.fetched_count < len(self.rows) or self.ranked_names is not None)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self._read_ranked_rows(self.fetched_count + FETCH_BATCH_SIZE)
+        fetch_count = min(FETCH_BATCH_SIZE, len(self.rows) - self.fetched_count)
+        if fetch_count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.fetched_count, self.fetched_count + fetch_count - 1)
+        self.fetched_count += fetch_count
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.names = []
+        self.paths = {}
+        self.rows = self.names
+        self.matches = None
+        self.ranked_names = None
+        self.fetched_count = 0
+        self.endResetModel()
+
+    def add_maps(self, maps, matches=None):
+        """
+        Appends maps at the end of the list.
+
+        :param maps: (friendly_name, unreal_path) pairs. Names already in the list only update their path.
+        :param matches: The matches of the active filter as for set_filter, None when no filter is active.
+            Ranked matches are ranked again with the new maps.
+        """
+        new_names = []
+        for friendly_name, unreal_path in maps:
+            if friendly_name not in self.paths:
+                new_names.append(friendly_name)
+            self.paths[friendly_name] = unreal_path
+        self.names.extend(new_names)
+        if isinstance(matches, SearchResults) or isinstance(self.matches, SearchResults):
+            # New maps may rank anywhere among the matches
+            self.set_filter(matches)
+        elif (matches is None) != (self.matches is None):
+            # The filter was set or cleared while the list was empty, e.g. a query typed before a project is opened
+            self.set_filter(matches)
+        elif matches is not None:
+            self.matches = matches
+            self.rows.extend(friendly_name for friendly_name in new_names if friendly_name in matches)
+        # Views fetch more rows when scrolled to the end, which cannot happen before the first batch fills them
+        if self.fetched_count < FETCH_BATCH_SIZE:
+            self.fetchMore()
+
+    def remove_maps(self, names):
+        removed_names = set(names)
+        if not removed_names:
+            return
+        self.beginResetModel()
+        self.names = [friendly_name for friendly_name in self.names if friendly_name not in removed_names]
+        for friendly_name in removed_names:
+            self.paths.pop(friendly_name, None)
+        if isinstance(self.matches, SearchResults):
+            # The ranked matches left to read skip maps removed from the search index
+            self.rows = [friendly_name for friendly_name in self.rows if friendly_name not in removed_names]
+            self._read_ranked_rows(FETCH_BATCH_SIZE)
+            self.fetched_count = min(FETCH_BATCH_SIZE, len(self.rows))
+        else:
+            self._update_rows()
+        self.endResetModel()
+
+    def set_filter(self, matches):
+        """
+        Shows only the matches of a search.
+
+        :param matches: SearchResults to show best first, a set of friendly names to show in scan order,
+            or None to show every map.
+        """
+        if matches is None and self.matches is None:
+            return
+        self.beginResetModel()
+        self.matches = matches
+        self._update_rows()
+        self.endResetModel()
+
+    def _update_rows(self):
+        self.ranked_names = None
+        if self.matches is None:
+            self.rows = self.names
+        elif isinstance(self.matches, SearchResults):
+            self.rows = []
+            self.ranked_names = iter(self.matches)
+            self._read_ranked_rows(FETCH_BATCH_SIZE)
+        elif len(self.matches) >= len(self.names) and self.matches.issuperset(self.names):
+            # Short queries often match every map, copying is cheaper than testing each name
+            self.rows = list(self.names)
+        else:
+            self.rows = [friendly_name for friendly_name in self.names if friendly_name in self.matches]
+        self.fetched_count = min(FETCH_BATCH_SIZE, len(self.rows))
+
+    def _read_ranked_rows(self, row_count):
+        """Reads ranked matches into rows until there are row_count rows or every match is read."""
+        if self.ranked_names is None or len(self.rows) >= row_count:
+            return
+        self.rows.extend(islice(self.ranked_names, row_count - len(self.rows)))
+        if len(self.rows) < row_count:
+            self.ranked_names = None
+
+    def _find_row(self, friendly_name):
+        try:
+            return self.rows.index(friendly_name)
+        except ValueError:
+            pass
+        # A ranked match may not be read yet
+        while self.ranked_names is not None and friendly_name in self.matches:
+            read_count = len(self.rows)
+            self._read_ranked_rows(read_count + FETCH_BATCH_SIZE)
+            if friendly_name in self.rows[read_count:]:
+                return self.rows.index(friendly_name, read_count)
+        return None
+
+    def get_row(self, friendly_name):
+        """
+        Returns the row of a map, fetching rows up to it if needed.
+
+        :return: The row, or None if the map is not shown.
+        """
+        row = self._find_row(friendly_name)
+        if row is None:
+            return None
+        if row >= self.fetched_count:
+            self.beginInsertRows(QModelIndex(), self.fetched_count, row)
+            self.fetched_count = row + 1
+            self.endInsertRows()
+        return row
+
+    def get_name(self, row):
+        return self.rows[row] if 0 <= row < self.fetched_count else None
+
+
+class MapItemDelegate(QStyledItemDelegate):
+    """
+    Paints the map name as usual and the map metadata summary right-aligned next to it.
+
+    Only painted rows are asked for their metadata, so map files are read for the
+    visible part of the list alone. The summary is left out when it would overlap the name.
+    """
+
+    SUMMARY_MARGIN = 10
+
+    def __init__(self, font_family, parent=None):
+        super().__init__(parent)
+        # The same fonts the maps list style sheet uses for its items
+        name_font = QFont(font_family)
+        name_font.setPixelSize(14)
+        self.name_metrics = QFontMetrics(name_font)
+        self.summary_font = QFont(font_family)
+        self.summary_font.setPixelSize(11)
+        self.summary_metrics = QFontMetrics(self.summary_font)
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)
+        metadata = index.data(MAP_METADATA_ROLE)
+        if metadata is None:
+            return
+        summary = metadata.get_summary()
+        rect = option.rect.adjusted(0, 0, -self.SUMMARY_MARGIN, 0)
+        name_width = self.name_metrics.horizontalAdvance(index.data()) + 2 * self.SUMMARY_MARGIN
+        if name_width + self.summary_metrics.horizontalAdvance(summary) > rect.width():
+            return
+
+        if option.state & QStyle.State_Selected:
+            color = QColor('#dde2fc')
+        elif option.state & QStyle.State_MouseOver:
+            color = QColor('#303030')
+        else:
+            color = QColor('#909090')
+        painter.save()
+        painter.setFont(self.summary_font)
+        painter.setPen(color)
+        painter.drawText(rect, Qt.AlignRight | Qt.AlignVCenter, summary)
+        painter.restore()
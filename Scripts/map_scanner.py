@@ -0,0 +1,157 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+
+UMAP_EXTENSION = '.umap'
+GAME_MOUNT_POINT = '/Game/'
+
+
+def get_content_roots(project_directory):
+    """
+    Lists the content roots of a project together with their Unreal mount points.
+
+    The project 'Content' directory always comes first, followed by every
+    'Plugins/<Plugin>/Content' directory in directory order.
+
+    :param project_directory: Path to the project directory.
+    :return: A list of (content_directory, mount_point) tuples.
+    """
+    roots = [(os.path.join(project_directory, 'Content'), GAME_MOUNT_POINT)]
+    plugins_dir = os.path.join(project_directory, 'Plugins')
+    try:
+        with os.scandir(plugins_dir) as entries:
+            plugin_names = [entry.name for entry in entries if not entry.name.startswith('.')]
+    except OSError:
+        return roots
+
+    for plugin_name in plugin_names:
+        plugin_content_dir = os.path.join(plugins_dir, plugin_name, 'Content')
+        if os.path.isdir(plugin_content_dir):
+            roots.append((plugin_content_dir, f'/{plugin_name}/'))
+    return roots
+
+
+def list_directory(directory):
+    """
+    Lists a single directory in one os.scandir pass.
+
+    Hidden entries (starting with a dot) are skipped, the same way glob skips them.
+
+    :param directory: The directory to list.
+    :return: A tuple (umap_names, subdirectory_names), both in directory order.
+    """
+    umap_names = []
+    subdirectory_names = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith('.'):
+                continue
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            if is_dir:
+                subdirectory_names.append(name)
+            elif os.path.normcase(name).endswith(UMAP_EXTENSION):
+                umap_names.append(name)
+    return umap_names, subdirectory_names
+
+
+def get_unreal_path(mount_point, relative_path):
+    """
+    Builds the Unreal package path of a map from its mount point and content-relative path.
+
+    :param mount_point: The mount point of the content root, e.g. '/Game/'.
+    :param relative_path: The path of the .umap file relative to the content root.
+    :return: The Unreal path, e.g. '/Game/Maps/L_Arena'.
+    """
+    return mount_point + relative_path.replace('\\', '/').replace(UMAP_EXTENSION, '')
+
+
+def get_map_file_path(project_directory, unreal_path):
+    """
+    Returns the .umap file of a map from its Unreal path, the inverse of get_unreal_path.
+
+    :param project_directory: Path to the project directory.
+    :param unreal_path: The Unreal path of the map, e.g. '/Game/Maps/L_Arena' or '/MyPlugin/L_Test'.
+    :return: The path of the .umap file, e.g. '<project>/Content/Maps/L_Arena.umap'.
+    """
+    mount_name, _, relative_path = unreal_path.lstrip('/').partition('/')
+    if f'/{mount_name}/' == GAME_MOUNT_POINT:
+        content_dir = os.path.join(project_directory, 'Content')
+    else:
+        content_dir = os.path.join(project_directory, 'Plugins', mount_name, 'Content')
+    return os.path.join(content_dir, *relative_path.split('/')) + UMAP_EXTENSION
+
+
+def walk_umap_files(content_roots, lister=list_directory, max_workers=1):
+    """
+    Walks all content roots with a single explicit stack and yields every map found.
+
+    Each stack entry carries the mount point of the root it descends from, so
+    the Unreal path is known as soon as a map is listed. Directories are
+    visited in pre-order, matching the order of a recursive glob.
+
+    :param content_roots: A list of (content_directory, mount_point) tuples.
+    :param lister: Callable returning (umap_names, subdirectory_names) for a directory.
+    :param max_workers: Number of scanning threads; more than one splits the walk
+        per first-level subfolder of every root, see walk_umap_files_parallel.
+    :return: A generator of (friendly_name, unreal_path) tuples.
+    """
+    if max_workers > 1:
+        return walk_umap_files_parallel(content_roots, lister, max_workers)
+    return _walk_stack([(content_dir, mount_point, '') for content_dir, mount_point in reversed(content_roots)],
+                       lister)
+
+
+def walk_umap_files_parallel(content_roots, lister, max_workers):
+    """
+    Walks the content roots on a bounded thread pool and yields every map found.
+
+    All roots are listed concurrently, then every first-level subfolder of every
+    root is walked as its own task. Results are merged in submission order, so
+    the output is identical to the sequential walk.
+
+    :param content_roots: A list of (content_directory, mount_point) tuples.
+    :param lister: Thread-safe callable returning (umap_names, subdirectory_names) for a directory.
+    :param max_workers: Maximum number of scanning threads.
+    :return: A generator of (friendly_name, unreal_path) tuples.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='MapScan')
+    try:
+        root_listings = [executor.submit(lister, content_dir) for content_dir, _ in content_roots]
+        segments = []
+        for (content_dir, mount_point), root_listing in zip(content_roots, root_listings):
+            try:
+                umap_names, subdirectory_names = root_listing.result()
+            except OSError:
+                continue
+            segments.append([(name, get_unreal_path(mount_point, name)) for name in umap_names])
+            for name in subdirectory_names:
+                stack = [(os.path.join(content_dir, name), mount_point, f'{name}/')]
+                segments.append(executor.submit(_collect_stack, stack, lister))
+
+        for segment in segments:
+            yield from (segment if isinstance(segment, list) else segment.result())
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def _collect_stack(stack, lister):
+    return list(_walk_stack(stack, lister))
+
+
+def _walk_stack(stack, lister):
+    while stack:
+        directory, mount_point, relative_dir = stack.pop()
+        try:
+            umap_names, subdirectory_names = lister(directory)
+        except OSError:
+            continue
+
+        for name in umap_names:
+            yield name, get_unreal_path(mount_point, relative_dir + name)
+
+        for name in reversed(subdirectory_names):
+            stack.append((os.path.join(directory, name), mount_point, f'{relative_dir}{name}/'))
@@ -0,0 +1,496 @@
+import re
+from collections import defaultdict
+from itertools import islice
+
+from .map_scanner import UMAP_EXTENSION
+
+
+TOKEN_SEPARATORS = re.compile(r'[/_\-\s.]+')
+# Queries of this length or shorter are answered from the word prefix tables, longer ones from trigrams
+MAX_PREFIX_LENGTH = 2
+MAX_TYPO_TRIGRAMS = 3
+# Up to this many maps changed at once are applied to the rank orders, more rebuild them when next needed
+MAX_ORDER_UPDATE = 64
+# Rank groups of up to this many maps are sorted directly, larger ones are filtered from the rank orders
+MAX_SORTED_GROUP = 2000
+# Matches of queries with up to this many candidates are collected before ranking, to count and test them exactly
+MAX_COLLECTED_MATCHES = 20000
+# Sorts after every string starting with the same characters
+MAX_CHARACTER = chr(0x10FFFF)
+
+
+def get_search_key(friendly_name):
+    """Lowercases a friendly map name and strips the '.umap' extension."""
+    key = friendly_name.lower()
+    return key[:-len(UMAP_EXTENSION)] if key.endswith(UMAP_EXTENSION) else key
+
+
+def get_trigrams(text):
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def get_word_prefixes(text):
+    """Returns the first one and two characters of every word ('l_arena_night' -> 'l', 'a', 'ar', 'n', 'ni')."""
+    return {word[:length] for word in TOKEN_SEPARATORS.split(text) if word
+            for length in range(1, MAX_PREFIX_LENGTH + 1)}
+
+
+def get_word_start_pattern(query):
+    """Returns a pattern matching the query at the start of any word of a search key."""
+    return re.compile(r'(?:^|[/_\-\s.])' + re.escape(query))
+
+
+def get_transpositions(text):
+    """Returns the text with each pair of neighbouring characters swapped ('arnea' -> 'ranea', 'anrea', ...)."""
+    return {text[:index] + text[index + 1] + text[index] + text[index + 2:]
+            for index in range(len(text) - 1) if text[index] != text[index + 1]}
+
+
+def find_position(names, sort_key, get_sort_key):
+    """Returns the position of the first name of a sorted list whose sort key is not below sort_key."""
+    low, high = 0, len(names)
+    while low < high:
+        middle = (low + high) // 2
+        if get_sort_key(names[middle]) < sort_key:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def sort_rank_orders(keys):
+    """
+    Sorts map names for ranking, see MapSearchIndex.set_rank_orders().
+
+    :param keys: A dictionary mapping friendly names to their search keys.
+    :return: A tuple (key_order, tie_order) of name lists, sorted by (key, name) and by (key length, key, name).
+    """
+    # Stable sorts by plain strings and numbers, much faster than sorting tuples
+    key_order = sorted(sorted(keys), key=keys.get)
+    tie_order = sorted(key_order, key=lambda friendly_name: len(keys[friendly_name]))
+    return key_order, tie_order
+
+
+def add_posting(postings, keys, value):
+    for key in keys:
+        postings[key].add(value)
+
+
+def discard_posting(postings, keys, value):
+    for key in keys:
+        values = postings.get(key)
+        if values is not None:
+            values.discard(value)
+            if not values:
+                del postings[key]
+
+
+class MapSearchIndex:
+    """
+    Incremental fuzzy search over friendly map names and their Unreal paths.
+
+    Map names are indexed by their trigrams and by the first characters of each
+    word. Folders are indexed the same way, once per folder rather than once per
+    map, since many maps share them. Queries of up to two characters are answered
+    from the word prefix tables; longer queries intersect trigram postings,
+    smallest first. When that finds no map, the query probably has a typo and
+    names missing up to half of its trigrams (at most one typo) are accepted too,
+    with candidates drawn from its rarest trigrams only, as are names containing
+    the query with two neighbouring characters swapped. A query containing '/'
+    matches the folder part before the last '/' and the name part after it.
+
+    Searches rank matches as they are read. The maps are kept sorted by search key
+    and by the tie order within a rank group, so each group is read in order from
+    the tables above or filtered from the tie order, and showing the best matches
+    costs about as much as finding them, however many maps match.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.folders = {}
+        self.name_trigrams = defaultdict(set)
+        self.name_prefixes = defaultdict(set)
+        self.folder_maps = defaultdict(set)
+        self.folder_trigrams = defaultdict(set)
+        self.folder_prefixes = defaultdict(set)
+        # Every name sorted by (key, name) and by (key length, key, name), None until a search needs them
+        self.key_order = None
+        self.tie_order = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, friendly_name):
+        return friendly_name in self.keys
+
+    def clear(self):
+        for table in (self.keys, self.folders, self.name_trigrams, self.name_prefixes, self.folder_maps,
+                      self.folder_trigrams, self.folder_prefixes):
+            table.clear()
+        self.key_order = self.tie_order = None
+
+    def add(self, friendly_name, unreal_path):
+        """Indexes a map, replacing its previous entry if the name is already indexed."""
+        if friendly_name in self.keys:
+            self.remove(friendly_name)
+        key = get_search_key(friendly_name)
+        folder = unreal_path.lower().rsplit('/', 1)[0]
+        self.keys[friendly_name] = key
+        self.folders[friendly_name] = folder
+        add_posting(self.name_trigrams, get_trigrams(key), friendly_name)
+        add_posting(self.name_prefixes, get_word_prefixes(key), friendly_name)
+        if folder not in self.folder_maps:
+            add_posting(self.folder_trigrams, get_trigrams(folder), folder)
+            add_posting(self.folder_prefixes, get_word_prefixes(folder), folder)
+        self.folder_maps[folder].add(friendly_name)
+        self._update_rank_orders(friendly_name, True)
+
+    def update(self, maps):
+        """Indexes an iterable of (friendly_name, unreal_path) pairs."""
+        maps = list(maps)
+        if len(maps) > MAX_ORDER_UPDATE:
+            # Inserting one by one costs more than sorting again when many maps change, e.g. while scanning
+            self.key_order = self.tie_order = None
+        for friendly_name, unreal_path in maps:
+            self.add(friendly_name, unreal_path)
+
+    def remove(self, friendly_name):
+        if friendly_name not in self.keys:
+            return
+        self._update_rank_orders(friendly_name, False)
+        key = self.keys.pop(friendly_name)
+        folder = self.folders.pop(friendly_name)
+        discard_posting(self.name_trigrams, get_trigrams(key), friendly_name)
+        discard_posting(self.name_prefixes, get_word_prefixes(key), friendly_name)
+        discard_posting(self.folder_maps, (folder,), friendly_name)
+        if folder not in self.folder_maps:
+            discard_posting(self.folder_trigrams, get_trigrams(folder), folder)
+            discard_posting(self.folder_prefixes, get_word_prefixes(folder), folder)
+
+    def remove_all(self, friendly_names):
+        """Removes every map of an iterable of friendly names."""
+        friendly_names = list(friendly_names)
+        if len(friendly_names) > MAX_ORDER_UPDATE:
+            self.key_order = self.tie_order = None
+        for friendly_name in friendly_names:
+            self.remove(friendly_name)
+
+    def build_rank_orders(self):
+        """
+        Sorts the maps for ranking if a change invalidated the orders; searches call it when needed.
+        Indexes shown by the launcher are sorted off the GUI thread, see set_rank_orders().
+        """
+        if self.key_order is not None:
+            return
+        self.key_order, self.tie_order = sort_rank_orders(self.keys)
+
+    def set_rank_orders(self, rank_orders):
+        """
+        Takes rank orders sorted by sort_rank_orders() on a worker thread, if the orders are invalid
+        and the sorted names are still exactly the indexed ones.
+
+        :param rank_orders: A tuple (key_order, tie_order), or None.
+        """
+        if rank_orders is None or self.key_order is not None:
+            return
+        key_order, tie_order = rank_orders
+        # The orders hold every name once, so the same count of indexed names means the same names
+        if len(key_order) == len(self.keys) and all(friendly_name in self.keys for friendly_name in key_order):
+            self.key_order, self.tie_order = key_order, tie_order
+
+    def _get_key_entry(self, friendly_name):
+        return self.keys[friendly_name], friendly_name
+
+    def _get_tie_entry(self, friendly_name):
+        key = self.keys[friendly_name]
+        return len(key), key, friendly_name
+
+    def _update_rank_orders(self, friendly_name, added):
+        """Inserts an indexed map into the rank orders or deletes one about to be removed from the index."""
+        if self.key_order is None:
+            return
+        for order, get_entry in ((self.key_order, self._get_key_entry), (self.tie_order, self._get_tie_entry)):
+            position = find_position(order, get_entry(friendly_name), get_entry)
+            if added:
+                order.insert(position, friendly_name)
+            else:
+                del order[position]
+
+    def find(self, query):
+        """
+        Returns the names of all maps matching the query, unordered.
+
+        :param query: The search text, case insensitive.
+        :return: A set of friendly names, or None for an empty query (everything matches).
+        """
+        query = query.strip().lower()
+        if not query:
+            return None
+        return self._match(query).to_set()
+
+    def _match(self, query):
+        if '/' in query:
+            folder_query, name_query = query.rsplit('/', 1)
+            return QueryMatches(self, self._find_names(name_query) if name_query else None,
+                                self._find_folders(folder_query) if folder_query else None, require_both=True)
+        return QueryMatches(self, self._find_names(query), self._find_folders(query), require_both=False)
+
+    def _find_names(self, query):
+        if len(query) <= MAX_PREFIX_LENGTH:
+            return self.name_prefixes.get(query, set())
+        trigrams = get_trigrams(query)
+        postings = sorted((self.name_trigrams.get(trigram, set()) for trigram in trigrams), key=len)
+        matches = postings[0].intersection(*postings[1:])
+        if matches:
+            return matches
+
+        # Swapped characters break up to four trigrams, more than a typo may, so the swaps are looked up as typed
+        for transposition in get_transpositions(query):
+            matches |= self._find_containing_names(transposition)
+        # One mistyped character breaks up to three trigrams
+        allowed_misses = min(MAX_TYPO_TRIGRAMS, len(trigrams) // 2)
+        if not allowed_misses:
+            return matches
+        # A name missing at most allowed_misses trigrams contains one of any allowed_misses + 1 of them
+        candidates = set().union(*postings[:allowed_misses + 1])
+        required_hits = len(trigrams) - allowed_misses
+        matches.update(friendly_name for friendly_name in candidates
+                       if sum(trigram in self.keys[friendly_name] for trigram in trigrams) >= required_hits)
+        return matches
+
+    def _find_containing_names(self, query):
+        """Returns the names whose search key contains the query, the query having at least three characters."""
+        postings = sorted((self.name_trigrams.get(trigram, set()) for trigram in get_trigrams(query)), key=len)
+        return {friendly_name for friendly_name in postings[0].intersection(*postings[1:])
+                if query in self.keys[friendly_name]}
+
+    def _find_folders(self, query):
+        if len(query) <= MAX_PREFIX_LENGTH:
+            return self.folder_prefixes.get(query, set())
+        postings = sorted((self.folder_trigrams.get(trigram, set()) for trigram in get_trigrams(query)), key=len)
+        return {folder for folder in postings[0].intersection(*postings[1:]) if query in folder}
+
+    def _get_folder_maps(self, folders):
+        return set().union(*(self.folder_maps[folder] for folder in folders))
+
+    def rank(self, friendly_name, query):
+        """
+        Returns the sort key of a match: exact names first, then names starting with the
+        query, names with a word starting with it, names containing it, maps in a folder
+        containing it and fuzzy matches; shorter names first within each group.
+        """
+        key = self.keys[friendly_name]
+        return self._get_score(friendly_name, query, get_word_start_pattern(query)), len(key), key, friendly_name
+
+    def _get_score(self, friendly_name, query, word_start):
+        key = self.keys[friendly_name]
+        if key == query:
+            return 0
+        if key.startswith(query):
+            return 1
+        if word_start.search(key):
+            return 2
+        if query in key:
+            return 3
+        if query in self.folders[friendly_name]:
+            return 4
+        return 5
+
+    def search(self, query, limit=None):
+        """
+        Returns the maps matching the query, best matches first.
+
+        :param query: The search text, case insensitive.
+        :param limit: Maximum number of results, None for all of them.
+        :return: A list of friendly names.
+        """
+        results = self.search_lazily(query)
+        if results is None:
+            self.build_rank_orders()
+            return self.tie_order[:limit]
+        return results.take(limit)
+
+    def search_lazily(self, query):
+        """
+        Returns the maps matching the query, ranked only as far as they are read.
+
+        The results are read from the index as it is, read them before changing it.
+
+        :param query: The search text, case insensitive.
+        :return: SearchResults, or None for an empty query (everything matches).
+        """
+        query = query.strip().lower()
+        if not query:
+            return None
+        matches = self._match(query)
+        # Paths are ranked by their name part
+        return SearchResults(matches, self._iter_ranked(matches, query.rsplit('/', 1)[-1]))
+
+    def _iter_ranked(self, matches, query):
+        word_start = get_word_start_pattern(query)
+
+        def rank(friendly_name):
+            key = self.keys[friendly_name]
+            return self._get_score(friendly_name, query, word_start), len(key), key, friendly_name
+
+        matches.collect(MAX_COLLECTED_MATCHES)
+        if matches.get_count_bound() <= MAX_SORTED_GROUP:
+            yield from sorted(matches.to_set(), key=rank)
+            return
+
+        def has_score(score):
+            return lambda friendly_name: (friendly_name in matches
+                                          and self._get_score(friendly_name, query, word_start) == score)
+
+        self.build_rank_orders()
+        keys = self.keys
+        # Exact names and names starting with the query, an exact name is the shortest of them
+        start = find_position(self.key_order, (query,), self._get_key_entry)
+        end = find_position(self.key_order, (query + MAX_CHARACTER,), self._get_key_entry)
+        if end - start <= MAX_SORTED_GROUP:
+            yield from self._sort_group(filter(matches.__contains__, self.key_order[start:end]))
+        else:
+            # Names removed from the index since are no longer matches
+            yield from (friendly_name for friendly_name in self.tie_order
+                        if friendly_name in matches and keys[friendly_name].startswith(query))
+        if not query:
+            # A path query without a name part, every name starts with it
+            return
+
+        # Names with a word starting with the query contain it, short queries have their own table
+        if len(query) <= MAX_PREFIX_LENGTH and not TOKEN_SEPARATORS.search(query):
+            yield from self._iter_group(self.name_prefixes.get(query, set()), has_score(2))
+            containing = self._get_containing_candidates(query)
+        else:
+            containing = self._get_containing_candidates(query)
+            yield from self._iter_group(containing, has_score(2))
+        yield from self._iter_group(containing, has_score(3))
+
+        if len(query) > MAX_PREFIX_LENGTH:
+            folders = self._find_folders(query)
+        else:
+            folders = {folder for folder in self.folder_maps if query in folder}
+        if sum(len(self.folder_maps[folder]) for folder in folders) <= MAX_SORTED_GROUP:
+            yield from self._iter_group(self._get_folder_maps(folders), has_score(4))
+        else:
+            in_folder = has_score(4)
+            yield from self._iter_group(None, lambda friendly_name: (self.folders.get(friendly_name) in folders
+                                                                      and in_folder(friendly_name)))
+        # Fuzzy matches are matched by name, path queries without a name part rank every match above
+        yield from self._iter_group(matches.names, has_score(5))
+
+    def _get_containing_candidates(self, query):
+        """Returns a superset of the names whose search key contains the query."""
+        if len(query) > MAX_PREFIX_LENGTH:
+            postings = sorted((self.name_trigrams.get(trigram, set()) for trigram in get_trigrams(query)), key=len)
+            return postings[0].intersection(*postings[1:])
+        # Keys of three characters or more contain a shorter query in one of their trigrams
+        short_names = self.tie_order[:find_position(self.tie_order, (3,), self._get_tie_entry)]
+        return set(short_names).union(*(names for trigram, names in self.name_trigrams.items() if query in trigram))
+
+    def _iter_group(self, candidates, accept):
+        """
+        Returns the accepted names of a rank group in tie order.
+
+        :param candidates: A superset of the group, or None to consider every map.
+        :param accept: Returns True for the names of the group.
+        """
+        if candidates is None:
+            return filter(accept, self.tie_order)
+        if len(candidates) <= MAX_SORTED_GROUP:
+            return iter(self._sort_group(filter(accept, candidates)))
+        # Large groups are read from the tie order as far as needed, skipping other names cheaply
+        return (friendly_name for friendly_name in self.tie_order
+                if friendly_name in candidates and accept(friendly_name))
+
+    def _sort_group(self, names):
+        keys = self.keys
+        return sorted(names, key=lambda friendly_name: (len(keys[friendly_name]), keys[friendly_name], friendly_name))
+
+
+class QueryMatches:
+    """
+    The maps matching a query, tested one by one rather than collected, unless there are few candidates.
+
+    :param names: Names matched by the name part of the query, None if it has none.
+    :param folders: Folders matched by the folder part of the query, None if it has none.
+    :param require_both: True for path queries, whose maps must match both parts.
+    """
+
+    def __init__(self, index, names, folders, require_both):
+        self.index = index
+        self.names = names
+        self.folders = folders
+        self.require_both = require_both
+        self.collected = None
+        self._folder_map_count = None
+
+    def collect(self, max_count):
+        """Collects the matches into a set if there are at most max_count candidates."""
+        if self.collected is None and self.get_count_bound() <= max_count:
+            self.collected = self.to_set()
+
+    def __contains__(self, friendly_name):
+        if self.collected is not None:
+            # Names removed from the index since are no longer matches
+            return friendly_name in self.collected and friendly_name in self.index.keys
+        folder = self.index.folders.get(friendly_name)
+        if folder is None:
+            return False
+        in_names = self.names is None or friendly_name in self.names
+        in_folders = self.folders is None or folder in self.folders
+        return (in_names and in_folders) if self.require_both else (in_names or in_folders)
+
+    def get_count_bound(self):
+        """Returns an upper bound of the number of matches, exact once they are collected."""
+        if self.collected is not None:
+            return len(self.collected)
+        name_count = len(self.index.keys) if self.names is None else len(self.names)
+        folder_count = self._get_folder_map_count()
+        return min(name_count, folder_count) if self.require_both else name_count + folder_count
+
+    def _get_folder_map_count(self):
+        if self._folder_map_count is None:
+            folder_maps = self.index.folder_maps
+            self._folder_map_count = (len(self.index.keys) if self.folders is None
+                                      else sum(len(folder_maps[folder]) for folder in self.folders))
+        return self._folder_map_count
+
+    def to_set(self):
+        if self.collected is not None:
+            return set(self.collected)
+        # Testing the folder of a name costs about as much as copying ten names while joining folders
+        if self.require_both and self.names is not None and len(self.names) * 10 <= self._get_folder_map_count():
+            if self.folders is None:
+                return set(self.names)
+            folders = self.index.folders
+            return {friendly_name for friendly_name in self.names if folders[friendly_name] in self.folders}
+        folder_maps = (None if self.folders is None
+                       else set().union(*(self.index.folder_maps[folder] for folder in self.folders)))
+        if not self.require_both:
+            return folder_maps.union(self.names)
+        if self.names is None:
+            return set(self.index.keys) if folder_maps is None else folder_maps
+        return folder_maps & self.names
+
+
+class SearchResults:
+    """
+    The maps matching a query, ranked as they are read.
+
+    Iterating yields the names best first and can be done once; membership is tested without ranking.
+    """
+
+    def __init__(self, matches, ranked_names):
+        self.matches = matches
+        self.ranked_names = ranked_names
+
+    def __contains__(self, friendly_name):
+        return friendly_name in self.matches
+
+    def __iter__(self):
+        return self.ranked_names
+
+    def take(self, count=None):
+        """Returns the next count names in rank order, all remaining ones for None."""
+        return list(islice(self.ranked_names, count))
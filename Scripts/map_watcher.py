@@ -0,0 +1,151 @@
+import os
+
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+
+from .ui_workers import MapIndexRefreshWorker
+
+
+class MapWatcher(QObject):
+    """
+    Keeps the maps of a project in sync with the disk without full rescans.
+
+    Every indexed Content directory is watched with QFileSystemWatcher (inotify
+    on Linux). Change notifications are collected for COALESCE_INTERVAL_MS, then
+    only the reported directories are relisted through the project's MapIndex.
+    When the directories cannot all be watched, for example because the inotify
+    watch limit is reached, the watcher falls back to polling the index.
+
+    The index is loaded, updated and saved by a MapIndexRefreshWorker, one at a
+    time, so the GUI thread only applies the difference. maps_changed is emitted
+    with the added maps and the ones whose path changed, the names that were added
+    and removed, and the rank orders of the maps after large changes (see
+    MapIndexRefreshWorker); renames show up as a removal plus an addition.
+    """
+
+    COALESCE_INTERVAL_MS = 300
+    POLL_INTERVAL_MS = 3000
+
+    maps_changed = pyqtSignal(dict, list, list, object)
+
+    def __init__(self, project_directory, maps_with_paths, parent=None):
+        super().__init__(parent)
+        self.project_directory = project_directory
+        self.maps_with_paths = dict(maps_with_paths)
+        # Loaded by the first refresh worker
+        self.map_index = None
+        self.pending_directories = set()
+        self.polling = False
+        self.refresh_worker = None
+        self.initial_sync_done = False
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+
+        self.coalesce_timer = QTimer(self)
+        self.coalesce_timer.setSingleShot(True)
+        self.coalesce_timer.setInterval(self.COALESCE_INTERVAL_MS)
+        self.coalesce_timer.timeout.connect(self.apply_pending_changes)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.refresh_index)
+
+    def start(self):
+        # Syncs the content roots, the watches are installed once the worker finished
+        self.start_refresh_worker(set())
+
+    def stop(self):
+        self.coalesce_timer.stop()
+        self.poll_timer.stop()
+        watched_paths = self.watcher.directories()
+        if watched_paths:
+            self.watcher.removePaths(watched_paths)
+        if self.refresh_worker is not None:
+            self.refresh_worker.wait()
+            self.refresh_worker = None
+
+    def get_static_directories(self):
+        """Returns the directories outside Content whose changes can add or remove content roots."""
+        directories = [self.project_directory]
+        plugins_dir = os.path.join(self.project_directory, 'Plugins')
+        try:
+            with os.scandir(plugins_dir) as entries:
+                plugin_directories = [entry.path for entry in entries
+                                      if not entry.name.startswith('.') and entry.is_dir()]
+        except OSError:
+            return directories
+        directories.append(plugins_dir)
+        directories.extend(plugin_directories)
+        return directories
+
+    def update_watched_directories(self):
+        if self.polling or self.map_index is None:
+            return
+        wanted_directories = set(self.get_static_directories())
+        wanted_directories.update(self.map_index.directories)
+        watched_directories = set(self.watcher.directories())
+
+        unwatched_directories = [path for path in watched_directories - wanted_directories if os.path.isdir(path)]
+        if unwatched_directories:
+            self.watcher.removePaths(unwatched_directories)
+        new_directories = list(wanted_directories - watched_directories)
+        if new_directories and self.watcher.addPaths(new_directories):
+            self.start_polling()
+
+    def start_polling(self):
+        print(f"Unable to watch every directory of {self.project_directory}, polling for map changes instead.")
+        self.polling = True
+        watched_paths = self.watcher.directories()
+        if watched_paths:
+            self.watcher.removePaths(watched_paths)
+        self.poll_timer.start()
+
+    def directory_changed(self, path):
+        self.pending_directories.add(path)
+        # Throttle rather than debounce, so a continuous stream of saves still gets applied
+        if not self.coalesce_timer.isActive():
+            self.coalesce_timer.start()
+
+    def apply_pending_changes(self):
+        if self.refresh_worker is not None:
+            # The index belongs to the refresh worker until it finishes
+            self.coalesce_timer.start()
+            return
+
+        changed_directories = self.pending_directories
+        self.pending_directories = set()
+        self.start_refresh_worker(changed_directories)
+
+    def refresh_index(self):
+        if self.refresh_worker is not None:
+            return
+        self.start_refresh_worker(None)
+
+    def start_refresh_worker(self, changed_directories):
+        """Updates the index off the GUI thread, relisting changed_directories or, if None, the whole project."""
+        self.refresh_worker = MapIndexRefreshWorker(self.map_index, self.project_directory, self.maps_with_paths,
+                                                    changed_directories, self)
+        self.refresh_worker.maps_refreshed.connect(self.index_refreshed)
+        self.refresh_worker.finished.connect(self.refresh_worker_finished)
+        self.refresh_worker.start()
+
+    def index_refreshed(self, changed_maps, added_names, removed_names, rank_orders):
+        if self.sender() is not self.refresh_worker:
+            return
+        for friendly_name in removed_names:
+            del self.maps_with_paths[friendly_name]
+        self.maps_with_paths.update(changed_maps)
+        self.maps_changed.emit(changed_maps, added_names, removed_names, rank_orders)
+
+    def refresh_worker_finished(self):
+        worker = self.sender()
+        if worker is self.refresh_worker:
+            self.refresh_worker = None
+            self.map_index = worker.map_index
+            # The refresh may have discovered directories that still need a watch
+            self.update_watched_directories()
+            if not self.initial_sync_done:
+                self.initial_sync_done = True
+                # Catch anything that changed between the last scan and the watches being installed
+                self.refresh_index()
+        worker.deleteLater()
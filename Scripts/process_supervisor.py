@@ -0,0 +1,232 @@
+import os
+import subprocess
+import threading
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from . import tracing
+from .cpu_placement import CorePlacer
+from .launch_latency import LatencyHistory, LaunchLatency
+from .log_stream import LogBuffer, start_log_reader
+from .utility import read_config
+
+
+PROC_DIR = '/proc'
+# Seconds a terminated instance gets to exit before it is killed
+KILL_GRACE_SECONDS = 5.0
+
+
+def read_proc_usage(pid):
+    """
+    Reads the CPU time and resident memory of a process from /proc (Linux only).
+
+    :param pid: The process id.
+    :return: A tuple (cpu_seconds, rss_bytes), or None if the process cannot be read.
+    """
+    try:
+        with open(os.path.join(PROC_DIR, str(pid), 'stat'), 'rb') as stat_file:
+            stat_fields = stat_file.read().rsplit(b')', 1)[1].split()
+        with open(os.path.join(PROC_DIR, str(pid), 'statm'), 'rb') as statm_file:
+            resident_pages = int(statm_file.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    # utime and stime are fields 14 and 15 of /proc/<pid>/stat, counted after the ')' of the command name
+    cpu_ticks = int(stat_fields[11]) + int(stat_fields[12])
+    return cpu_ticks / os.sysconf('SC_CLK_TCK'), resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+def read_psutil_usage(pid):
+    """
+    Reads the CPU time and resident memory of a process through psutil.
+
+    :param pid: The process id.
+    :return: A tuple (cpu_seconds, rss_bytes), or None if the process cannot be read.
+    """
+    try:
+        process = psutil.Process(pid)
+        cpu_times = process.cpu_times()
+        return cpu_times.user + cpu_times.system, process.memory_info().rss
+    except psutil.Error:
+        return None
+
+
+def get_usage_reader():
+    """Returns the best available process usage reader, or None if usage cannot be sampled here."""
+    if psutil is not None:
+        return read_psutil_usage
+    if os.path.isdir(PROC_DIR):
+        return read_proc_usage
+    return None
+
+
+def stop_processes(processes, grace_seconds=KILL_GRACE_SECONDS):
+    """
+    Terminates processes and waits for them to exit, killing the ones still running after grace_seconds.
+
+    :param processes: The subprocess.Popen objects to stop, exited ones are only reaped.
+    :param grace_seconds: Seconds the processes get together to exit after terminate().
+    """
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    deadline = time.monotonic() + grace_seconds
+    for process in processes:
+        try:
+            process.wait(max(0.0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+class ManagedProcess:
+    """A launched engine instance together with its latest resource usage sample, startup timings and CPU cores."""
+
+    def __init__(self, label, process, command, log=None, latency=None, cpu_cores=None):
+        self.label = label
+        self.process = process
+        self.command = command
+        self.log = log
+        self.latency = latency
+        self.cpu_cores = cpu_cores
+        self.pid = process.pid
+        self.start_time = time.monotonic()
+        self.end_time = None
+        self.exit_code = None
+        self.terminate_time = None
+        self.cpu_percent = None
+        self.rss_bytes = None
+        self._last_cpu_seconds = None
+        self._last_sample_time = None
+
+    @property
+    def is_running(self):
+        return self.exit_code is None
+
+    @property
+    def uptime(self):
+        return (self.end_time or time.monotonic()) - self.start_time
+
+    def poll(self):
+        """
+        Updates the exit code. Returns True while the process is running.
+
+        An instance still running KILL_GRACE_SECONDS after terminate() is killed.
+        """
+        if self.exit_code is None:
+            exit_code = self.process.poll()
+            if exit_code is not None:
+                self.exit_code = exit_code
+                self.end_time = time.monotonic()
+                self.cpu_percent = None
+            elif self.terminate_time is not None and time.monotonic() - self.terminate_time >= KILL_GRACE_SECONDS:
+                self.process.kill()
+        return self.exit_code is None
+
+    def terminate(self):
+        """Asks the process to exit, it is killed by poll() if it is still running after KILL_GRACE_SECONDS."""
+        if self.poll():
+            self.process.terminate()
+            if self.terminate_time is None:
+                self.terminate_time = time.monotonic()
+
+    def sample(self, usage_reader):
+        """Samples CPU% since the previous sample and the current resident memory."""
+        if not self.poll() or usage_reader is None:
+            return
+        usage = usage_reader(self.pid)
+        if usage is None:
+            return
+        cpu_seconds, self.rss_bytes = usage
+        sample_time = time.monotonic()
+        if self._last_sample_time is not None and sample_time > self._last_sample_time:
+            self.cpu_percent = (cpu_seconds - self._last_cpu_seconds) / (sample_time - self._last_sample_time) * 100
+        self._last_cpu_seconds = cpu_seconds
+        self._last_sample_time = sample_time
+
+
+class ProcessSupervisor:
+    """
+    Keeps track of every engine instance started by the launcher.
+
+    Instances hold the real engine PID (they are started without a shell), their
+    exit code and uptime. sample() refreshes CPU% and RSS from psutil when it is
+    installed, or from /proc on Linux. The output of every instance is read on a
+    background thread into its own LogBuffer, which also times the first output
+    and the 'latency.ready_pattern' line of the instance. Instances are pinned to CPU
+    cores following the 'cpu_placement' config and started with the process policy
+    of their launch mode.
+    """
+
+    def __init__(self):
+        self.instances = []
+        self._lock = threading.Lock()
+        self._usage_reader = get_usage_reader()
+        self._placer = CorePlacer()
+
+    @tracing.traced()
+    def launch(self, label, command, latency_key=None, mode=None):
+        """
+        Starts a command and supervises the resulting process.
+
+        :param command: The argv list of the launch.
+        :param latency_key: Key from get_latency_key() to record the startup timings of the launch under,
+            None to not record them.
+        :param mode: The launch mode of the command, whose priority and resource limits are applied.
+        :return: The ManagedProcess of the started instance.
+        """
+        config = read_config()
+        on_complete = None
+        if latency_key is not None:
+            history = LatencyHistory(history_size=config["latency"]["history_size"])
+            on_complete = lambda latency: history.record(latency_key, latency)
+        latency = LaunchLatency(config["latency"]["ready_pattern"], on_complete)
+        process, cpu_cores = self._placer.spawn(command, config, capture_output=True, mode=mode)
+        log = LogBuffer(config["log_buffer_lines"])
+        start_log_reader(process.stdout, log, latency.observe, latency.close)
+        instance = ManagedProcess(label, process, command, log, latency, cpu_cores)
+        with self._lock:
+            self.instances.append(instance)
+        return instance
+
+    def get_instances(self):
+        with self._lock:
+            return list(self.instances)
+
+    def sample(self):
+        """Polls every instance, killing the ones that ignored terminate(), and samples the running ones."""
+        for instance in self.get_instances():
+            instance.sample(self._usage_reader)
+
+    def kill(self, pid):
+        """Terminates an instance, killing it if it ignores that for KILL_GRACE_SECONDS (see sample)."""
+        for instance in self.get_instances():
+            if instance.pid == pid:
+                instance.terminate()
+
+    def kill_all(self):
+        for instance in self.get_instances():
+            instance.terminate()
+
+    def get_running_instances(self):
+        return [instance for instance in self.get_instances() if instance.poll()]
+
+    def stop_all(self):
+        """
+        Stops every running instance and waits until they exited, killing the ones that ignore terminate().
+
+        The output of the instances is piped to the launcher, so they must not outlive it:
+        once the launcher exits, their next write to the closed pipe would kill them.
+        """
+        instances = self.get_running_instances()
+        stop_processes([instance.process for instance in instances])
+        for instance in instances:
+            instance.poll()
+
+    def clear_exited(self):
+        """Forgets the instances that are no longer running."""
+        with self._lock:
+            self.instances = [instance for instance in self.instances if instance.poll()]
@@ -0,0 +1,97 @@
+import threading
+
+from .launch_operations import construct_argv, get_process_policy, spawn_command
+from .launch_templates import render_command
+from .process_supervisor import stop_processes
+
+
+def spawn_session_process(label, command, mode):
+    """Starts a session process with the process policy of its launch mode, inheriting the console."""
+    return spawn_command(command, process_policy=get_process_policy(mode))
+
+
+class LaunchSession:
+    """
+    A server and a number of clients started from one action and stopped as one unit.
+
+    The server starts immediately; clients follow one by one, stagger_seconds
+    apart, so the server is listening before the first client connects.
+    Commands are argv lists. Processes are started by spawner(label, command, mode),
+    which returns the Popen; the launcher window passes its process supervisor there.
+    """
+
+    def __init__(self, server_command, client_command, client_count, stagger_seconds, spawner=None,
+                 server_mode=None, client_mode=None):
+        self.server_command = server_command
+        self.client_command = client_command
+        self.client_count = client_count
+        self.stagger_seconds = stagger_seconds
+        self.server_mode = server_mode
+        self.client_mode = client_mode
+        self.spawner = spawner or spawn_session_process
+        self.processes = []
+        self._timers = []
+        self._lock = threading.Lock()
+        self._stopped = False
+
+    def start(self):
+        """Starts the server and schedules the clients. Returns False if the server failed to start."""
+        if not self._spawn("Server", self.server_command, self.server_mode):
+            return False
+        for client_index in range(self.client_count):
+            timer = threading.Timer(self.stagger_seconds * (client_index + 1), self._spawn,
+                                    args=(f"Client {client_index + 1}", self.client_command, self.client_mode))
+            timer.daemon = True
+            self._timers.append(timer)
+            timer.start()
+        return True
+
+    def _spawn(self, label, command, mode):
+        with self._lock:
+            if self._stopped:
+                return False
+            try:
+                process = self.spawner(label, command, mode)
+            except Exception as e:
+                print(f"Failed to start {label} of the session: {e}")
+                return False
+            self.processes.append((label, process))
+            print(f"Launched session {label} with command: {render_command(command)}")
+            return True
+
+    def is_running(self):
+        """Returns True while any process of the session is alive or still scheduled."""
+        with self._lock:
+            if self._stopped:
+                return False
+            return (any(timer.is_alive() for timer in self._timers)
+                    or any(process.poll() is None for _, process in self.processes))
+
+    def stop(self):
+        """
+        Cancels pending clients and stops every process of the session, waiting until they exited.
+        Processes still running KILL_GRACE_SECONDS after being terminated are killed.
+        """
+        with self._lock:
+            self._stopped = True
+            processes = list(self.processes)
+        for timer in self._timers:
+            timer.cancel()
+        stop_processes([process for _, process in processes])
+
+
+def create_session(server_mode, client_mode, client_count, stagger_seconds, selected_map, uproject_file,
+                   project_directory, editor_executable, spawner=None):
+    """
+    Builds a LaunchSession that shares one map and engine between the server and all clients.
+
+    :return: The LaunchSession, or None if either command cannot be constructed.
+    """
+    server_command = construct_argv(selected_map, server_mode, uproject_file, project_directory,
+                                    editor_executable)
+    client_command = construct_argv(selected_map, client_mode, uproject_file, project_directory,
+                                    editor_executable)
+    if not server_command or not client_command:
+        return None
+    return LaunchSession(server_command, client_command, client_count, stagger_seconds, spawner,
+                         server_mode, client_mode)
@@ -0,0 +1,46 @@
+import time
+
+from . import tracing
+
+
+_start_time = time.perf_counter()
+_phases = []
+_enabled = False
+_reported = False
+
+
+def enable(start_time=None):
+    """
+    Enables the startup report.
+
+    :param start_time: time.perf_counter() value the report is measured from, defaults to
+        the moment this module was imported.
+    """
+    global _enabled, _start_time
+    _enabled = True
+    if start_time is not None:
+        _start_time = start_time
+
+
+def mark(phase):
+    """Records the end of a startup phase, also as an instant event of the trace."""
+    _phases.append((phase, time.perf_counter()))
+    tracing.instant(phase)
+
+
+def report():
+    """Prints the recorded phases once, if the startup report is enabled."""
+    global _reported
+    if not _enabled or _reported:
+        return
+    _reported = True
+
+    print("Startup report:")
+    previous_time = _start_time
+    for phase, phase_time in _phases:
+        print(f"  {phase:<28} +{(phase_time - previous_time) * 1000:8.1f} ms"
+              f"  {(phase_time - _start_time) * 1000:8.1f} ms total")
+        previous_time = phase_time
+    for phase, phase_time in _phases:
+        if phase == "first paint":
+            print(f"Time to first paint: {(phase_time - _start_time) * 1000:.1f} ms")
@@ -0,0 +1,210 @@
+import atexit
+import collections
+import functools
+import json
+import os
+import threading
+import time
+
+
+# MPL_TRACE=1 writes the trace to the cache directory, any other value is the trace file path
+TRACE_ENV_VAR = 'MPL_TRACE'
+# MPL_PROFILE=1 also runs cProfile on the main thread and dumps a .prof file next to the trace
+PROFILE_ENV_VAR = 'MPL_PROFILE'
+# A long session keeps only its latest events, so tracing cannot grow the launcher without bound
+MAX_EVENTS = 200000
+
+_enabled = False
+_origin = time.perf_counter()
+_events = collections.deque(maxlen=MAX_EVENTS)
+_thread_names = {}
+_trace_path = None
+_profiler = None
+_lock = threading.Lock()
+
+
+class _NullSpan:
+    """Span handed out while tracing is disabled, entering and leaving it does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """A named, timed section of code, recorded as a complete event when it ends."""
+
+    __slots__ = ('name', 'args', 'start_time')
+
+    def __init__(self, name, args=None):
+        self.name = name
+        self.args = args
+        self.start_time = None
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record_event(self.name, self.start_time, time.perf_counter(), self.args)
+        return False
+
+
+def is_enabled():
+    return _enabled
+
+
+def span(name, **args):
+    """
+    Times a section of code: 'with tracing.span("load maps", project=path):'.
+
+    Disabled tracing returns a shared no-op span, so a span costs one global lookup and a call.
+
+    :param name: Name of the span in the trace.
+    :param args: Values shown with the span in the trace viewer.
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return Span(name, args)
+
+
+def traced(name=None):
+    """
+    Decorator recording every call of a function as a span.
+
+    Not meant for Qt slots: the wrapper accepts any arguments, so PyQt would pass
+    signal arguments the slot does not take. Use span() inside slots instead.
+
+    :param name: Name of the span, defaults to the qualified function name.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with Span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instant(name):
+    """Records a point in time, such as a startup phase, as an instant event."""
+    if _enabled:
+        _append_event({"name": name, "ph": "i", "s": "p", "ts": _get_timestamp(time.perf_counter())})
+
+
+def record_event(name, start_time, end_time, args=None):
+    """Records a complete event from two time.perf_counter() values."""
+    event = {"name": name, "ph": "X", "ts": _get_timestamp(start_time),
+             "dur": round((end_time - start_time) * 1000000, 3)}
+    if args:
+        event["args"] = {key: value if isinstance(value, (int, float, bool)) else str(value)
+                         for key, value in args.items()}
+    _append_event(event)
+
+
+def _get_timestamp(perf_counter_time):
+    return round((perf_counter_time - _origin) * 1000000, 3)
+
+
+def _append_event(event):
+    thread = threading.current_thread()
+    event["pid"] = os.getpid()
+    event["tid"] = thread.ident
+    with _lock:
+        _thread_names.setdefault(thread.ident, thread.name)
+        _events.append(event)
+
+
+def get_default_trace_path(output_directory=None):
+    """
+    Returns a new trace file path, one per session.
+
+    :param output_directory: Folder of the trace, defaults to 'Traces' in the launcher cache directory.
+    """
+    if not output_directory:
+        from .utility import get_cache_directory
+        output_directory = os.path.join(get_cache_directory(), 'Traces')
+    return os.path.join(output_directory, f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.json")
+
+
+def enable(trace_path=None, profile=False):
+    """
+    Starts recording spans. The trace is written when the process exits, or by write_trace().
+
+    :param trace_path: The Chrome trace JSON file to write, defaults to get_default_trace_path().
+    :param profile: Also run cProfile on the calling thread and dump it next to the trace as a .prof file.
+    """
+    global _enabled, _trace_path, _profiler
+    if _enabled:
+        return
+    _trace_path = trace_path or get_default_trace_path()
+    _enabled = True
+    if profile:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    atexit.register(write_trace)
+
+
+def enable_from_environment():
+    """Enables tracing if MPL_TRACE or MPL_PROFILE is set to anything but '0'."""
+    trace_value = os.environ.get(TRACE_ENV_VAR, '')
+    profile = os.environ.get(PROFILE_ENV_VAR, '') not in ('', '0')
+    if trace_value not in ('', '0') or profile:
+        enable(trace_value if trace_value not in ('', '0', '1') else None, profile)
+
+
+def configure(tracing_config):
+    """
+    Enables tracing from the 'tracing' section of the config. Tracing, once enabled, lasts until the process exits.
+
+    :param tracing_config: A validated 'tracing' section.
+    """
+    if tracing_config["enabled"] and not _enabled:
+        enable(get_default_trace_path(tracing_config["output_directory"]), tracing_config["profile"])
+
+
+def write_trace():
+    """
+    Writes the recorded spans as a Chrome trace, viewable in Perfetto or chrome://tracing,
+    and dumps the cProfile statistics if profiling is enabled.
+
+    :return: The path of the trace file, or None if tracing is disabled or it could not be written.
+    """
+    global _profiler
+    if not _enabled:
+        return None
+    with _lock:
+        events = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": thread_id, "args": {"name": name}}
+                  for thread_id, name in _thread_names.items()]
+        events.extend(_events)
+        is_truncated = len(_events) == MAX_EVENTS
+
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(_trace_path)), exist_ok=True)
+        if _profiler is not None:
+            _profiler.disable()
+            profile_path = f"{os.path.splitext(_trace_path)[0]}.prof"
+            _profiler.dump_stats(profile_path)
+            _profiler = None
+            print(f"Profile written to {profile_path}")
+        temp_path = f"{_trace_path}.tmp"
+        with open(temp_path, 'w') as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+        os.replace(temp_path, _trace_path)
+    except OSError as e:
+        print(f"Failed to write trace to {_trace_path}: {e}")
+        return None
+    print(f"Trace written to {_trace_path}")
+    if is_truncated:
+        print(f"The trace holds only the last {MAX_EVENTS} events of the session.")
+    return _trace_path
@@ -0,0 +1,199 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton, QListWidget,
+                             QListWidgetItem, QSpinBox, QTableWidget, QTableWidgetItem, QAbstractItemView,
+                             QHeaderView, QMessageBox)
+from PyQt5.QtGui import QFont, QColor
+
+from .batch_runner import (RUN_PASSED, RUN_FAILED, RUN_TIMED_OUT, RUN_FINISHED_STATES, BatchRunner,
+                           build_batch_runs, format_duration, get_default_concurrency)
+from .ui_resources import (get_custom_font_family, get_map_list_style, get_primary_button_style,
+                           get_table_style, get_tertiary_button_style)
+
+BATCH_POLL_INTERVAL_MS = 500
+RESULT_COLUMNS = ("Map", "Mode", "Engine", "Result", "Duration", "Detail")
+RESULT_COLORS = {
+    RUN_PASSED: "#44bd32",
+    RUN_FAILED: "#e84118",
+    RUN_TIMED_OUT: "#e1a100",
+}
+
+
+def create_checklist(labels, checked=()):
+    checklist = QListWidget()
+    checklist.setStyleSheet(get_map_list_style())
+    for label in labels:
+        item = QListWidgetItem(label)
+        item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+        item.setCheckState(Qt.Checked if label in checked else Qt.Unchecked)
+        checklist.addItem(item)
+    return checklist
+
+
+def get_checked_labels(checklist):
+    return [checklist.item(row).text() for row in range(checklist.count())
+            if checklist.item(row).checkState() == Qt.Checked]
+
+
+class BatchDialog(QDialog):
+    """
+    Launches a set of maps x launch modes x engine versions and shows which runs pass.
+
+    Runs are started through the supervisor of the launcher, so they also appear
+    in the instances table and the log pane of the main window.
+    """
+
+    def __init__(self, launcher):
+        super().__init__(launcher)
+        self.launcher = launcher
+        self.app = launcher.app
+        self.runner = None
+        batch_config = self.app.config["batch"]
+
+        self.setWindowTitle("Batch launch")
+        self.setStyleSheet("background: #eaebef;")
+        self.resize(800, 650)
+        layout = QVBoxLayout(self)
+
+        lists_layout = QGridLayout()
+        for column, title in enumerate(("Maps", "Launch modes", "Engine versions")):
+            label = QLabel(title)
+            label.setFont(QFont(get_custom_font_family(), 12, QFont.Bold))
+            lists_layout.addWidget(label, 0, column)
+        self.maps_checklist = create_checklist(sorted(self.app.maps_with_paths))
+        self.modes_checklist = create_checklist(self.app.config["launch_commands"],
+                                                checked=[self.app.selected_launch])
+        self.engines_checklist = create_checklist(launcher.unreal_versions,
+                                                  checked=[launcher.unreal_versions_map.get(
+                                                      launcher.unreal_combo.currentText())])
+        lists_layout.addWidget(self.maps_checklist, 1, 0)
+        lists_layout.addWidget(self.modes_checklist, 1, 1)
+        lists_layout.addWidget(self.engines_checklist, 1, 2)
+        lists_layout.setColumnStretch(0, 2)
+        lists_layout.setColumnStretch(1, 1)
+        lists_layout.setColumnStretch(2, 1)
+        layout.addLayout(lists_layout)
+
+        select_layout = QHBoxLayout()
+        select_all_btn = QPushButton("Select all maps")
+        select_all_btn.setStyleSheet(get_tertiary_button_style())
+        select_all_btn.clicked.connect(lambda: self.set_all_maps_checked(True))
+        select_layout.addWidget(select_all_btn)
+        select_none_btn = QPushButton("Clear maps")
+        select_none_btn.setStyleSheet(get_tertiary_button_style())
+        select_none_btn.clicked.connect(lambda: self.set_all_maps_checked(False))
+        select_layout.addWidget(select_none_btn)
+        select_layout.addStretch()
+
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 64)
+        self.concurrency_spin.setPrefix("Parallel runs: ")
+        self.concurrency_spin.setValue(batch_config["max_concurrency"] or
+                                       get_default_concurrency(batch_config["memory_per_instance_mb"]))
+        self.concurrency_spin.setToolTip("Maximum number of instances running at the same time.\n"
+                                         "Defaults to the CPU cores and memory of this machine.")
+        select_layout.addWidget(self.concurrency_spin)
+
+        self.timeout_spin = QSpinBox()
+        self.timeout_spin.setRange(1, 24 * 60 * 60)
+        self.timeout_spin.setPrefix("Timeout: ")
+        self.timeout_spin.setSuffix(" s")
+        self.timeout_spin.setValue(int(batch_config["timeout_seconds"]))
+        self.timeout_spin.setToolTip("A run still going after this many seconds is killed and reported as timed out")
+        select_layout.addWidget(self.timeout_spin)
+        layout.addLayout(select_layout)
+
+        self.results_table = QTableWidget(0, len(RESULT_COLUMNS))
+        self.results_table.setHorizontalHeaderLabels(RESULT_COLUMNS)
+        self.results_table.setStyleSheet(get_table_style())
+        self.results_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.results_table.verticalHeader().setVisible(False)
+        self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.results_table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.results_table)
+
+        buttons_layout = QHBoxLayout()
+        self.summary_label = QLabel()
+        buttons_layout.addWidget(self.summary_label)
+        buttons_layout.addStretch()
+        self.cancel_btn = QPushButton("Cancel runs")
+        self.cancel_btn.setStyleSheet(get_tertiary_button_style())
+        self.cancel_btn.setDisabled(True)
+        self.cancel_btn.clicked.connect(self.cancel_batch)
+        buttons_layout.addWidget(self.cancel_btn)
+        self.run_btn = QPushButton("Run batch")
+        self.run_btn.setStyleSheet(get_primary_button_style())
+        self.run_btn.setFixedHeight(40)
+        self.run_btn.setMinimumWidth(150)
+        self.run_btn.clicked.connect(self.run_batch)
+        buttons_layout.addWidget(self.run_btn)
+        layout.addLayout(buttons_layout)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(BATCH_POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self.poll_batch)
+
+    def set_all_maps_checked(self, checked):
+        for row in range(self.maps_checklist.count()):
+            self.maps_checklist.item(row).setCheckState(Qt.Checked if checked else Qt.Unchecked)
+
+    def run_batch(self):
+        map_paths = [self.app.maps_with_paths[name] for name in get_checked_labels(self.maps_checklist)
+                     if name in self.app.maps_with_paths]
+        modes = get_checked_labels(self.modes_checklist)
+        engines = {version: self.launcher.unreal_versions[version][0]
+                   for version in get_checked_labels(self.engines_checklist)}
+        if not map_paths or not modes or not engines:
+            QMessageBox.information(self, "Info", "Select at least one Map, Launch Mode and Engine Version.")
+            return
+
+        runs = build_batch_runs(map_paths, modes, engines, self.app.selected_project_file,
+                                self.app.project_directory)
+        batch_config = self.app.config["batch"]
+        self.runner = BatchRunner(runs, self.concurrency_spin.value(), self.timeout_spin.value(),
+                                  batch_config["pass_pattern"], batch_config["fail_pattern"], self.app.supervisor)
+        self.results_table.setRowCount(len(runs))
+        for row, run in enumerate(runs):
+            for column, value in enumerate((run.map_path, run.mode, run.version)):
+                self.results_table.setItem(row, column, QTableWidgetItem(value))
+            for column in range(3, len(RESULT_COLUMNS)):
+                self.results_table.setItem(row, column, QTableWidgetItem())
+
+        self.run_btn.setDisabled(True)
+        self.cancel_btn.setDisabled(False)
+        self.poll_batch()
+        self.poll_timer.start()
+        self.launcher.instances_panel.start_sampling()
+        self.launcher.log_panel.start_following()
+
+    def poll_batch(self):
+        running = self.runner.poll()
+        self.update_results()
+        if not running:
+            self.batch_finished()
+
+    def update_results(self):
+        for row, run in enumerate(self.runner.runs):
+            result_item = self.results_table.item(row, 3)
+            result_item.setText(run.status)
+            if run.status in RESULT_COLORS:
+                result_item.setForeground(QColor(RESULT_COLORS[run.status]))
+            self.results_table.item(row, 4).setText(format_duration(run.duration))
+            self.results_table.item(row, 5).setText(run.detail)
+        passed = sum(run.status == RUN_PASSED for run in self.runner.runs)
+        finished = sum(run.status in RUN_FINISHED_STATES for run in self.runner.runs)
+        self.summary_label.setText(f"{finished} of {len(self.runner.runs)} runs finished, {passed} passed")
+
+    def cancel_batch(self):
+        if self.runner is not None:
+            self.runner.cancel()
+            self.poll_batch()
+
+    def batch_finished(self):
+        self.poll_timer.stop()
+        self.run_btn.setDisabled(False)
+        self.cancel_btn.setDisabled(True)
+
+    def reject(self):
+        # Closing the dialog stops the batch, runs would otherwise keep going without a result table
+        self.cancel_batch()
+        super().reject()
@@ -0,0 +1,155 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                             QTableWidgetItem, QAbstractItemView, QHeaderView)
+from PyQt5.QtGui import QFont
+
+from .cpu_placement import format_core_list
+from .process_supervisor import KILL_GRACE_SECONDS
+from .ui_resources import (get_custom_font_family, get_table_style, get_tertiary_button_style)
+
+SAMPLE_INTERVAL_MS = 1000
+INSTANCE_COLUMNS = ("Instance", "PID", "Status", "Uptime", "Ready", "Cores", "CPU", "Memory")
+
+
+def format_uptime(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02}:{seconds:02}" if hours else f"{minutes}:{seconds:02}"
+
+
+def format_ready_time(latency):
+    if latency is None or latency.time_to_ready is None:
+        return "-"
+    return f"{latency.time_to_ready:.1f} s"
+
+
+def format_memory(rss_bytes):
+    if rss_bytes is None:
+        return "-"
+    if rss_bytes >= 1024 ** 3:
+        return f"{rss_bytes / 1024 ** 3:.2f} GB"
+    return f"{rss_bytes / 1024 ** 2:.0f} MB"
+
+
+class InstancesPanel(QWidget):
+    """
+    Table of the engine instances started by the launcher.
+
+    The panel samples the process supervisor once a second while it is visible
+    and hides itself when there are no instances to show.
+    """
+
+    def __init__(self, supervisor, parent=None):
+        super().__init__(parent)
+        self.supervisor = supervisor
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title_layout = QHBoxLayout()
+        title = QLabel("Running instances")
+        title.setFont(QFont(get_custom_font_family(), 12, QFont.Bold))
+        title_layout.addWidget(title)
+        title_layout.addStretch()
+
+        self.kill_btn = QPushButton("Kill")
+        self.kill_btn.setStyleSheet(get_tertiary_button_style())
+        self.kill_btn.setToolTip(f"Terminates the selected instance, killing it if it has not exited "
+                                 f"after {KILL_GRACE_SECONDS:.0f} s")
+        self.kill_btn.clicked.connect(self.kill_selected)
+        title_layout.addWidget(self.kill_btn)
+
+        self.kill_all_btn = QPushButton("Kill all")
+        self.kill_all_btn.setStyleSheet(get_tertiary_button_style())
+        self.kill_all_btn.setToolTip(f"Terminates every running instance, killing the ones that have not exited "
+                                     f"after {KILL_GRACE_SECONDS:.0f} s")
+        self.kill_all_btn.clicked.connect(self.kill_all)
+        title_layout.addWidget(self.kill_all_btn)
+
+        self.clear_btn = QPushButton("Clear exited")
+        self.clear_btn.setStyleSheet(get_tertiary_button_style())
+        self.clear_btn.setToolTip("Removes the instances that are no longer running from the table")
+        self.clear_btn.clicked.connect(self.clear_exited)
+        title_layout.addWidget(self.clear_btn)
+        layout.addLayout(title_layout)
+
+        self.table = QTableWidget(0, len(INSTANCE_COLUMNS))
+        self.table.setHorizontalHeaderLabels(INSTANCE_COLUMNS)
+        self.table.setStyleSheet(get_table_style())
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setFixedHeight(140)
+        layout.addWidget(self.table)
+
+        self.sample_timer = QTimer(self)
+        self.sample_timer.setInterval(SAMPLE_INTERVAL_MS)
+        self.sample_timer.timeout.connect(self.refresh)
+
+        self.setVisible(False)
+
+    def refresh(self):
+        """Samples the supervisor and redraws the table, stopping the timer once no instance is left."""
+        self.supervisor.sample()
+        instances = self.supervisor.get_instances()
+        selected_pid = self.get_selected_pid()
+
+        self.table.setRowCount(len(instances))
+        for row, instance in enumerate(instances):
+            if instance.is_running:
+                status = "Running"
+                cpu = "-" if instance.cpu_percent is None else f"{instance.cpu_percent:.0f} %"
+            else:
+                status = f"Exited ({instance.exit_code})"
+                cpu = "-"
+            values = (instance.label, str(instance.pid), status, format_uptime(instance.uptime),
+                      format_ready_time(instance.latency), format_core_list(instance.cpu_cores), cpu,
+                      format_memory(instance.rss_bytes if instance.is_running else None))
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.table.item(row, 0).setData(Qt.UserRole, instance.pid)
+            if instance.pid == selected_pid:
+                self.table.selectRow(row)
+
+        any_running = any(instance.is_running for instance in instances)
+        self.kill_btn.setDisabled(not any_running)
+        self.kill_all_btn.setDisabled(not any_running)
+        self.clear_btn.setDisabled(len(instances) == sum(instance.is_running for instance in instances))
+        self.setVisible(bool(instances))
+        if not any_running:
+            self.sample_timer.stop()
+
+    def start_sampling(self):
+        """Shows the panel and samples the instances until they have all exited."""
+        self.refresh()
+        self.sample_timer.start()
+
+    def get_selected_pid(self):
+        selected_rows = self.table.selectionModel().selectedRows()
+        if not selected_rows:
+            return None
+        return self.table.item(selected_rows[0].row(), 0).data(Qt.UserRole)
+
+    def kill_selected(self):
+        selected_pid = self.get_selected_pid()
+        if selected_pid is not None:
+            self.supervisor.kill(selected_pid)
+
+    def kill_all(self):
+        self.supervisor.kill_all()
+
+    def clear_exited(self):
+        self.supervisor.clear_exited()
+        self.refresh()
+
+    def stop(self):
+        self.sample_timer.stop()
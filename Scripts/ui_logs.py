@@ -0,0 +1,145 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget, QPlainTextEdit)
+from PyQt5.QtGui import QFont, QColor, QTextCharFormat, QTextCursor
+
+from .log_stream import LOG_SEVERITY_ERROR, LOG_SEVERITY_WARNING, get_log_severity
+from .ui_resources import (get_custom_font_family, get_log_view_style, get_tertiary_button_style)
+
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_VIEW_HEIGHT = 200
+SEVERITY_COLORS = {
+    LOG_SEVERITY_ERROR: "#e84118",
+    LOG_SEVERITY_WARNING: "#e1a100",
+}
+
+
+class InstanceLogView(QPlainTextEdit):
+    """Read-only log of one instance, keeping at most as many lines as its ring buffer."""
+
+    def __init__(self, instance, parent=None):
+        super().__init__(parent)
+        self.instance = instance
+        self.sequence = 0
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setMaximumBlockCount(instance.log.lines.maxlen)
+        self.setStyleSheet(get_log_view_style())
+
+        self.formats = {}
+        for severity, color in SEVERITY_COLORS.items():
+            self.formats[severity] = QTextCharFormat()
+            self.formats[severity].setForeground(QColor(color))
+        self.default_format = QTextCharFormat()
+
+    def drain(self, follow):
+        """
+        Appends the lines logged since the previous call.
+
+        :param follow: Scroll to the newest line afterwards.
+        """
+        lines, self.sequence = self.instance.log.read_since(self.sequence)
+        if not lines:
+            return
+        if len(lines) >= self.maximumBlockCount():
+            # The new lines replace the whole view, clearing is cheaper than trimming old blocks one by one
+            self.clear()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        for line in lines:
+            if not self.document().isEmpty():
+                cursor.insertBlock()
+            cursor.insertText(line, self.formats.get(get_log_severity(line), self.default_format))
+        cursor.endEditBlock()
+
+        if follow:
+            scroll_bar = self.verticalScrollBar()
+            scroll_bar.setValue(scroll_bar.maximum())
+
+
+class LogPanel(QWidget):
+    """
+    Live output of the supervised instances, one tab per instance.
+
+    New lines are pulled from the ring buffers of the instances on a short
+    timer, so a chatty process never blocks the UI thread.
+    """
+
+    def __init__(self, supervisor, parent=None):
+        super().__init__(parent)
+        self.supervisor = supervisor
+        self.log_views = {}
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        title_layout = QHBoxLayout()
+        title = QLabel("Logs")
+        title.setFont(QFont(get_custom_font_family(), 12, QFont.Bold))
+        title_layout.addWidget(title)
+        title_layout.addStretch()
+
+        self.follow_btn = QPushButton("Pause follow")
+        self.follow_btn.setStyleSheet(get_tertiary_button_style())
+        self.follow_btn.setCheckable(True)
+        self.follow_btn.setToolTip("Stops scrolling to the newest line, so older output can be read")
+        self.follow_btn.toggled.connect(self.follow_toggled)
+        title_layout.addWidget(self.follow_btn)
+        layout.addLayout(title_layout)
+
+        self.tabs = QTabWidget()
+        self.tabs.setFixedHeight(LOG_VIEW_HEIGHT)
+        layout.addWidget(self.tabs)
+
+        self.drain_timer = QTimer(self)
+        self.drain_timer.setInterval(LOG_DRAIN_INTERVAL_MS)
+        self.drain_timer.timeout.connect(self.drain)
+
+        self.setVisible(False)
+
+    @property
+    def following(self):
+        return not self.follow_btn.isChecked()
+
+    def follow_toggled(self, paused):
+        self.follow_btn.setText("Resume follow" if paused else "Pause follow")
+        if not paused:
+            for log_view in self.log_views.values():
+                log_view.verticalScrollBar().setValue(log_view.verticalScrollBar().maximum())
+
+    def sync_tabs(self):
+        """Adds a tab for every new instance and removes the tabs of forgotten ones."""
+        instances = [instance for instance in self.supervisor.get_instances() if instance.log is not None]
+        pids = {instance.pid for instance in instances}
+        for pid in list(self.log_views):
+            if pid not in pids:
+                log_view = self.log_views.pop(pid)
+                self.tabs.removeTab(self.tabs.indexOf(log_view))
+                log_view.deleteLater()
+        for instance in instances:
+            if instance.pid not in self.log_views:
+                log_view = InstanceLogView(instance)
+                self.log_views[instance.pid] = log_view
+                self.tabs.addTab(log_view, f"{instance.label} ({instance.pid})")
+        self.setVisible(bool(self.log_views))
+        return instances
+
+    def drain(self):
+        """Appends new output to every tab, stopping the timer once every instance closed its output."""
+        instances = self.sync_tabs()
+        # Checked before draining: a reader closes its buffer only after appending its last line
+        all_closed = all(instance.log.closed for instance in instances)
+        for instance in instances:
+            self.log_views[instance.pid].drain(self.following)
+        if all_closed:
+            self.drain_timer.stop()
+
+    def start_following(self):
+        """Shows the panel and streams output until every instance has exited."""
+        self.drain()
+        self.drain_timer.start()
+
+    def stop(self):
+        self.drain_timer.stop()
@@ -0,0 +1,308 @@
+import os
+from functools import lru_cache
+
+from PyQt5.QtGui import (QFont, QIcon, QFontDatabase)
+
+script_dir = os.path.dirname(os.path.realpath(__file__))
+
+icon_filename = "MPLIcon.png"
+chevron_right_filename = "icon_chevron_right.png"
+chevron_down_filename = "icon_chevron_down.png"
+chevron_right_white_filename = "icon_chevron_right_white.png"
+chevron_down_white_filename = "icon_chevron_down_white.png"
+
+font_filename = "Inter-VariableFont.ttf"
+
+
+def get_custom_font():
+    custom_font = QFont()
+    custom_font.setFamily(get_custom_font_family())
+    return custom_font
+
+
+@lru_cache(maxsize=None)
+def get_custom_font_family():
+    """Registers the bundled font with Qt on first use and returns its family name."""
+    font_path = os.path.join(script_dir, "..", "Fonts", font_filename).replace("\\", "/")
+    font_id = QFontDatabase.addApplicationFont(font_path)
+    if font_id != -1:
+        return QFontDatabase.applicationFontFamilies(font_id)[0]
+    else:
+        return "Roboto"
+
+
+@lru_cache(maxsize=None)
+def get_map_list_style():
+    maps_list_style = """
+        QListView {{
+            border: none;
+            background-color: white;
+        }}
+        QListView::item {{
+            background-color: transparent;
+            border: none;
+            padding: 5px;
+            outline: none;
+            font-family: {};
+            font-size: 14px;
+        }}
+        QListView::item:selected {{
+            background-color: #3651ea;
+            color: white;
+            border: none;
+            outline: none;        
+        }}
+        QListView::item:hover {{
+            background-color: gray;
+            color: black;
+            outline: none;
+        }}
+        QScrollBar:vertical {{
+            background: #f0f0f0;
+            border: none;
+            width: 12px;
+            margin: 0px 0px 0px 0px;
+        }}
+        QScrollBar::handle:vertical {{
+            background: #a3a3a3;
+            min-height: 30ps;
+        }}
+        QScrollBar::add-line:vertical {{
+            background: none;
+            height: 0px;
+        }}
+        QScrollBar::sub-line:vertical {{
+            background: none;
+            height: 0px;
+        }}
+    """.format(get_custom_font_family())
+    return maps_list_style
+
+
+@lru_cache(maxsize=None)
+def get_primary_button_style():
+    primary_button_style = """
+        QPushButton {{
+            color: white;
+            background-color: #3651ea;
+            border: none;
+            font-family: {};
+            font-size: 14px;
+            font-weight: bold;
+        }}
+
+        QPushButton:hover {{
+            background-color: blue;        
+        }}
+
+        QPushButton:disabled {{
+            background-color: #b8b9bf;
+            color: gray;
+        }}
+    """.format(get_custom_font_family())
+    return primary_button_style
+
+
+@lru_cache(maxsize=None)
+def get_secondary_button_style():
+    secondary_button_style = """
+            QPushButton {{
+                color: #3651ea;
+                border: none;
+                font-family: {};
+                font-size: 12px;
+                text-align: right;
+                font-weight: bold;
+                background: white;
+            }}
+
+            QPushButton:hover {{
+                background: #b8b9bf;
+            }}
+    """.format(get_custom_font_family())
+    return secondary_button_style
+
+
+@lru_cache(maxsize=None)
+def get_tertiary_button_style():
+    tertiary_button_style = """
+        QPushButton {{
+            color: #3651ea;
+            border: none;
+            font-family: {};
+            font-size: 12px;
+            text-align: right;
+            font-weight: bold;
+        }}
+
+        QPushButton:hover {{
+            color: blue;
+        }}
+
+        QPushButton:disabled {{
+            color: #b8b9bf;
+        }}
+    """.format(get_custom_font_family())
+    return tertiary_button_style
+
+
+@lru_cache(maxsize=None)
+def get_combo_style(arrow_url, arrow_url_active):
+    combo_style = """
+                QComboBox {{
+                    background: white;
+                    color: black;
+                    padding: 0px 10px 0px 10px;
+                    border: none;
+                    font-family: {};
+                    font-size: 14px;
+                }}
+                
+                QComboBox:on {{
+                    background-color: #7c8ce9;
+                    color: white;
+                }}
+                
+                QComboBox:hover {{
+                    background-color: gray;
+                }}
+
+                QComboBox::drop-down {{
+                    border: none;
+                }}
+
+                QComboBox::down-arrow {{
+                    image: url({});
+                    width: 14px;
+                    height: 14px;
+                    padding: 0px 10px 0px 0px;
+                }}
+                
+                QComboBox::down-arrow::on {{
+                    image: url({});
+                }}
+                
+                QComboBox::item:hover {{
+                    background-color: gray;
+                }}
+            """.format(get_custom_font_family(), arrow_url, arrow_url_active)
+    return combo_style
+
+
+@lru_cache(maxsize=None)
+def get_helper_label_style():
+    label_style = """
+        QLabel {{
+            color: black;
+            font-family: {};
+            font-size: 14px;
+            font-align: center;
+            border: none;
+            background-color: transparent;
+            margin: 0px;
+        }}
+    """.format(get_custom_font_family())
+    return label_style
+
+
+@lru_cache(maxsize=None)
+def get_readonly_text_style():
+    label_style = """
+        QLineEdit {{
+            color: gray;
+            font-family: {};
+            font-size: 12px;
+            text-align: left;
+            border: none;
+            background-color: white;
+            margin: 0px;
+        }}
+    """.format(get_custom_font_family())
+    return label_style
+
+
+@lru_cache(maxsize=None)
+def get_search_edit_style():
+    search_edit_style = """
+        QLineEdit {{
+            color: black;
+            font-family: {};
+            font-size: 14px;
+            padding: 0px 10px 0px 10px;
+            border: none;
+            background-color: white;
+        }}
+    """.format(get_custom_font_family())
+    return search_edit_style
+
+
+@lru_cache(maxsize=None)
+def get_table_style():
+    table_style = """
+        QTableWidget {{
+            border: none;
+            background-color: white;
+            gridline-color: #eaebef;
+            font-family: {};
+            font-size: 12px;
+        }}
+        QTableWidget::item:selected {{
+            background-color: #3651ea;
+            color: white;
+        }}
+        QHeaderView::section {{
+            background-color: #eaebef;
+            color: black;
+            border: none;
+            padding: 4px;
+            font-family: {};
+            font-size: 12px;
+            font-weight: bold;
+        }}
+    """.format(get_custom_font_family(), get_custom_font_family())
+    return table_style
+
+
+@lru_cache(maxsize=None)
+def get_log_view_style():
+    log_view_style = """
+        QPlainTextEdit {
+            color: black;
+            font-family: Consolas, "DejaVu Sans Mono", monospace;
+            font-size: 11px;
+            border: none;
+            background-color: white;
+        }
+    """
+    return log_view_style
+
+
+@lru_cache(maxsize=None)
+def get_app_icon():
+    return os.path.join(script_dir, "..", "Icons", icon_filename).replace("\\", "/")
+
+
+@lru_cache(maxsize=None)
+def get_chevron_icon_dark():
+    chevron_right_path = os.path.join(script_dir, "..", "Icons", chevron_right_filename).replace("\\", "/")
+    chevron_down_path = os.path.join(script_dir, "..", "Icons", chevron_down_filename).replace("\\", "/")
+    return chevron_right_path, chevron_down_path
+
+
+@lru_cache(maxsize=None)
+def get_chevron_icon_light():
+    chevron_right_white_path = os.path.join(script_dir, "..", "Icons", chevron_right_white_filename).replace("\\", "/")
+    chevron_down_white_path = os.path.join(script_dir, "..", "Icons", chevron_down_white_filename).replace("\\", "/")
+    return chevron_right_white_path, chevron_down_white_path
+
+
+@lru_cache(maxsize=None)
+def get_icon(icon_path):
+    """Returns a shared QIcon for the given file, loading it only once."""
+    return QIcon(icon_path)
+
+
+@lru_cache(maxsize=None)
+def get_pixmap(icon_path, width, height):
+    """Returns a shared pixmap of the given icon file and size, rendering it only once."""
+    return get_icon(icon_path).pixmap(width, height)
@@ -0,0 +1,165 @@
+import time
+
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from . import tracing
+from .map_index import MapIndex
+from .map_scanner import get_content_roots
+from .map_search import MAX_ORDER_UPDATE, MapSearchIndex, get_search_key, sort_rank_orders
+from .utility import iter_umap_files, detect_unreal_versions, get_map_index_path
+from .workspace import discover_projects
+
+
+class MapScanWorker(QThread):
+    """
+    Scans a project for maps off the GUI thread.
+
+    Discovered maps are sent back in batches through maps_found, either when a
+    batch is full or when BATCH_INTERVAL elapsed, so the list fills progressively.
+    Before scan_finished, the found maps are sorted for ranking into rank_orders,
+    for MapSearchIndex.set_rank_orders().
+    """
+
+    BATCH_SIZE = 500
+    BATCH_INTERVAL = 0.05
+
+    maps_found = pyqtSignal(list)
+    scan_finished = pyqtSignal(int)
+
+    def __init__(self, project_directory, parent=None):
+        super().__init__(parent)
+        self.project_directory = project_directory
+        self.rank_orders = None
+
+    @tracing.traced("scan maps")
+    def run(self):
+        found_count = 0
+        batch = []
+        search_keys = {}
+        last_emit_time = time.monotonic()
+        maps = iter_umap_files(self.project_directory)
+        try:
+            for map_entry in maps:
+                if self.isInterruptionRequested():
+                    return
+                batch.append(map_entry)
+                search_keys[map_entry[0]] = get_search_key(map_entry[0])
+                if len(batch) >= self.BATCH_SIZE or time.monotonic() - last_emit_time >= self.BATCH_INTERVAL:
+                    found_count += len(batch)
+                    self.maps_found.emit(batch)
+                    batch = []
+                    last_emit_time = time.monotonic()
+        finally:
+            maps.close()
+
+        if batch:
+            found_count += len(batch)
+            self.maps_found.emit(batch)
+        if self.isInterruptionRequested():
+            return
+        self.rank_orders = sort_rank_orders(search_keys)
+        self.scan_finished.emit(found_count)
+
+
+class MapIndexRefreshWorker(QThread):
+    """
+    Updates the MapIndex of a project off the GUI thread and emits how its maps changed.
+
+    With changed_directories, only those directories are relisted and content roots that
+    appeared or disappeared are synced; without, the whole project is rescanned through
+    the index. The index is loaded here when map_index is None. Only the difference to
+    previous_maps is emitted: maps_refreshed(changed_maps, added_names, removed_names, rank_orders),
+    where changed_maps holds the added maps and the ones whose path changed. When more
+    maps changed than a search index applies to its rank orders, rank_orders holds the
+    maps sorted for MapSearchIndex.set_rank_orders(), otherwise it is None.
+    previous_maps must not change while the worker runs.
+    """
+
+    maps_refreshed = pyqtSignal(dict, list, list, object)
+
+    def __init__(self, map_index, project_directory, previous_maps, changed_directories=None, parent=None):
+        super().__init__(parent)
+        self.map_index = map_index
+        self.project_directory = project_directory
+        self.previous_maps = previous_maps
+        self.changed_directories = changed_directories
+
+    @tracing.traced("refresh map index")
+    def run(self):
+        if self.map_index is None:
+            self.map_index = MapIndex(get_map_index_path(self.project_directory))
+        if self.changed_directories is None:
+            maps_with_paths = self.map_index.scan(self.project_directory)
+        else:
+            content_roots = get_content_roots(self.project_directory)
+            self.map_index.refresh_directories(self.changed_directories)
+            self.map_index.sync_roots(content_roots)
+            self.map_index.save()
+            maps_with_paths = dict(self.map_index.iter_cached(content_roots))
+
+        previous_maps = self.previous_maps
+        changed_maps = {friendly_name: unreal_path for friendly_name, unreal_path in maps_with_paths.items()
+                        if previous_maps.get(friendly_name) != unreal_path}
+        added_names = [friendly_name for friendly_name in changed_maps if friendly_name not in previous_maps]
+        removed_names = [friendly_name for friendly_name in previous_maps if friendly_name not in maps_with_paths]
+        rank_orders = None
+        if len(changed_maps) > MAX_ORDER_UPDATE or len(removed_names) > MAX_ORDER_UPDATE:
+            rank_orders = sort_rank_orders({friendly_name: get_search_key(friendly_name)
+                                            for friendly_name in maps_with_paths})
+        if changed_maps or removed_names:
+            self.maps_refreshed.emit(changed_maps, added_names, removed_names, rank_orders)
+
+
+class MapSearchIndexWorker(QThread):
+    """Builds the search index of a known list of maps off the GUI thread, e.g. of a restored snapshot."""
+
+    index_built = pyqtSignal(object)
+
+    def __init__(self, maps_with_paths, parent=None):
+        super().__init__(parent)
+        self.maps_with_paths = maps_with_paths
+
+    @tracing.traced("build map search index")
+    def run(self):
+        map_search = MapSearchIndex()
+        map_search.update(self.maps_with_paths.items())
+        map_search.build_rank_orders()
+        if not self.isInterruptionRequested():
+            self.index_built.emit(map_search)
+
+
+class WorkspaceIndexWorker(QThread):
+    """
+    Finds the projects below the workspace roots and indexes their maps off the GUI thread.
+
+    projects_found is emitted with the project directories as soon as they are found,
+    before their maps are indexed.
+    """
+
+    projects_found = pyqtSignal(list)
+
+    def __init__(self, workspace, root_paths, parent=None):
+        super().__init__(parent)
+        self.workspace = workspace
+        self.root_paths = root_paths
+
+    def run(self):
+        project_directories = discover_projects(self.root_paths)
+        if self.isInterruptionRequested():
+            return
+        unindexed_projects = self.workspace.set_project_directories(project_directories)
+        self.projects_found.emit(project_directories)
+        self.workspace.index_projects(unindexed_projects, self.isInterruptionRequested)
+
+
+class EngineScanWorker(QThread):
+    """Detects installed engine versions off the GUI thread."""
+
+    engines_found = pyqtSignal(dict)
+
+    def __init__(self, force_rescan=False, parent=None):
+        super().__init__(parent)
+        self.force_rescan = force_rescan
+
+    def run(self):
+        self.engines_found.emit(detect_unreal_versions(self.force_rescan))
@@ -0,0 +1,310 @@
+import mmap
+import os
+import struct
+import time
+from collections import OrderedDict
+
+
+PACKAGE_FILE_TAG = 0x9E2A83C1
+PACKAGE_FILE_TAG_SWAPPED = 0xC1832A9E
+# EPackageFlags
+PKG_FILTER_EDITOR_ONLY = 0x80000000
+# EUnrealEngineObjectUE4Version
+VER_UE4_OLDEST_LOADABLE_PACKAGE = 214
+VER_UE4_ENGINE_VERSION_OBJECT = 336
+VER_UE4_ADD_STRING_ASSET_REFERENCES_MAP = 384
+VER_UE4_SERIALIZE_TEXT_IN_PACKAGES = 459
+VER_UE4_ADDED_SEARCHABLE_NAMES = 510
+VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID = 516
+VER_UE4_ADDED_PACKAGE_OWNER = 518
+VER_UE4_NON_OUTER_PACKAGE_IMPORT = 520
+# EUnrealEngineObjectUE5Version
+VER_UE5_ADD_SOFTOBJECTPATH_LIST = 1008
+VER_UE5_METADATA_SERIALIZATION_OFFSET = 1014
+VER_UE5_VERSE_CELLS = 1015
+VER_UE5_PACKAGE_SAVED_HASH = 1016
+# The newest layout of the summary known here, later ones may move fields in front of the engine version
+LATEST_UE5_VERSION = 1015
+# Legacy file versions below -7 carry a UE5 file version, below -5 custom versions are stored as (guid, version)
+LEGACY_FILE_VERSION_UE5 = -8
+LEGACY_FILE_VERSION_OPTIMIZED_CUSTOM_VERSIONS = -5
+# Strings longer than this are not part of a valid summary
+MAX_STRING_LENGTH = 1024
+# The World Partition object is only saved in World Partition maps, its class name sits in their name table
+WORLD_PARTITION_NAME = struct.pack('<i', len('WorldPartition') + 1) + b'WorldPartition\x00'
+METADATA_CACHE_SIZE = 4096
+
+
+class PackageSummaryError(Exception):
+    """Raised when a file does not start with a package file summary that can be read."""
+
+
+class _SummaryReader:
+    """Reads little-endian values from the start of a memory-mapped package, never past its header."""
+
+    def __init__(self, buffer, limit):
+        self.buffer = buffer
+        self.limit = limit
+        self.offset = 0
+
+    def read(self, fmt):
+        size = struct.calcsize(fmt)
+        if self.offset + size > self.limit:
+            raise PackageSummaryError("Package summary is truncated")
+        values = struct.unpack_from(fmt, self.buffer, self.offset)
+        self.offset += size
+        return values
+
+    def int32(self):
+        return self.read('<i')[0]
+
+    def skip(self, size):
+        if self.offset + size > self.limit:
+            raise PackageSummaryError("Package summary is truncated")
+        self.offset += size
+
+    def string(self):
+        length = self.int32()
+        if length == 0:
+            return ""
+        if abs(length) > MAX_STRING_LENGTH:
+            raise PackageSummaryError(f"Invalid string length {length}")
+        if length > 0:
+            data = self.read(f'<{length}s')[0]
+            return data[:-1].decode('latin-1')
+        data = self.read(f'<{-length * 2}s')[0]
+        return data[:-2].decode('utf-16-le', errors='replace')
+
+
+class MapMetadata:
+    """
+    What a map file tells about itself without being loaded.
+
+    :param file_size: Size of the .umap file in bytes.
+    :param modified_time: Last modification time, in seconds since the epoch.
+    :param engine_version: The engine version the map was saved with, as a tuple
+        (major, minor, patch, changelist, branch), or None if it could not be read.
+    :param file_version: The package file versions (UE4, UE5, licensee), or None if the summary could not be read.
+    :param is_world_partition: Whether the map uses World Partition, None if unknown.
+    """
+
+    __slots__ = ('file_size', 'modified_time', 'engine_version', 'file_version', 'is_world_partition')
+
+    def __init__(self, file_size, modified_time, engine_version=None, file_version=None, is_world_partition=None):
+        self.file_size = file_size
+        self.modified_time = modified_time
+        self.engine_version = engine_version
+        self.file_version = file_version
+        self.is_world_partition = is_world_partition
+
+    def get_engine_version_name(self, full=False):
+        """Returns the engine version as '5.3', or '5.3.2-29314046+++UE5+Release-5.3' when full, None if unknown."""
+        if self.engine_version is None:
+            return None
+        major, minor, patch, changelist, branch = self.engine_version
+        if not full:
+            return f"{major}.{minor}"
+        return f"{major}.{minor}.{patch}-{changelist}+{branch}" if branch else f"{major}.{minor}.{patch}-{changelist}"
+
+    def get_summary(self):
+        """Returns a short description for the maps list, such as '5.3 · WP · 152.4 MB'."""
+        parts = []
+        if self.engine_version is not None:
+            parts.append(self.get_engine_version_name())
+        if self.is_world_partition:
+            parts.append("WP")
+        parts.append(format_file_size(self.file_size))
+        return " · ".join(parts)
+
+    def get_description(self):
+        """Returns every known value, one per line, for tooltips and the command line."""
+        if self.is_world_partition is None:
+            world_partition = "unknown"
+        else:
+            world_partition = "yes" if self.is_world_partition else "no"
+        return "\n".join([
+            f"Size: {format_file_size(self.file_size)}",
+            f"Modified: {time.strftime('%Y-%m-%d %H:%M', time.localtime(self.modified_time))}",
+            f"Saved with: {self.get_engine_version_name(full=True) or 'unknown engine version'}",
+            f"World Partition: {world_partition}",
+        ])
+
+
+def format_file_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def parse_package_summary(buffer, file_size):
+    """
+    Parses the package file summary at the start of a .umap or .uasset file.
+
+    Only the summary and, for the World Partition check, the name table are
+    touched; both lie within the package header, usually the first few kilobytes.
+
+    :param buffer: The package data, typically a memory map of the file.
+    :param file_size: Size of the file in bytes.
+    :return: A dictionary with 'file_version', 'package_flags', 'engine_version' (None if not saved
+        or written in an unknown layout) and 'is_world_partition' (None if the name table was not found).
+    :raises PackageSummaryError: If the data does not start with a readable summary.
+    """
+    reader = _SummaryReader(buffer, file_size)
+    tag = reader.read('<I')[0]
+    if tag == PACKAGE_FILE_TAG_SWAPPED:
+        raise PackageSummaryError("Big-endian packages are not supported")
+    if tag != PACKAGE_FILE_TAG:
+        raise PackageSummaryError("Not an Unreal package")
+
+    legacy_file_version = reader.int32()
+    if legacy_file_version >= 0 or legacy_file_version < LEGACY_FILE_VERSION_UE5:
+        raise PackageSummaryError(f"Unsupported legacy file version {legacy_file_version}")
+    if legacy_file_version != -4:
+        reader.int32()  # LegacyUE3Version
+    file_version_ue4 = reader.int32()
+    file_version_ue5 = reader.int32() if legacy_file_version <= LEGACY_FILE_VERSION_UE5 else 0
+    licensee_version = reader.int32()
+    file_version = (file_version_ue4, file_version_ue5, licensee_version)
+
+    if legacy_file_version <= -2:
+        custom_version_count = reader.int32()
+        if not 0 <= custom_version_count <= file_size // 8:
+            raise PackageSummaryError("Invalid custom version count")
+        for _ in range(custom_version_count):
+            if legacy_file_version < LEGACY_FILE_VERSION_OPTIMIZED_CUSTOM_VERSIONS:
+                reader.skip(20)  # Key GUID, version
+            elif legacy_file_version < -2:
+                reader.skip(20)
+                reader.string()  # Friendly name
+            else:
+                reader.skip(8)  # Enum tag, version
+
+    if file_version_ue5 >= VER_UE5_PACKAGE_SAVED_HASH:
+        reader.skip(20)  # SavedHash
+    total_header_size = reader.int32()
+    reader.string()  # Package name
+    package_flags = reader.read('<I')[0]
+    name_count, name_offset = reader.read('<ii')
+    summary = {"file_version": file_version, "package_flags": package_flags, "engine_version": None,
+               "is_world_partition": None}
+    if not 0 < total_header_size <= file_size:
+        return summary
+    if name_count > 0 and 0 < name_offset < total_header_size:
+        summary["is_world_partition"] = buffer.find(WORLD_PARTITION_NAME, name_offset, total_header_size) != -1
+
+    # Cooked packages are saved unversioned, the rest of their summary follows the engine that cooked them
+    if file_version_ue4 == 0 and file_version_ue5 == 0 and licensee_version == 0:
+        return summary
+    if file_version_ue4 < VER_UE4_OLDEST_LOADABLE_PACKAGE or file_version_ue5 > LATEST_UE5_VERSION:
+        return summary
+
+    reader.limit = total_header_size
+    is_filter_editor_only = bool(package_flags & PKG_FILTER_EDITOR_ONLY)
+    if file_version_ue5 >= VER_UE5_ADD_SOFTOBJECTPATH_LIST:
+        reader.skip(8)  # SoftObjectPathsCount, SoftObjectPathsOffset
+    if not is_filter_editor_only and file_version_ue4 >= VER_UE4_ADDED_PACKAGE_SUMMARY_LOCALIZATION_ID:
+        reader.string()  # LocalizationId
+    if file_version_ue4 >= VER_UE4_SERIALIZE_TEXT_IN_PACKAGES:
+        reader.skip(8)  # GatherableTextDataCount, GatherableTextDataOffset
+    reader.skip(16)  # Export count and offset, import count and offset
+    if file_version_ue5 >= VER_UE5_VERSE_CELLS:
+        reader.skip(16)  # Cell export count and offset, cell import count and offset
+    if file_version_ue5 >= VER_UE5_METADATA_SERIALIZATION_OFFSET:
+        reader.skip(4)  # MetaDataOffset
+    reader.skip(4)  # DependsOffset
+    if file_version_ue4 >= VER_UE4_ADD_STRING_ASSET_REFERENCES_MAP:
+        reader.skip(8)  # SoftPackageReferencesCount, SoftPackageReferencesOffset
+    if file_version_ue4 >= VER_UE4_ADDED_SEARCHABLE_NAMES:
+        reader.skip(4)  # SearchableNamesOffset
+    reader.skip(4 + 16)  # ThumbnailTableOffset, Guid
+    if not is_filter_editor_only and file_version_ue4 >= VER_UE4_ADDED_PACKAGE_OWNER:
+        reader.skip(16)  # PersistentGuid
+        if file_version_ue4 < VER_UE4_NON_OUTER_PACKAGE_IMPORT:
+            reader.skip(16)  # OwnerPersistentGuid
+    generation_count = reader.int32()
+    if generation_count < 0:
+        return summary
+    reader.skip(generation_count * 8)  # Export count, name count per generation
+    if file_version_ue4 < VER_UE4_ENGINE_VERSION_OBJECT:
+        return summary
+
+    major, minor, patch, changelist = reader.read('<HHHI')
+    branch = reader.string()
+    # Changelist 0 and version 4.0.0 are what editors built from source without version info write
+    if 4 <= major <= 9 and (major, minor, patch, changelist) != (4, 0, 0, 0):
+        summary["engine_version"] = (major, minor, patch, changelist & 0x7FFFFFFF, branch)
+    return summary
+
+
+def read_map_metadata(file_path, stat_result=None):
+    """
+    Reads the metadata of a map file.
+
+    The file is memory-mapped and only the pages holding its package header are
+    read, so the cost is the same for a 1 MB and a 1 GB map.
+
+    :param file_path: Path of the .umap file.
+    :param stat_result: The os.stat() result of the file, if already known.
+    :return: A MapMetadata, or None if the file cannot be accessed.
+    """
+    try:
+        if stat_result is None:
+            stat_result = os.stat(file_path)
+        metadata = MapMetadata(stat_result.st_size, stat_result.st_mtime)
+        if stat_result.st_size == 0:
+            return metadata
+        with open(file_path, 'rb') as map_file, \
+                mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            summary = parse_package_summary(buffer, stat_result.st_size)
+    except PackageSummaryError:
+        return metadata
+    except (OSError, ValueError):
+        return None
+
+    metadata.file_version = summary["file_version"]
+    metadata.engine_version = summary["engine_version"]
+    metadata.is_world_partition = summary["is_world_partition"]
+    return metadata
+
+
+class MapMetadataCache:
+    """
+    Map metadata by file path, read on first request and again only once the file changes.
+
+    Every lookup stats the file and rereads it if its modification time or size
+    differ from the cached entry. The least recently used entries are dropped
+    beyond max_size.
+    """
+
+    def __init__(self, max_size=METADATA_CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+
+    def get(self, file_path):
+        """
+        :param file_path: Path of the .umap file.
+        :return: A MapMetadata, or None if the file cannot be accessed.
+        """
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            self.entries.pop(file_path, None)
+            return None
+
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        entry = self.entries.get(file_path)
+        if entry is not None and entry[0] == key:
+            self.entries.move_to_end(file_path)
+            return entry[1]
+
+        metadata = read_map_metadata(file_path, stat_result)
+        self.entries[file_path] = (key, metadata)
+        self.entries.move_to_end(file_path)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return metadata
+
+    def clear(self):
+        self.entries.clear()
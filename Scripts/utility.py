@@ -1,11 +1,18 @@
+import hashlib
 import json
 import os
-import glob
+import sys
 from pathlib import Path
 
+from . import tracing
+from .config_service import CONFIG_PATH, find_project_root, get_config_service
+from .engine_discovery import EngineDiscoveryCache
+from .map_index import MapIndex
+from .map_scanner import get_content_roots, walk_umap_files
+
 
-CONFIG_PATH = 'DefaultConfig.json'
 CONFIG_FILE = ""
+APP_NAME = 'MounteaProjectLauncher'
 
 
 def get_relative_path(root_path, filename):
@@ -48,43 +55,19 @@ def get_absolute_path(root_path, filename):
     return None
 
 
-def find_project_root():
-    """
-    Finds the root folder of the project containing the 'Config' directory.
-    
-    :return: The absolute path to the project's root folder.
-    """
-    current_dir = os.path.abspath(__file__)  # Get the absolute path of the current script
-    while True:
-        # Check if the current directory is indeed a directory
-        if os.path.isdir(current_dir):
-            # Check if the 'Config' directory exists in the current directory
-            if 'Config' in os.listdir(current_dir) and os.path.isdir(os.path.join(current_dir, 'Config')):
-                return current_dir  # Found the root folder
-        # Move up one level in the directory tree
-        parent_dir = os.path.dirname(current_dir)
-        # Stop if reached the system root directory
-        if parent_dir == current_dir:
-            raise FileNotFoundError("Config directory not found. Are you sure this script is inside the project directory?")
-        current_dir = parent_dir
-
 def read_config():
     """
-    Reads the configuration from a JSON file.
-    
+    Returns the launcher configuration.
+
+    The configuration is parsed once and cached by the config service,
+    so this never touches the disk after the first call.
+
     :return: A dictionary with the configuration data.
     """
-    root_path = find_project_root()
-    config_path = os.path.join(root_path, "Config", CONFIG_PATH)
-    try:
-        with open(config_path, 'r') as config_file:
-            config_data = json.load(config_file)
-            return config_data
-    except Exception as e:
-        print(f"Failed to read config file: {e}")
-        return {}
+    return get_config_service().get()
 
 
+@tracing.traced()
 def find_unreal_project(directory):
     """
     Searches for a .uproject file in the specified directory.
@@ -110,16 +93,28 @@ def get_friendly_name(file_path):
 
 def save_state_to_json(data, file_path='state.json'):
     """
-    Saves application state to a JSON file.
+    Atomically saves application state to a JSON file.
+
+    The state is written to a temporary file that then replaces the old one,
+    so a crash or a second launcher instance never leaves a truncated file.
 
     :param data: The data to save.
     :param file_path: The file path to save the data to.
     """
+    temp_path = f"{file_path}.{os.getpid()}.tmp"
     try:
-        with open(file_path, 'w') as file:
-            json.dump(data, file, indent=4)
+        directory = os.path.dirname(file_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(temp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(temp_path, file_path)
     except Exception as e:
         print(f"Failed to save state to {file_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
 
 
 def load_state_from_json(file_path='state.json'):
@@ -140,50 +135,63 @@ def load_state_from_json(file_path='state.json'):
         return None
 
 
-def find_umap_files(project_directory):
+def get_cache_directory():
+    """
+    Returns the per-user cache directory of the launcher.
+
+    :return: The absolute path to the cache directory.
+    """
+    if os.name == 'nt':
+        base_dir = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~/AppData/Local')
+    elif sys.platform == 'darwin':
+        base_dir = os.path.expanduser('~/Library/Caches')
+    else:
+        base_dir = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(base_dir, APP_NAME)
+
+
+def get_map_index_path(project_directory):
+    """
+    Returns the path of the map index file belonging to a project.
+
+    :param project_directory: Path to the project directory.
+    :return: The absolute path to the project's map index file.
+    """
+    project_key = os.path.normcase(os.path.abspath(project_directory))
+    project_hash = hashlib.sha1(project_key.encode('utf-8')).hexdigest()
+    return os.path.join(get_cache_directory(), 'MapIndex', f'{project_hash}.json')
+
+
+@tracing.traced()
+def find_umap_files(project_directory, use_index=True, max_workers=None):
     """
     Finds all .umap files within the specified project directory,
     including in both the main content directory and any plugin directories.
 
     Args:
     - project_directory: Path to the project directory.
+    - use_index: Whether to scan through the persistent map index of the project,
+      which only relists directories that changed since the previous scan.
+    - max_workers: Number of scanning threads, defaults to 'map_scan_workers' from the config.
+      More than one scans plugin and first-level Content folders in parallel.
 
     Returns:
     A dictionary mapping friendly map names to their Unreal Engine paths.
     """
-    def get_friendly_name(full_path):
-        # Define your logic for getting the friendly name here
-        # For example, you might want to extract the base name of the file
-        return os.path.basename(full_path)
+    return dict(iter_umap_files(project_directory, use_index, max_workers))
 
-    project_content_dir = os.path.join(project_directory, 'Content')
-    plugin_dirs = glob.glob(os.path.join(project_directory, 'Plugins', '*', 'Content'), recursive=True)
-    
-    project_umap_files = glob.glob(os.path.join(project_content_dir, '**/*.umap'), recursive=True)
 
-    plugin_umap_files = []
-    for plugin_dir in plugin_dirs:
-        plugin_umap_files.extend(glob.glob(os.path.join(plugin_dir, '**/*.umap'), recursive=True))
-    
-    all_umap_files = project_umap_files + plugin_umap_files
-    maps_with_paths = {}
-
-    for full_path in all_umap_files:
-        if project_content_dir in full_path:
-            relative_path = os.path.relpath(full_path, project_content_dir)
-            unreal_path = '/Game/' + relative_path.replace('\\', '/').replace('.umap', '')
-        else:
-            for plugin_dir in plugin_dirs:
-                if plugin_dir in full_path:
-                    plugin_name = os.path.basename(os.path.dirname(plugin_dir))
-                    relative_path = os.path.relpath(full_path, plugin_dir).replace("\\", "/").replace(".umap", "")
-                    unreal_path = f'/{plugin_name}/{relative_path}'
-                    break
-        
-        friendly_name = get_friendly_name(full_path)
-        maps_with_paths[friendly_name] = unreal_path
-    
-    return maps_with_paths
+def iter_umap_files(project_directory, use_index=True, max_workers=None):
+    """
+    Same as find_umap_files, but yields (friendly_name, unreal_path) tuples as they are discovered.
+
+    A friendly name may be yielded more than once; the last Unreal path wins.
+    """
+    if max_workers is None:
+        max_workers = read_config()["map_scan_workers"]
+    if use_index:
+        return MapIndex(get_map_index_path(project_directory)).iter_scan(project_directory, max_workers)
+    return walk_umap_files(get_content_roots(project_directory), max_workers=max_workers)
 
 
 def has_uproject_file(project_directory):
@@ -191,22 +199,26 @@ def has_uproject_file(project_directory):
     return bool(find_unreal_project(project_directory))
     
     
-def detect_unreal_versions():
-    """Detects installed Unreal Engine versions and their executables."""
-    versions_info = {}
+def get_session_state_path():
+    """Returns the path of the file the last session is saved to, see Launcher.save_session."""
+    return os.path.join(get_cache_directory(), 'SessionState.json')
+
+
+def get_engine_cache_path():
+    """Returns the path of the engine discovery cache file."""
+    return os.path.join(get_cache_directory(), 'EngineInstalls.json')
+
+
+@tracing.traced()
+def detect_unreal_versions(force_rescan=False):
+    """
+    Detects installed Unreal Engine versions and their executables.
+
+    Installs are served from the engine discovery cache and only the roots that
+    changed since the last run are walked again.
+
+    :param force_rescan: Ignore the cache and walk every configured engine root.
+    :return: A dictionary mapping versions ('5.3') to lists of editor executables.
+    """
     paths = read_config().get("unreal_engine_paths", [])
-    for path in paths:
-        engine_executables = list(Path(path).glob('*/Engine/Binaries/Win64/UE4Editor.exe'))
-        engine_executables += list(Path(path).glob('*/Engine/Binaries/Win64/UnrealEditor.exe'))
-        for executable in engine_executables:
-            build_file_path = executable.parent.parent.parent / 'Build' / 'Build.version'
-            try:
-                with open(build_file_path, 'r') as build_file:
-                    build_data = json.load(build_file)
-                    version = f"{build_data['MajorVersion']}.{build_data['MinorVersion']}"
-                    if version not in versions_info:
-                        versions_info[version] = []
-                    versions_info[version].append(str(executable))
-            except (IOError, KeyError):
-                continue
-    return versions_info
+    return EngineDiscoveryCache(get_engine_cache_path()).discover(paths, force_rescan)
@@ -0,0 +1,168 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import tracing
+from .map_search import MapSearchIndex
+from .utility import find_umap_files, find_unreal_project
+
+
+# Folder levels below a workspace root searched for projects ('Root/Team/Game/Game.uproject' is level 2)
+WORKSPACE_SCAN_DEPTH = 3
+WORKSPACE_INDEX_WORKERS = 4
+
+
+def get_project_key(project_directory):
+    """Returns the key of a project folder, equal for every spelling of the same path."""
+    return os.path.normcase(os.path.abspath(project_directory))
+
+
+def find_projects_in_root(root_path, max_depth=WORKSPACE_SCAN_DEPTH):
+    """
+    Finds every project folder below a workspace root, breadth first.
+
+    Project folders are not searched further, so their Content and Intermediate
+    trees are never walked. Hidden folders are skipped.
+
+    :param root_path: The workspace root.
+    :param max_depth: Number of folder levels below the root to search.
+    :return: A list of project directories.
+    """
+    project_directories = []
+    level = [root_path]
+    for depth in range(max_depth + 1):
+        next_level = []
+        for directory in level:
+            if find_unreal_project(directory):
+                project_directories.append(directory)
+                continue
+            if depth == max_depth:
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    next_level.extend(entry.path for entry in entries
+                                      if not entry.name.startswith('.') and entry.is_dir())
+            except OSError:
+                continue
+        level = sorted(next_level)
+    return project_directories
+
+
+@tracing.traced()
+def discover_projects(root_paths, max_depth=WORKSPACE_SCAN_DEPTH):
+    """
+    Finds the project folders below every workspace root, searching the roots concurrently.
+
+    :param root_paths: The workspace roots.
+    :return: The project directories, each once, in root order.
+    """
+    root_paths = list(dict.fromkeys(os.path.abspath(root_path) for root_path in root_paths))
+    if not root_paths:
+        return []
+    with ThreadPoolExecutor(max_workers=len(root_paths), thread_name_prefix='WorkspaceScan') as executor:
+        results = list(executor.map(lambda root_path: find_projects_in_root(root_path, max_depth), root_paths))
+    projects = {}
+    for root_projects in results:
+        for project_directory in root_projects:
+            projects.setdefault(get_project_key(project_directory), project_directory)
+    return list(projects.values())
+
+
+class WorkspaceProject:
+    """A project of the workspace, with its maps and search index once they have been indexed."""
+
+    def __init__(self, project_directory):
+        self.project_directory = project_directory
+        self.name = os.path.basename(project_directory)
+        self.maps_with_paths = None
+        self.map_search = None
+
+    @property
+    def is_indexed(self):
+        return self.maps_with_paths is not None
+
+
+class Workspace:
+    """
+    Every project below the workspace roots, with their maps kept in memory.
+
+    Projects are indexed in the background, WORKSPACE_INDEX_WORKERS at a time,
+    each through its own persistent map index. The launcher takes the maps and
+    search index of a project when switching to it and stores them back, kept
+    up to date by the map watcher, when switching away, so switching between
+    indexed projects never rescans them.
+    """
+
+    def __init__(self):
+        self.projects = {}
+        self._lock = threading.Lock()
+
+    def get_projects(self):
+        with self._lock:
+            return list(self.projects.values())
+
+    def get_project(self, project_directory):
+        with self._lock:
+            return self.projects.get(get_project_key(project_directory))
+
+    def set_project_directories(self, project_directories):
+        """
+        Replaces the projects found below the workspace roots, keeping the maps of projects already known.
+        Indexed projects that are not below a root, such as ones opened from a folder, are kept as well.
+
+        :return: The projects that still need to be indexed.
+        """
+        with self._lock:
+            projects = {}
+            for project_directory in project_directories:
+                project_key = get_project_key(project_directory)
+                projects[project_key] = self.projects.get(project_key) or WorkspaceProject(project_directory)
+            for project_key, project in self.projects.items():
+                if project.is_indexed:
+                    projects.setdefault(project_key, project)
+            self.projects = projects
+            return [project for project in projects.values() if not project.is_indexed]
+
+    def store(self, project_directory, maps_with_paths, map_search):
+        """Keeps the maps of a project in memory, whether or not it is below a workspace root."""
+        project_key = get_project_key(project_directory)
+        with self._lock:
+            project = self.projects.get(project_key)
+            if project is None:
+                project = self.projects[project_key] = WorkspaceProject(project_directory)
+            # The search index goes first, the launcher reads them without the lock once is_indexed is true
+            project.map_search = map_search
+            project.maps_with_paths = maps_with_paths
+
+    @tracing.traced("index workspace project")
+    def index_project(self, project):
+        maps_with_paths = find_umap_files(project.project_directory)
+        map_search = MapSearchIndex()
+        map_search.update(maps_with_paths.items())
+        map_search.build_rank_orders()
+        with self._lock:
+            # Maps stored by the launcher meanwhile are newer than this scan
+            if not project.is_indexed:
+                project.map_search = map_search
+                project.maps_with_paths = maps_with_paths
+
+    def index_projects(self, projects, is_cancelled=None):
+        """
+        Indexes projects concurrently.
+
+        :param projects: WorkspaceProject objects to index.
+        :param is_cancelled: Called before each project; indexing stops once it returns True.
+        """
+        def index(project):
+            if is_cancelled is not None and is_cancelled():
+                return
+            try:
+                self.index_project(project)
+            except Exception as e:
+                print(f"Failed to index the maps of {project.project_directory}: {e}")
+
+        if not projects:
+            return
+        with ThreadPoolExecutor(max_workers=min(WORKSPACE_INDEX_WORKERS, len(projects)),
+                                thread_name_prefix='WorkspaceIndex') as executor:
+            list(executor.map(index, projects))
@@ -0,0 +1,290 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Scripts import config_service
+from Scripts.config_service import find_project_root
+from Scripts.launch_operations import construct_argv, construct_command, format_launch_command
+from Scripts.utility import (detect_unreal_versions, find_umap_files, find_unreal_project, get_cache_directory,
+                             get_engine_cache_path, get_map_index_path)
+
+from .tree_generator import ProjectShape, generate_engine_installs, generate_project
+
+
+RESULTS_VERSION = 1
+DEFAULT_MAP_COUNTS = (1000, 5000, 20000)
+CONSTRUCT_ITERATIONS = 10000
+# A benchmark slower than its baseline by more than this factor is reported as a regression
+REGRESSION_FACTOR = 1.25
+# Differences below this are timer noise whatever the factor
+REGRESSION_MIN_SECONDS = 0.001
+
+
+def measure(func, repeat):
+    """
+    Calls func repeat times.
+
+    :return: A tuple (median_seconds, min_seconds).
+    """
+    timings = []
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start_time)
+    return statistics.median(timings), min(timings)
+
+
+def measure_peak_memory(func):
+    """Returns the peak Python memory allocated while func runs, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def isolate_cache_directory(cache_root):
+    """
+    Points the launcher cache directory (map indexes, engine cache) into cache_root,
+    so benchmarks neither read nor overwrite the caches of the installed launcher.
+    """
+    os.environ['LOCALAPPDATA'] = cache_root
+    os.environ['XDG_CACHE_HOME'] = cache_root
+    if sys.platform == 'darwin':
+        os.environ['HOME'] = cache_root
+    if not get_cache_directory().startswith(cache_root):
+        raise RuntimeError(f"Cannot redirect the cache directory {get_cache_directory()} into {cache_root}")
+
+
+def write_benchmark_config(config_path, engine_root, map_scan_workers):
+    """Writes a copy of the default config that only lists the fake engine installs."""
+    with open(os.path.join(find_project_root(), 'Config', config_service.CONFIG_PATH), 'r') as config_file:
+        config_data = json.load(config_file)
+    config_data["unreal_engine_paths"] = [engine_root]
+    config_data["map_scan_workers"] = map_scan_workers
+    with open(config_path, 'w') as config_file:
+        json.dump(config_data, config_file, indent=4)
+    config_service.set_config_path(config_path)
+
+
+def create_result(name, cold_seconds, warm_seconds, **values):
+    result = {"name": name, "cold_seconds": cold_seconds, "warm_seconds": warm_seconds}
+    result.update(values)
+    return result
+
+
+def benchmark_project(project, repeat):
+    """
+    Benchmarks the project scanning functions on one generated project.
+
+    Cold runs start without a map index of the project; warm runs reuse the index or
+    the directory listings the cold run left behind. The operating system file cache
+    is warm in both, since the tree was just written.
+    """
+    project_directory = project["project_directory"]
+    index_path = get_map_index_path(project_directory)
+    values = {"maps": project["maps"], "files": project["files"]}
+    results = []
+
+    cold_seconds = measure(lambda: find_unreal_project(project_directory), 1)[0]
+    warm_seconds = measure(lambda: find_unreal_project(project_directory), repeat)[0]
+    results.append(create_result("find_unreal_project", cold_seconds, warm_seconds, **values))
+
+    cold_seconds = measure(lambda: find_umap_files(project_directory, use_index=False), 1)[0]
+    warm_seconds = measure(lambda: find_umap_files(project_directory, use_index=False), repeat)[0]
+    peak_memory = measure_peak_memory(lambda: find_umap_files(project_directory, use_index=False))
+    results.append(create_result("find_umap_files (walk)", cold_seconds, warm_seconds,
+                                 peak_memory_bytes=peak_memory, **values))
+
+    remove_file(index_path)
+    cold_seconds = measure(lambda: find_umap_files(project_directory), 1)[0]
+    warm_seconds = measure(lambda: find_umap_files(project_directory), repeat)[0]
+    remove_file(index_path)
+    peak_memory = measure_peak_memory(lambda: find_umap_files(project_directory))
+    results.append(create_result("find_umap_files (index)", cold_seconds, warm_seconds,
+                                 peak_memory_bytes=peak_memory, **values))
+    return results
+
+
+def benchmark_engines(engine_count, repeat):
+    """Benchmarks engine discovery with and without the engine cache."""
+    def detect_cold():
+        remove_file(get_engine_cache_path())
+        return detect_unreal_versions()
+
+    cold_seconds = measure(detect_cold, repeat)[0]
+    detect_unreal_versions()
+    warm_seconds = measure(detect_unreal_versions, repeat)[0]
+    peak_memory = measure_peak_memory(detect_cold)
+    return [create_result("detect_unreal_versions", cold_seconds, warm_seconds, engines=engine_count,
+                          peak_memory_bytes=peak_memory)]
+
+
+def benchmark_construct(project, executable, iterations):
+    """
+    Benchmarks building launch commands, per call.
+
+    Cold calls format every selection for the first time; warm calls hit the
+    per-selection cache, as refreshing the preview does.
+    """
+    project_directory = project["project_directory"]
+    uproject_file = os.path.basename(project["uproject_file"])
+    map_paths = [f"/Game/Maps/L_Map{index}" for index in range(iterations)]
+    results = []
+    for name, construct in (("construct_argv", construct_argv), ("construct_command", construct_command)):
+        format_launch_command.cache_clear()
+        start_time = time.perf_counter()
+        for map_path in map_paths:
+            construct(map_path, "Standalone", uproject_file, project_directory, executable)
+        cold_seconds = (time.perf_counter() - start_time) / iterations
+
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            construct(map_paths[0], "Standalone", uproject_file, project_directory, executable)
+        warm_seconds = (time.perf_counter() - start_time) / iterations
+        results.append(create_result(name, cold_seconds, warm_seconds, calls=iterations))
+    return results
+
+
+def get_result_key(result):
+    return result["name"], result.get("maps"), result.get("engines")
+
+
+def compare_results(results, baseline_results):
+    """
+    Compares warm timings with a previous results file.
+
+    :return: Report lines for every benchmark slower than REGRESSION_FACTOR times its baseline.
+    """
+    baseline = {get_result_key(result): result for result in baseline_results}
+    lines = []
+    for result in results:
+        baseline_result = baseline.get(get_result_key(result))
+        if not baseline_result or not baseline_result["warm_seconds"]:
+            continue
+        ratio = result["warm_seconds"] / baseline_result["warm_seconds"]
+        if ratio > REGRESSION_FACTOR and result["warm_seconds"] - baseline_result["warm_seconds"] > REGRESSION_MIN_SECONDS:
+            size = f" ({result['maps']} maps)" if "maps" in result else ""
+            lines.append(f"Regression: {result['name']}{size} warm time is {ratio:.2f}x the baseline")
+    return lines
+
+
+def format_seconds(seconds):
+    if seconds < 0.001:
+        return f"{seconds * 1000000:.1f} us"
+    return f"{seconds * 1000:.1f} ms"
+
+
+def format_results(results):
+    """Formats the results as a text table, one row per benchmark and project size."""
+    rows = [("Benchmark", "Size", "Cold", "Warm", "Peak memory")]
+    for result in results:
+        if "maps" in result:
+            size = f"{result['maps']} maps"
+        elif "engines" in result:
+            size = f"{result['engines']} engines"
+        else:
+            size = f"{result['calls']} calls"
+        peak_memory = result.get("peak_memory_bytes")
+        rows.append((result["name"], size, format_seconds(result["cold_seconds"]),
+                     format_seconds(result["warm_seconds"]),
+                     f"{peak_memory / (1024 * 1024):.1f} MB" if peak_memory is not None else ""))
+    widths = [max(len(row[column]) for row in rows) for column in range(len(rows[0]))]
+    return ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip() for row in rows]
+
+
+def run_benchmarks(args, work_dir):
+    isolate_cache_directory(os.path.join(work_dir, 'Cache'))
+    engine_root = os.path.join(work_dir, 'Engines')
+    executables = generate_engine_installs(engine_root, [f"5.{minor}" for minor in range(args.engines)])
+    write_benchmark_config(os.path.join(work_dir, 'BenchmarkConfig.json'), engine_root, args.workers)
+
+    results = []
+    project = None
+    for map_count in sorted(args.maps):
+        shape = ProjectShape(maps=map_count, plugins=args.plugins, depth=args.depth, noise=args.noise,
+                             world_partition_ratio=args.world_partition)
+        start_time = time.perf_counter()
+        project = generate_project(os.path.join(work_dir, f"Project{map_count}"), shape, seed=args.seed)
+        print(f"Generated {map_count} maps ({project['files']} files) in {time.perf_counter() - start_time:.1f} s")
+        results.extend(benchmark_project(project, args.repeat))
+    results.extend(benchmark_engines(args.engines, args.repeat))
+    if executables:
+        results.extend(benchmark_construct(project, next(iter(executables.values())), CONSTRUCT_ITERATIONS))
+    else:
+        print("No engine installs, skipping the command construction benchmarks.")
+    return results
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Benchmarks project scanning, engine discovery and command "
+                                                 "construction on generated projects.")
+    parser.add_argument('--maps', type=int, nargs='+', default=list(DEFAULT_MAP_COUNTS),
+                        help="Map counts of the generated projects, one project per count.")
+    parser.add_argument('--plugins', type=int, default=10, help="Plugins with a Content folder per project.")
+    parser.add_argument('--depth', type=int, default=4, help="Maximum folder depth of maps.")
+    parser.add_argument('--noise', type=int, default=5, help="Non-map assets next to every map.")
+    parser.add_argument('--world-partition', type=float, default=0.2,
+                        help="Share of maps with World Partition external actor folders.")
+    parser.add_argument('--engines', type=int, default=4, help="Fake engine installs, 0 skips the command construction benchmarks.")
+    parser.add_argument('--workers', type=int, default=1, help="Value of 'map_scan_workers' used for scanning.")
+    parser.add_argument('--repeat', type=int, default=5, help="Warm runs per benchmark, the median is reported.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated folder layout.")
+    parser.add_argument('--output', default='benchmark_results.json', help="JSON results file.")
+    parser.add_argument('--baseline', help="Results file of a previous run to report regressions against.")
+    parser.add_argument('--keep', action='store_true', help="Keep the generated projects and print their folder.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    work_dir = tempfile.mkdtemp(prefix='MounteaBenchmark')
+    try:
+        results = run_benchmarks(args, work_dir)
+        launcher_version = config_service.get_config_service().get().get("version")
+    finally:
+        if args.keep:
+            print(f"Generated projects kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    for line in format_results(results):
+        print(line)
+    with open(args.output, 'w') as output_file:
+        json.dump({
+            "version": RESULTS_VERSION,
+            "launcher_version": launcher_version,
+            "timestamp": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "settings": vars(args),
+            "results": results,
+        }, output_file, indent=4)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as baseline_file:
+            regressions = compare_results(results, json.load(baseline_file)["results"])
+        for line in regressions:
+            print(line)
+        return 1 if regressions else 0
+    return 0
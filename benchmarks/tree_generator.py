@@ -0,0 +1,162 @@
+import json
+import os
+import random
+import sys
+import time
+
+
+# Non-map assets created next to every map, in the proportions a typical Content folder has them
+NOISE_EXTENSIONS = ('.uasset', '.uasset', '.uasset', '.uexp', '.ubulk')
+EXTERNAL_FOLDERS = ('__ExternalActors__', '__ExternalObjects__')
+HEX_DIGITS = '0123456789ABCDEF'
+# Generated folders are dated this far back, well beyond the window in which the map index relists folders
+TREE_AGE_SECONDS = 3600
+
+
+class ProjectShape:
+    """
+    Shape of a synthetic Unreal project.
+
+    :param maps: Total number of maps, spread over the project Content folder and the plugins.
+    :param plugins: Number of plugins with a Content folder.
+    :param depth: Maximum folder depth of a map below its Content folder.
+    :param folder_fanout: Number of distinct folder names per level.
+    :param noise: Non-map assets created next to every map.
+    :param world_partition_ratio: Share of maps (0 to 1) that get World Partition external actor folders.
+    :param external_actors: External actor files created per World Partition map.
+    """
+
+    def __init__(self, maps=1000, plugins=10, depth=4, folder_fanout=6, noise=5, world_partition_ratio=0.2,
+                 external_actors=50):
+        self.maps = maps
+        self.plugins = plugins
+        self.depth = depth
+        self.folder_fanout = folder_fanout
+        self.noise = noise
+        self.world_partition_ratio = world_partition_ratio
+        self.external_actors = external_actors
+
+
+def touch(path):
+    open(path, 'wb').close()
+
+
+def backdate_folders(root, age_seconds=TREE_AGE_SECONDS):
+    """Sets the modification time of root and every folder below it age_seconds in the past."""
+    timestamp = time.time() - age_seconds
+    for directory, _, _ in os.walk(root):
+        os.utime(directory, (timestamp, timestamp))
+
+
+def get_hashed_folder(rng):
+    """Returns a folder in the two-level hashed layout World Partition uses ('3/A7')."""
+    return os.path.join(rng.choice(HEX_DIGITS), rng.choice(HEX_DIGITS) + rng.choice(HEX_DIGITS))
+
+
+def fill_content_root(content_dir, map_count, shape, rng, first_index):
+    """
+    Creates map_count maps with their noise and external actor folders below a Content folder.
+
+    :return: The number of files created.
+    """
+    file_count = 0
+    for map_index in range(first_index, first_index + map_count):
+        relative_dir = os.path.join('', *(f"Folder{rng.randrange(shape.folder_fanout)}"
+                                          for _ in range(rng.randint(0, shape.depth))))
+        map_dir = os.path.join(content_dir, relative_dir)
+        os.makedirs(map_dir, exist_ok=True)
+        map_name = f"L_Map{map_index}"
+        touch(os.path.join(map_dir, f"{map_name}.umap"))
+        for noise_index in range(shape.noise):
+            touch(os.path.join(map_dir, f"A_{map_name}_{noise_index}{NOISE_EXTENSIONS[noise_index % len(NOISE_EXTENSIONS)]}"))
+        file_count += 1 + shape.noise
+
+        if rng.random() < shape.world_partition_ratio:
+            # <Content>/__ExternalActors__/<map folder>/<map>/<hash>/<hash>/<actor>.uasset
+            for actor_index in range(shape.external_actors):
+                external_folder = EXTERNAL_FOLDERS[actor_index % len(EXTERNAL_FOLDERS)]
+                actor_dir = os.path.join(content_dir, external_folder, relative_dir, map_name, get_hashed_folder(rng))
+                os.makedirs(actor_dir, exist_ok=True)
+                touch(os.path.join(actor_dir, f"{rng.getrandbits(96):024X}.uasset"))
+            file_count += shape.external_actors
+    return file_count
+
+
+def generate_project(root, shape, seed=0, project_name='BenchProject'):
+    """
+    Creates a synthetic Unreal project below root.
+
+    Maps are split evenly between the project Content folder and the plugins, with
+    the project getting the remainder. The same shape and seed always produce the
+    same tree. Its folders are dated back, so the map index trusts their listings
+    as it does for a project that was not just written.
+
+    :param root: Folder the project is created in, created if missing.
+    :param shape: A ProjectShape.
+    :param seed: Seed of the folder layout.
+    :return: A dictionary with the project directory, its .uproject file and the number of maps and files created.
+    """
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    uproject_file = os.path.join(root, f"{project_name}.uproject")
+    with open(uproject_file, 'w') as project_file:
+        json.dump({"FileVersion": 3, "EngineAssociation": "5.3", "Modules": []}, project_file, indent=4)
+
+    plugin_maps = shape.maps // (shape.plugins + 1) if shape.plugins else 0
+    project_maps = shape.maps - plugin_maps * shape.plugins
+    file_count = fill_content_root(os.path.join(root, 'Content'), project_maps, shape, rng, 0)
+    for plugin_index in range(shape.plugins):
+        plugin_dir = os.path.join(root, 'Plugins', f"Plugin{plugin_index}")
+        os.makedirs(plugin_dir, exist_ok=True)
+        touch(os.path.join(plugin_dir, f"Plugin{plugin_index}.uplugin"))
+        file_count += fill_content_root(os.path.join(plugin_dir, 'Content'), plugin_maps, shape, rng,
+                                        project_maps + plugin_index * plugin_maps)
+    backdate_folders(root)
+    return {"project_directory": root, "uproject_file": uproject_file, "maps": shape.maps, "files": file_count}
+
+
+def get_editor_layout():
+    """Returns the editor executable path below 'Engine' that engine discovery looks for on this platform."""
+    if os.name == 'nt':
+        return ('Binaries', 'Win64', 'UnrealEditor.exe')
+    return ('Binaries', 'Linux', 'UnrealEditor')
+
+
+def generate_engine_installs(root, versions=('5.1', '5.2', '5.3', '5.4')):
+    """
+    Creates fake engine installs ('<root>/UE_5.3/Engine/...') with an editor executable and a Build.version file.
+
+    :param root: Engine root folder, as listed in 'unreal_engine_paths'.
+    :param versions: 'Major.Minor' versions to create.
+    :return: A dictionary mapping versions to the fake editor executables.
+    """
+    executables = {}
+    for version in versions:
+        major_version, minor_version = (int(part) for part in version.split('.'))
+        engine_dir = os.path.join(root, f"UE_{version}", 'Engine')
+        build_dir = os.path.join(engine_dir, 'Build')
+        os.makedirs(build_dir, exist_ok=True)
+        with open(os.path.join(build_dir, 'Build.version'), 'w') as build_file:
+            json.dump({
+                "MajorVersion": major_version,
+                "MinorVersion": minor_version,
+                "PatchVersion": 0,
+                "Changelist": 0,
+                "CompatibleChangelist": 0,
+                "IsLicenseeVersion": 0,
+                "IsPromotedBuild": 1,
+                "BranchName": f"++UE{major_version}+Release-{version}",
+            }, build_file, indent=4)
+        executable = os.path.join(engine_dir, *get_editor_layout())
+        os.makedirs(os.path.dirname(executable), exist_ok=True)
+        touch(executable)
+        executables[version] = executable
+    return executables
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("Usage: python -m benchmarks.tree_generator <folder> [maps]")
+        sys.exit(1)
+    result = generate_project(sys.argv[1], ProjectShape(maps=int(sys.argv[2]) if len(sys.argv) > 2 else 1000))
+    print(f"Created {result['maps']} maps and {result['files']} files in {result['project_directory']}")
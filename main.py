@@ -1,5 +1,21 @@
-from Scripts.UnrealLauncherApp import UnrealLauncherApp
+import sys
+import time
+
+_start_time = time.perf_counter()
+
+from Scripts import startup_profile, tracing
+from Scripts.cli import CLI_COMMANDS, run_cli
 
 
 if __name__ == "__main__":
+    tracing.enable_from_environment()
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS + ('-h', '--help'):
+        sys.exit(run_cli(sys.argv[1:]))
+
+    if "--startup-report" in sys.argv:
+        sys.argv.remove("--startup-report")
+        startup_profile.enable(_start_time)
+
+    from Scripts.UnrealLauncherApp import UnrealLauncherApp
+    startup_profile.mark("python imports")
     app = UnrealLauncherApp()
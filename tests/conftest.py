@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The launcher is run from the repository root, not installed, so tests import Scripts from there
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
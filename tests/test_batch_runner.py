@@ -0,0 +1,176 @@
+import sys
+import time
+
+from Scripts.batch_runner import (RUN_CANCELLED, RUN_FAILED, RUN_PASSED, RUN_PENDING, RUN_RUNNING, RUN_TIMED_OUT,
+                                  BatchRun, BatchRunner)
+from Scripts.log_stream import LogBuffer
+from Scripts.process_supervisor import ProcessSupervisor
+
+
+class FakeInstance:
+    """Stands in for a ManagedProcess; exits only when the test says so, like an engine ignoring terminate."""
+
+    def __init__(self, command):
+        self.command = command
+        self.log = LogBuffer()
+        self.exit_code = None
+        self.terminate_count = 0
+
+    def poll(self):
+        return self.exit_code is None
+
+    def terminate(self):
+        if self.poll():
+            self.terminate_count += 1
+
+    def exit(self, exit_code, close_log=True):
+        self.exit_code = exit_code
+        if close_log:
+            self.log.close()
+
+
+class FakeSupervisor:
+    def __init__(self, fail_to_start=()):
+        self.instances = []
+        self.fail_to_start = fail_to_start
+
+    def launch(self, label, command, latency_key=None, mode=None):
+        if command in self.fail_to_start:
+            raise OSError("no such file")
+        instance = FakeInstance(command)
+        self.instances.append(instance)
+        return instance
+
+
+def make_runner(run_count, max_concurrency=1, timeout_seconds=60.0, supervisor=None, commands=None):
+    commands = commands or [(f"map{index}",) for index in range(run_count)]
+    runs = [BatchRun(f"/Game/Map{index}", "Standalone", "5.3", command) for index, command in enumerate(commands)]
+    return BatchRunner(runs, max_concurrency, timeout_seconds, pass_pattern="LoadMap",
+                       fail_pattern="Assertion failed", supervisor=supervisor or FakeSupervisor())
+
+
+def test_pass_pattern_passes_and_stops_the_instance():
+    runner = make_runner(1)
+    runner.poll()
+    run = runner.runs[0]
+    run.instance.log.append("LogLoad: Took 0.5s to LoadMap")
+
+    assert runner.poll()
+    assert run.status == RUN_PASSED
+    assert run.instance.terminate_count == 1
+
+    run.instance.exit(-15)
+    assert not runner.poll()
+
+
+def test_fail_pattern_fails_with_the_matching_line():
+    runner = make_runner(1)
+    runner.poll()
+    run = runner.runs[0]
+    run.instance.log.append("Assertion failed: Index >= 0")
+    run.instance.log.append("LogLoad: Took 0.5s to LoadMap")
+
+    runner.poll()
+    assert run.status == RUN_FAILED
+    assert run.detail == "Assertion failed: Index >= 0"
+
+
+def test_exit_code_decides_without_a_matching_line():
+    runner = make_runner(2, max_concurrency=2)
+    runner.poll()
+    passing_run, failing_run = runner.runs
+    passing_run.instance.exit(0)
+    failing_run.instance.exit(3)
+
+    assert not runner.poll()
+    assert passing_run.status == RUN_PASSED
+    assert failing_run.status == RUN_FAILED
+    assert failing_run.detail == "Exit code 3"
+
+
+def test_last_lines_decide_before_the_exit_code():
+    runner = make_runner(1)
+    runner.poll()
+    run = runner.runs[0]
+    # The instance exited, its reader thread has not delivered the last line yet
+    run.instance.exit(0, close_log=False)
+    runner.poll()
+    assert run.status == RUN_RUNNING
+
+    run.instance.log.append("Assertion failed: Index >= 0")
+    run.instance.log.close()
+    runner.poll()
+    assert run.status == RUN_FAILED
+
+
+def test_child_printing_the_fail_pattern_and_exiting_0_fails():
+    command = (sys.executable, "-c", "print('Assertion failed: Index >= 0')")
+    runner = make_runner(1, supervisor=ProcessSupervisor(), commands=[command])
+    deadline = time.monotonic() + 30.0
+    while runner.poll() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    run = runner.runs[0]
+    # The line may also be read before the child exits, the runner then stops it
+    assert not run.instance.is_running
+    assert run.status == RUN_FAILED
+    assert run.detail == "Assertion failed: Index >= 0"
+
+
+def test_timed_out_run_keeps_its_slot_until_the_instance_exits():
+    supervisor = FakeSupervisor()
+    runner = make_runner(2, timeout_seconds=10.0, supervisor=supervisor)
+    runner.poll()
+    hung_run, next_run = runner.runs
+    hung_run.start_time -= 11.0
+
+    runner.poll()
+    assert hung_run.status == RUN_TIMED_OUT
+    assert hung_run.instance.terminate_count == 1
+    # The hung instance ignores terminate, the next run must wait for it
+    runner.poll()
+    assert next_run.status == RUN_PENDING
+    assert len(supervisor.instances) == 1
+
+    hung_run.instance.exit(-9)
+    runner.poll()
+    assert next_run.status == RUN_RUNNING
+    assert len(supervisor.instances) == 2
+
+
+def test_concurrency_limits_the_live_instances():
+    supervisor = FakeSupervisor()
+    runner = make_runner(5, max_concurrency=2, supervisor=supervisor)
+    runner.poll()
+    assert [run.status for run in runner.runs] == [RUN_RUNNING] * 2 + [RUN_PENDING] * 3
+
+    runner.runs[0].instance.exit(0)
+    runner.poll()
+    assert [run.status for run in runner.runs] == [RUN_PASSED] + [RUN_RUNNING] * 2 + [RUN_PENDING] * 2
+
+    while runner.poll():
+        assert len(runner.get_live_instances()) <= 2
+        for instance in supervisor.instances:
+            if instance.poll():
+                instance.exit(0)
+    assert all(run.status == RUN_PASSED for run in runner.runs)
+
+
+def test_run_failing_to_start_does_not_take_a_slot():
+    supervisor = FakeSupervisor(fail_to_start=(("map0",),))
+    runner = make_runner(2, supervisor=supervisor)
+    runner.poll()
+    assert runner.runs[0].status == RUN_FAILED
+    assert runner.runs[0].detail == "Failed to start: no such file"
+    assert runner.runs[1].status == RUN_RUNNING
+
+
+def test_cancel_stops_running_runs_and_cancels_pending_ones():
+    runner = make_runner(2)
+    runner.poll()
+    runner.cancel()
+    assert [run.status for run in runner.runs] == [RUN_CANCELLED, RUN_CANCELLED]
+    assert runner.runs[0].instance.terminate_count == 1
+    assert runner.poll()
+
+    runner.runs[0].instance.exit(-15)
+    assert not runner.poll()
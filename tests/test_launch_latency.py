@@ -0,0 +1,91 @@
+import multiprocessing
+import os
+
+from Scripts.launch_latency import LatencyHistory, LaunchLatency, get_percentile
+
+
+def record_launches(history_path, count):
+    history = LatencyHistory(history_path)
+    for _ in range(count):
+        latency = LaunchLatency()
+        latency.observe("LogInit: Display: Starting Game.")
+        history.record(("/Project", "/Game/Map", "Standalone", "UnrealEditor"), latency)
+
+
+def test_launch_completes_once_ready():
+    completed = []
+    latency = LaunchLatency("to LoadMap", completed.append)
+    latency.observe("LogInit: Display: Starting Game.")
+    assert completed == []
+    latency.observe("LogLoad: Took 0.5s to LoadMap")
+    latency.observe("LogLoad: Took 0.1s to LoadMap")
+    latency.close()
+    assert completed == [latency]
+    assert latency.time_to_first_output <= latency.time_to_ready
+
+
+def test_launch_without_ready_pattern_completes_at_first_output():
+    completed = []
+    latency = LaunchLatency("", completed.append)
+    latency.observe("LogInit: Display: Starting Game.")
+    assert completed == [latency]
+    assert latency.time_to_ready is None
+
+
+def test_launch_exiting_before_ready_completes_when_closed():
+    completed = []
+    latency = LaunchLatency("to LoadMap", completed.append)
+    latency.observe("Fatal error!")
+    latency.close()
+    assert completed == [latency]
+    assert latency.time_to_first_output is not None
+    assert latency.time_to_ready is None
+
+
+def test_history_counts_launches_that_never_became_ready(tmp_path):
+    history = LatencyHistory(str(tmp_path / "LaunchLatency.json"))
+    key = ("/Project", "/Game/Map", "Standalone", "UnrealEditor")
+    ready_latency = LaunchLatency("ready")
+    ready_latency.observe("ready")
+    history.record(key, ready_latency)
+    failed_latency = LaunchLatency("ready")
+    failed_latency.close()
+    history.record(key, failed_latency)
+
+    summary = LatencyHistory(history.history_path).get_summary(key)
+    assert summary["launches"] == 2
+    assert summary["ready_launches"] == 1
+    assert summary["ready"][50] == ready_latency.time_to_ready
+
+
+def test_history_keeps_records_of_concurrent_processes(tmp_path):
+    history_path = str(tmp_path / "LaunchLatency.json")
+    processes = [multiprocessing.Process(target=record_launches, args=(history_path, 10)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    summary = LatencyHistory(history_path).get_summary(("/Project", "/Game/Map", "Standalone", "UnrealEditor"))
+    assert summary["launches"] == 40
+
+
+def test_record_rereads_a_history_written_within_the_same_mtime(tmp_path):
+    history_path = str(tmp_path / "LaunchLatency.json")
+    key = ("/Project", "/Game/Map", "Standalone", "UnrealEditor")
+    history = LatencyHistory(history_path)
+    history.record(key, LaunchLatency())
+    assert history.get_summary(key)["launches"] == 1
+    # Another process records within the same tick of a coarse file system clock
+    mtime_ns = os.stat(history_path).st_mtime_ns
+    record_launches(history_path, 1)
+    os.utime(history_path, ns=(mtime_ns, mtime_ns))
+
+    history.record(key, LaunchLatency())
+    assert LatencyHistory(history_path).get_summary(key)["launches"] == 3
+
+
+def test_percentile_uses_the_nearest_rank():
+    assert get_percentile([], 50) is None
+    assert get_percentile([3, 1, 2, 4], 50) == 2
+    assert get_percentile([3, 1, 2, 4], 99) == 4
@@ -0,0 +1,124 @@
+import Scripts.map_search as map_search
+from Scripts.map_search import MapSearchIndex, get_search_key, sort_rank_orders
+
+
+MAPS = {
+    "Arena.umap": "/Game/Maps/Arena",
+    "L_Arena_Night.umap": "/Game/Maps/Arena/L_Arena_Night",
+    "L_Arena.umap": "/Game/Maps/Arena/L_Arena",
+    "L_Desert_Arena.umap": "/Game/Maps/Desert/L_Desert_Arena",
+    "L_Bararena.umap": "/Game/Maps/L_Bararena",
+    "L_Forest.umap": "/Game/Maps/Arena/L_Forest",
+    "L_Forest_Day.umap": "/Game/Maps/Forest/L_Forest_Day",
+    "MainMenu.umap": "/Game/UI/MainMenu",
+}
+
+
+def make_index(maps=MAPS):
+    index = MapSearchIndex()
+    index.update(maps.items())
+    return index
+
+
+def get_ranked(index, query):
+    """Every match of the query sorted by rank, which searches must return without ranking every match."""
+    name_query = query.strip().lower().rsplit('/', 1)[-1]
+    return sorted(index.find(query), key=lambda friendly_name: index.rank(friendly_name, name_query))
+
+
+def test_find_matches_names_and_folders():
+    index = make_index()
+    assert index.find("arena") == {"Arena.umap", "L_Arena_Night.umap", "L_Arena.umap", "L_Desert_Arena.umap",
+                                   "L_Bararena.umap", "L_Forest.umap"}
+    assert index.find("fo") == {"L_Forest.umap", "L_Forest_Day.umap"}
+    assert index.find("") is None
+
+
+def test_find_path_query_matches_folder_and_name_parts():
+    index = make_index()
+    assert index.find("arena/l") == {"L_Arena_Night.umap", "L_Arena.umap", "L_Forest.umap"}
+    assert index.find("desert/") == {"L_Desert_Arena.umap"}
+
+
+def test_find_accepts_a_typo():
+    assert make_index().find("forets") == {"L_Forest.umap", "L_Forest_Day.umap"}
+
+
+def test_find_accepts_swapped_characters():
+    # No trigram of 'arnea' is in 'arena', only the swap of 'n' and 'e' finds it
+    index = make_index()
+    assert {"Arena.umap", "L_Arena_Night.umap", "L_Bararena.umap"} <= index.find("arnea")
+    assert index.search("arnea", limit=1) == ["Arena.umap"]
+
+
+def test_rank_orders_match_kinds_then_length():
+    index = make_index()
+    assert index.search("arena") == ["Arena.umap", "L_Arena.umap", "L_Arena_Night.umap", "L_Desert_Arena.umap",
+                                     "L_Bararena.umap", "L_Forest.umap"]
+    assert index.rank("Arena.umap", "arena") < index.rank("L_Arena.umap", "arena")
+    assert index.rank("L_Bararena.umap", "arena") < index.rank("L_Forest.umap", "arena")
+
+
+def test_search_limit_and_empty_query():
+    index = make_index()
+    assert index.search("arena", limit=2) == ["Arena.umap", "L_Arena.umap"]
+    assert index.search("", limit=1) == ["Arena.umap"]
+
+
+def test_lazy_search_ranks_large_groups_like_a_full_sort(monkeypatch):
+    # Large groups are filtered from the rank orders instead of sorted
+    monkeypatch.setattr(map_search, "MAX_SORTED_GROUP", 0)
+    maps = {f"L_{word}_{number}.umap": f"/Game/{folder}/L_{word}_{number}"
+            for number in range(30) for word, folder in (("Arena", "Arena"), ("Dune", "Arena"), ("Sand", "Dunes"))}
+    index = make_index(maps)
+    for query in ("a", "ar", "l_a", "arena_1", "aren", "dune", "arena/", "dunes/sa", "1", "anera"):
+        results = index.search_lazily(query)
+        assert results.take(10) + results.take() == get_ranked(index, query), query
+
+
+def test_search_follows_index_changes():
+    index = make_index()
+    assert index.search("arena", limit=1) == ["Arena.umap"]
+    index.remove("Arena.umap")
+    index.add("L_Ar.umap", "/Game/Maps/L_Ar")
+    index.add("L_Arena.umap", "/Game/Other/L_Arena")
+    assert index.search("ar") == get_ranked(index, "ar")
+    assert index.search("arena", limit=2) == ["L_Arena.umap", "L_Arena_Night.umap"]
+    assert "Arena.umap" not in index.search_lazily("arena")
+
+
+def test_rank_orders_sorted_elsewhere_are_taken_only_for_the_same_maps():
+    index = make_index()
+    rank_orders = sort_rank_orders({friendly_name: get_search_key(friendly_name) for friendly_name in MAPS})
+    index.set_rank_orders(sort_rank_orders({"Arena.umap": "arena"}))
+    assert index.key_order is None
+    index.set_rank_orders(rank_orders)
+    assert index.tie_order is rank_orders[1]
+    assert index.search("arena") == get_ranked(index, "arena")
+
+
+def test_many_changes_invalidate_the_rank_orders_few_update_them(monkeypatch):
+    monkeypatch.setattr(map_search, "MAX_ORDER_UPDATE", 2)
+    index = make_index()
+    index.build_rank_orders()
+    for number in range(5):
+        index.add(f"L_Arena_{number}.umap", f"/Game/Maps/L_Arena_{number}")
+    index.remove_all(["L_Arena_0.umap", "L_Arena_1.umap"])
+    assert index.key_order is not None
+    assert index.search("arena") == get_ranked(index, "arena")
+
+    index.remove_all(["L_Arena_2.umap", "L_Arena_3.umap", "L_Arena_4.umap"])
+    assert index.key_order is None
+    assert index.search("arena") == get_ranked(index, "arena")
+
+
+def test_folder_and_path_queries_with_many_matches_rank_like_a_full_sort(monkeypatch):
+    monkeypatch.setattr(map_search, "MAX_SORTED_GROUP", 0)
+    maps = {f"L_{word}_{number}.umap": f"/Game/F{number % 13}/F{number % 4}/L_{word}_{number}"
+            for number in range(40) for word in ("Arena", "Dune", "F1")}
+    index = make_index(maps)
+    for query in ("f1", "f12", "f1/", "f12/l_a", "f1/f1/l", "game/f1"):
+        for max_collected in (0, 100000):
+            monkeypatch.setattr(map_search, "MAX_COLLECTED_MATCHES", max_collected)
+            results = index.search_lazily(query)
+            assert results.take(10) + results.take() == get_ranked(index, query), (query, max_collected)
@@ -0,0 +1,106 @@
+import struct
+
+import pytest
+
+from Scripts.umap_metadata import (PACKAGE_FILE_TAG, PKG_FILTER_EDITOR_ONLY, WORLD_PARTITION_NAME, PackageSummaryError,
+                                   parse_package_summary)
+
+
+def pack_string(text):
+    return struct.pack('<i', len(text) + 1) + text.encode('latin-1') + b'\x00'
+
+
+def build_summary(legacy_file_version, file_version_ue4, file_version_ue5=0, package_flags=0,
+                  engine_version=(5, 3, 2, 29314046, "++UE5+Release-5.3"), is_world_partition=False):
+    """Writes a package file summary field by field, as the engine saves it, followed by its name table."""
+    def build(total_header_size, name_offset):
+        data = struct.pack('<Ii', PACKAGE_FILE_TAG, legacy_file_version)
+        data += struct.pack('<i', 864)  # LegacyUE3Version
+        data += struct.pack('<i', file_version_ue4)
+        if legacy_file_version <= -8:
+            data += struct.pack('<i', file_version_ue5)
+        data += struct.pack('<i', 0)  # Licensee version
+        data += struct.pack('<i', 2) + b'\x11' * 40  # Two custom versions, (guid, version) each
+        if file_version_ue5 >= 1016:
+            data += b'\x22' * 20  # SavedHash
+        data += struct.pack('<i', total_header_size) + pack_string("/Game/Maps/L_Test")
+        data += struct.pack('<Iii', package_flags, 2, name_offset)
+        if file_version_ue5 >= 1008:
+            data += struct.pack('<ii', 0, 0)  # Soft object paths
+        if not package_flags & PKG_FILTER_EDITOR_ONLY:
+            data += pack_string("")  # LocalizationId
+        data += struct.pack('<ii', 0, 0)  # Gatherable text data
+        data += struct.pack('<4i', 1, 0x100, 1, 0x200)  # Export count and offset, import count and offset
+        if file_version_ue5 >= 1015:
+            data += struct.pack('<4i', 1, 0x300, 1, 0x400)  # Cell export count and offset, cell import count and offset
+        if file_version_ue5 >= 1014:
+            data += struct.pack('<i', 0x500)  # MetaDataOffset
+        data += struct.pack('<i', 0x600)  # DependsOffset
+        data += struct.pack('<ii', 0, 0)  # Soft package references
+        data += struct.pack('<i', 0)  # Searchable names offset
+        data += struct.pack('<i', 0) + b'\x33' * 16  # Thumbnail table offset, guid
+        if not package_flags & PKG_FILTER_EDITOR_ONLY:
+            data += b'\x44' * 16  # PersistentGuid
+        data += struct.pack('<i', 1) + struct.pack('<ii', 1, 2)  # One generation
+        major, minor, patch, changelist, branch = engine_version
+        data += struct.pack('<HHHI', major, minor, patch, changelist) + pack_string(branch)
+        names = pack_string("PersistentLevel") + (WORLD_PARTITION_NAME if is_world_partition else pack_string("Level"))
+        return data, len(data), names
+
+    # The header size and the name offset depend on the rest of the summary
+    data, name_offset, names = build(0, 0)
+    data, name_offset, names = build(name_offset + len(names), name_offset)
+    return data + names + b'\x00' * 64
+
+
+def parse(data):
+    return parse_package_summary(data, len(data))
+
+
+def test_ue4_summary_legacy_version_7():
+    summary = parse(build_summary(-7, 522, engine_version=(4, 27, 2, 18319896, "++UE4+Release-4.27")))
+    assert summary["file_version"] == (522, 0, 0)
+    assert summary["engine_version"] == (4, 27, 2, 18319896, "++UE4+Release-4.27")
+    assert summary["is_world_partition"] is False
+
+
+def test_ue5_summary_legacy_version_8():
+    summary = parse(build_summary(-8, 522, 1009, is_world_partition=True))
+    assert summary["file_version"] == (522, 1009, 0)
+    assert summary["engine_version"] == (5, 3, 2, 29314046, "++UE5+Release-5.3")
+    assert summary["is_world_partition"] is True
+
+
+def test_editor_only_filtered_summary():
+    summary = parse(build_summary(-8, 522, 1012, package_flags=PKG_FILTER_EDITOR_ONLY))
+    assert summary["package_flags"] == PKG_FILTER_EDITOR_ONLY
+    assert summary["engine_version"] == (5, 3, 2, 29314046, "++UE5+Release-5.3")
+
+
+@pytest.mark.parametrize("file_version_ue5", [1013, 1014, 1015])
+def test_ue5_summary_up_to_the_latest_known_layout(file_version_ue5):
+    # 1014 adds MetaDataOffset and 1015 the Verse cell exports and imports before DependsOffset
+    summary = parse(build_summary(-8, 522, file_version_ue5, engine_version=(5, 5, 1, 37670630, "++UE5+Release-5.5")))
+    assert summary["file_version"] == (522, file_version_ue5, 0)
+    assert summary["engine_version"] == (5, 5, 1, 37670630, "++UE5+Release-5.5")
+
+
+def test_summary_with_saved_hash():
+    # From UE 5.5 a hash precedes the header size; the fields before the engine version changed too
+    summary = parse(build_summary(-8, 522, 1016, package_flags=0x400, is_world_partition=True))
+    assert summary["file_version"] == (522, 1016, 0)
+    assert summary["package_flags"] == 0x400
+    assert summary["is_world_partition"] is True
+    assert summary["engine_version"] is None
+
+
+@pytest.mark.parametrize("data", [b"", b"not a package", struct.pack('<Ii', PACKAGE_FILE_TAG, -9)])
+def test_unreadable_summary_raises(data):
+    with pytest.raises(PackageSummaryError):
+        parse(data)
+
+
+def test_truncated_summary_raises():
+    data = build_summary(-8, 522, 1009)
+    with pytest.raises(PackageSummaryError):
+        parse(data[:40])